@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the hot paths of cert_manager against a local tests.lib.simulator.Simulator.
+
+Run them from the root of the repository with "python -m benchmarks.run"; see benchmarks/run.py for the options.
+"""
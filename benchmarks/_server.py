@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""Define the base class of the benchmarks sending requests to a local Simulator."""
+
+from cert_manager import Client
+from cert_manager._cache import METADATA_CACHE
+from tests.lib.simulator import Simulator
+
+
+class SimulatorBenchmark:
+    """Start a Simulator and a Client pointed at it before the benchmarks of a class, and stop them after."""
+
+    # The parameters of the Simulator
+    simulator_kwargs = {}
+    # The parameters of the Client, on top of the credentials and base URL
+    client_kwargs = {"pool_maxsize": 16}
+
+    simulator = None
+    client = None
+
+    def setup(self):
+        """Start the simulator and build the client."""
+        self.simulator = Simulator(**self.simulator_kwargs)
+        self.simulator.start()
+        self.client = Client(base_url=self.simulator.base_url, login_uri="bench", username="bench", password="bench",
+                             **self.client_kwargs)
+        METADATA_CACHE.invalidate()
+
+    def teardown(self):
+        """Stop the simulator and close the client."""
+        self.client.session.close()
+        self.simulator.stop()
+        METADATA_CACHE.invalidate()
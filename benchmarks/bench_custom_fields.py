@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Benchmark checking custom field values before enrolling."""
+
+import itertools
+
+from cert_manager import SSL
+from cert_manager._custom_fields import CustomFieldsValidator
+
+from ._server import SimulatorBenchmark
+
+# 20 custom fields, of which the first 5 are mandatory
+FIELDS = [{"name": f"field{index}", "mandatory": index < 5} for index in range(20)]
+VALUES = [{"name": f"field{index}", "value": "x"} for index in range(8)]
+
+
+def _shapes():
+    """Yield valid lists of 8 values, the 5 mandatory fields and 3 others, never with the same names in the same order.
+
+    The value dictionaries are shared, so building each list only costs a list of 8 references.
+    """
+    values = {field["name"]: {"name": field["name"], "value": "x"} for field in FIELDS}
+    mandatory = tuple(field["name"] for field in FIELDS if field["mandatory"])
+    optional = [field["name"] for field in FIELDS if not field["mandatory"]]
+    for extra in itertools.combinations(optional, 3):
+        for names in itertools.permutations(mandatory + extra):
+            yield [values[name] for name in names]
+
+
+class ValidateCustomFields(SimulatorBenchmark):
+    """Check the values of 8 fields against the 20 fields defined for the account."""
+
+    simulator_kwargs = {"custom_fields": FIELDS}
+    number = 10000
+
+    def setup(self):
+        """Build the SSL object, fetch the custom fields and fill the outcomes remembered by its validator."""
+        super().setup()
+        self.ssl = SSL(client=self.client)  # pylint: disable=attribute-defined-outside-init
+        self.shapes = _shapes()  # pylint: disable=attribute-defined-outside-init
+        # Once the validator remembers as many outcomes as it can, every new list of names takes the same path
+        for _ in range(CustomFieldsValidator.MAX_SHAPES):
+            self.ssl._validate_custom_fields(next(self.shapes))  # pylint: disable=protected-access
+        self.validator = CustomFieldsValidator(FIELDS)  # pylint: disable=attribute-defined-outside-init
+
+    def time_validate(self):
+        """Check values through the SSL object, as enroll does, with field names it has not seen before."""
+        self.ssl._validate_custom_fields(next(self.shapes))  # pylint: disable=protected-access
+
+    def time_validate_remembered(self):
+        """Check values through the SSL object with the same field names every time, as in a batch of enrollments."""
+        self.ssl._validate_custom_fields(VALUES)  # pylint: disable=protected-access
+
+    def time_check_uncached(self):
+        """Check values without the outcome remembered for their field names."""
+        self.validator._check(VALUES)  # pylint: disable=protected-access
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""Benchmark looking up organizations and departments."""
+
+from cert_manager import Organization
+
+from ._server import SimulatorBenchmark
+
+ORGANIZATIONS = 300
+DEPARTMENTS = 10
+
+
+class OrganizationFind(SimulatorBenchmark):
+    """Look up names among 300 organizations of 10 departments each, once they were fetched."""
+
+    number = 1000
+
+    def setup(self):
+        """Store the organizations in the simulator and fetch them."""
+        super().setup()
+        for org in range(ORGANIZATIONS):
+            departments = [
+                {"id": 100000 + org * DEPARTMENTS + dept, "name": f"Department {dept}"} for dept in range(DEPARTMENTS)
+            ]
+            self.simulator.add("organization", {"id": 10 + org, "name": f"Organization {org}",
+                                                "departments": departments})
+        self.org = Organization(client=self.client)  # pylint: disable=attribute-defined-outside-init
+        self.org.all(force=True)
+
+    def teardown(self):
+        """Stop the background refresh and the simulator."""
+        self.org.close()
+        super().teardown()
+
+    def time_find_org(self):
+        """Find an organization by name."""
+        self.org.find(org_name="Organization 250")
+
+    def time_find_dept(self):
+        """Find a department by name across all organizations."""
+        self.org.find(dept_name="Department 7")
+
+    def time_find_org_dept(self):
+        """Find a department by name in one organization."""
+        self.org.find(org_name="Organization 250", dept_name="Department 7")
+
+    def time_get_by_id(self):
+        """Find a department by ID."""
+        self.org.get_by_id(100000 + 250 * DEPARTMENTS + 7)
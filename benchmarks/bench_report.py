@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""Benchmark fetching and decoding reports."""
+
+from cert_manager import Report
+
+from ._server import SimulatorBenchmark
+
+
+class ReportDecode(SimulatorBenchmark):
+    """Decode an SSL certificate report of 5000 rows."""
+
+    simulator_kwargs = {"ssl_certs": 5000}
+
+    def setup(self):
+        """Build the Report object."""
+        super().setup()
+        self.report = Report(client=self.client)  # pylint: disable=attribute-defined-outside-init
+
+    def time_get(self):
+        """Decode the whole report at once."""
+        assert len(self.report.get_ssl_certs()["reports"]) == 5000
+
+    def time_get_stream(self):
+        """Decode the rows one at a time as they arrive."""
+        assert sum(1 for _ in self.report.get_ssl_certs(stream=True)) == 5000
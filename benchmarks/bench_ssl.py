@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Benchmark listing and collecting SSL certificates."""
+
+from cert_manager import SSL
+
+from ._server import SimulatorBenchmark
+
+
+class SSLList(SimulatorBenchmark):
+    """Page through 5000 certificates, 200 per page, with 10 milliseconds of server latency."""
+
+    simulator_kwargs = {"ssl_certs": 5000, "max_page_size": 200, "latency": 0.01}
+
+    def setup(self):
+        """Build the SSL object."""
+        super().setup()
+        self.ssl = SSL(client=self.client)  # pylint: disable=attribute-defined-outside-init
+
+    def time_list(self):
+        """Fetch the pages one after the other."""
+        assert sum(1 for _ in self.ssl.list()) == 5000
+
+    def time_list_prefetch(self):
+        """Fetch four pages at a time."""
+        assert sum(1 for _ in self.ssl.list(prefetch=4)) == 5000
+
+    def time_list_total(self):
+        """Count the certificates first, so no page past the last one is requested."""
+        assert sum(1 for _ in self.ssl.list(prefetch=4, total=True)) == 5000
+
+
+class SSLCollect(SimulatorBenchmark):
+    """Collect 200 issued certificates with a millisecond of server latency."""
+
+    simulator_kwargs = {"ssl_certs": 200, "latency": 0.001}
+
+    def setup(self):
+        """Build the SSL object and find the certificate IDs."""
+        super().setup()
+        self.ssl = SSL(client=self.client)  # pylint: disable=attribute-defined-outside-init
+        self.cert_ids = [cert["sslId"] for cert in self.ssl.list()]  # pylint: disable=attribute-defined-outside-init
+
+    def time_collect(self):
+        """Collect the certificates one after the other."""
+        for cert_id in self.cert_ids:
+            self.ssl.collect(cert_id, "x509CO")
+
+    def time_collect_many(self):
+        """Collect the certificates from 10 worker threads."""
+        results = list(self.ssl.collect_many(self.cert_ids, "x509CO", max_workers=10))
+        assert not any(isinstance(result, Exception) for _, result in results)
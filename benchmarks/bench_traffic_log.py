@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""Benchmark the overhead of logging the API traffic."""
+
+import logging
+
+import requests
+
+from cert_manager._helpers import traffic_log
+
+from ._server import SimulatorBenchmark
+
+LOGGER = logging.getLogger("benchmarks.traffic")
+LOGGER.addHandler(logging.NullHandler())
+LOGGER.propagate = False
+
+CLIENT_LOGGER = logging.getLogger("cert_manager.client")
+
+
+def _response():
+    """Build a JSON response without sending a request."""
+    response = requests.Response()
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    response._content = b'{"sslId": 1234, "status": "Issued"}' * 100  # pylint: disable=protected-access
+    response.url = "https://certs.example.com/api/ssl/v1/1234"
+
+    return response
+
+
+RESPONSE = _response()
+
+
+@traffic_log(traffic_logger=LOGGER)
+def _get(url, params=None):  # pylint: disable=unused-argument
+    """Return the prepared response."""
+    return RESPONSE
+
+
+class _TrafficLogLevel:
+    """Set the level of the traffic logger once before the benchmarks of a class, and restore it after.
+
+    Logger.setLevel clears the cache of the logging module, which costs more than a call with logging disabled, so
+    it must not run inside the timed methods.
+    """
+
+    level = logging.NOTSET
+    number = 10000
+
+    def setup(self):
+        """Set the level of the traffic logger."""
+        LOGGER.setLevel(self.level)
+
+    def teardown(self):
+        """Restore the level of the traffic logger."""
+        LOGGER.setLevel(logging.NOTSET)
+
+
+class TrafficLogDisabled(_TrafficLogLevel):
+    """Call a decorated function which does no I/O, with DEBUG logging turned off."""
+
+    level = logging.INFO
+
+    def time_call(self):
+        """Call the decorated function."""
+        _get("https://certs.example.com/api/ssl/v1/1234", params={"size": 10})
+
+
+class TrafficLogEnabled(_TrafficLogLevel):
+    """Call a decorated function which does no I/O, with DEBUG logging turned on."""
+
+    level = logging.DEBUG
+
+    def time_call(self):
+        """Call the decorated function."""
+        _get("https://certs.example.com/api/ssl/v1/1234", params={"size": 10})
+
+
+class _TrafficLogClient(SimulatorBenchmark):
+    """Send requests to the simulator with the client logger set to a level, sending its records nowhere."""
+
+    simulator_kwargs = {"ssl_certs": 1}
+    level = logging.NOTSET
+    number = 200
+
+    def setup(self):
+        """Find the URL of the certificate, and set the level and the handler of the client logger."""
+        super().setup()
+        cert_id = self.client.get(f"{self.simulator.base_url}/ssl/v1").json()[0]["sslId"]
+        self.url = f"{self.simulator.base_url}/ssl/v1/{cert_id}"  # pylint: disable=attribute-defined-outside-init
+        self.handler = logging.NullHandler()  # pylint: disable=attribute-defined-outside-init
+        CLIENT_LOGGER.addHandler(self.handler)
+        CLIENT_LOGGER.propagate = False
+        CLIENT_LOGGER.setLevel(self.level)
+
+    def teardown(self):
+        """Restore the client logger."""
+        CLIENT_LOGGER.removeHandler(self.handler)
+        CLIENT_LOGGER.propagate = True
+        CLIENT_LOGGER.setLevel(logging.NOTSET)
+        super().teardown()
+
+
+class TrafficLogClientDisabled(_TrafficLogClient):
+    """Send requests to the simulator with DEBUG logging of the traffic turned off."""
+
+    level = logging.INFO
+
+    def time_get(self):
+        """Send a request."""
+        self.client.get(self.url)
+
+
+class TrafficLogClientEnabled(_TrafficLogClient):
+    """Send requests to the simulator with DEBUG logging of the traffic turned on."""
+
+    level = logging.DEBUG
+
+    def time_get(self):
+        """Send a request."""
+        self.client.get(self.url)
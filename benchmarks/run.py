@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""Run the benchmarks, and save or compare their results with a stored baseline.
+
+Each benchmark module is a benchmarks/bench_*.py file holding classes in the style of asv: *setup* and *teardown*
+methods run around the benchmarks of a class, and every *time_* method is one benchmark, timed *repeat* times.  A
+class may set *number* to call each method that many times per timing, for the quick ones.
+
+Examples:
+    python -m benchmarks.run                               # Run everything and print the timings
+    python -m benchmarks.run -k ssl --repeat 10            # Only the benchmarks whose name contains "ssl"
+    python -m benchmarks.run --save benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.25
+
+With --compare, the exit status is 1 if any benchmark is slower than the baseline by more than the threshold.  The
+baseline is only meaningful on the machine where it was saved, so save a new one before comparing on another machine.
+"""
+
+import argparse
+import importlib
+import inspect
+import json
+import logging
+import os
+import pkgutil
+import platform
+import statistics
+import sys
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.25
+
+
+def discover(pattern=None):
+    """Return the benchmark classes of every benchmarks/bench_*.py module.
+
+    :param str pattern: Only keep the classes with at least one benchmark whose name contains this string
+    :return list: A list of (module name, class) tuples
+    """
+    package = os.path.dirname(os.path.abspath(__file__))
+    found = []
+    for module_info in sorted(pkgutil.iter_modules([package]), key=lambda info: info.name):
+        if not module_info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module(f"{__package__ or 'benchmarks'}.{module_info.name}")
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            names = [name for name in _methods(cls) if not pattern or pattern in _name(module_info.name, cls, name)]
+            if names:
+                found.append((module_info.name, cls))
+
+    return found
+
+
+def _methods(cls):
+    """Return the names of the benchmark methods of a class."""
+    return sorted(name for name, _ in inspect.getmembers(cls, inspect.isfunction) if name.startswith("time_"))
+
+
+def _name(module_name, cls, method_name):
+    """Return the full name of a benchmark."""
+    return f"{module_name}.{cls.__name__}.{method_name}"
+
+
+def run(pattern=None, repeat=DEFAULT_REPEAT):
+    """Run the benchmarks.
+
+    :param str pattern: Only run the benchmarks whose name contains this string
+    :param int repeat: The number of timings of each benchmark; the default is 5
+    :return dict: For each benchmark name, the "min" and "median" seconds per call and the "number" of calls timed
+    """
+    results = {}
+    for module_name, cls in discover(pattern):
+        bench = cls()
+        number = getattr(cls, "number", 1)
+        if hasattr(bench, "setup"):
+            bench.setup()
+        try:
+            for method_name in _methods(cls):
+                name = _name(module_name, cls, method_name)
+                if pattern and pattern not in name:
+                    continue
+                method = getattr(bench, method_name)
+                # A first call warms up the caches and connections, as in a long running program
+                method()
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    for _ in range(number):
+                        method()
+                    timings.append((time.perf_counter() - started) / number)
+                results[name] = {"min": min(timings), "median": statistics.median(timings), "number": number}
+                print(f"{name:<60} {_format(results[name]['median']):>10} (min {_format(results[name]['min'])})")
+        finally:
+            if hasattr(bench, "teardown"):
+                bench.teardown()
+
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compare results to a baseline.
+
+    :param dict results: The results returned by *run*
+    :param dict baseline: The results of an earlier run
+    :param float threshold: The fraction by which a median may grow before it is a regression; the default is 0.25
+    :return list: The names of the benchmarks slower than the baseline by more than the threshold
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<60} {'new':>10}")
+            continue
+        ratio = result["median"] / base["median"] if base["median"] else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<60} {ratio:>9.2f}x ({_format(base['median'])} -> {_format(result['median'])}){flag}")
+
+    return regressions
+
+
+def _format(seconds):
+    """Return a duration with a readable unit."""
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 0.001:
+        return f"{seconds * 1000:.2f}ms"
+    return f"{seconds * 1000000:.1f}us"
+
+
+def main(argv=None):
+    """Parse the command line and run the benchmarks.
+
+    :param list argv: The command line arguments; the default is sys.argv
+    :return int: The exit status
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the cert_manager hot paths against a local simulator")
+    parser.add_argument("-k", dest="pattern", help="only run the benchmarks whose name contains this string")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="the number of timings of each benchmark")
+    parser.add_argument("--save", metavar="PATH", help="save the results as a baseline JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="compare the results with a baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="the fraction a median may grow before it counts as a regression")
+    args = parser.parse_args(argv)
+    # Client warns about the reason phrase of every POST response, which would drown the timings
+    logging.basicConfig(level=logging.ERROR)
+
+    results = run(args.pattern, args.repeat)
+
+    status = 0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as handle:
+            baseline = json.load(handle)["benchmarks"]
+        print()
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}")
+            status = 1
+
+    if args.save:
+        data = {
+            "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                        "processor": platform.processor() or platform.machine(), "cpus": os.cpu_count()},
+            "repeat": args.repeat,
+            "benchmarks": results,
+        }
+        with open(args.save, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2, sort_keys=True)
+            handle.write("\n")
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,13 +3,25 @@
 
 from .acme import ACMEAccount
 from .admin import Admin
+from .async_client import AsyncClient
 from .client import Client
 from .domain import Domain
+from .expiry import ExpiryIndex
+from .inventory import Inventory
 from .report import Report
 from ._helpers import Pending
+from ._metrics import LatencyHistogram, RequestMetrics
+from ._poller import IssuancePoller
+from ._ratelimit import RateLimiter
+from ._retry import RetryPolicy
 from .organization import Organization
 from .person import Person
+from .renewal import BulkRenewer
 from .smime import SMIME
 from .ssl import SSL
 
-__all__ = ["ACMEAccount", "Admin", "Client", "Domain", "Organization", "Pending", "Person", "Report", "SMIME", "SSL"]
+__all__ = [
+    "ACMEAccount", "Admin", "AsyncClient", "BulkRenewer", "Client", "Domain", "ExpiryIndex", "Inventory",
+    "IssuancePoller", "LatencyHistogram", "Organization", "Pending", "Person", "RateLimiter", "Report",
+    "RequestMetrics", "RetryPolicy", "SMIME", "SSL",
+]
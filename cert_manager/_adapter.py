@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""Define the connection pool adapter used by cert_manager.client.Client."""
+
+import logging
+import socket
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from ._metrics import record_connection
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ConnectionStats:
+    """Count requests sent and connections opened by a PoolAdapter.
+
+    Every new HTTPS connection costs a TLS handshake, so comparing *new_connections* to *requests* shows whether the
+    connection pool is large enough for the number of threads sharing it.
+    """
+
+    def __init__(self):
+        """Initialize the class."""
+        self.__lock = threading.Lock()
+        self.__requests = 0
+        self.__new_connections = 0
+        self.__tls_handshakes = 0
+
+    @property
+    def requests(self):
+        """Return the number of requests sent."""
+        return self.__requests
+
+    @property
+    def new_connections(self):
+        """Return the number of connections opened."""
+        return self.__new_connections
+
+    @property
+    def tls_handshakes(self):
+        """Return the number of HTTPS connections opened."""
+        return self.__tls_handshakes
+
+    @property
+    def reused(self):
+        """Return the number of requests sent over an already open connection."""
+        return max(self.__requests - self.__new_connections, 0)
+
+    def add_request(self):
+        """Count a request being sent."""
+        with self.__lock:
+            self.__requests += 1
+
+    def add_connection(self, secure=False):
+        """Count a connection being opened.
+
+        :param bool secure: True if the connection uses TLS
+        """
+        with self.__lock:
+            self.__new_connections += 1
+            if secure:
+                self.__tls_handshakes += 1
+
+    def reset(self):
+        """Set all counters back to zero."""
+        with self.__lock:
+            self.__requests = 0
+            self.__new_connections = 0
+            self.__tls_handshakes = 0
+
+    def as_dict(self):
+        """Return the counters as a dictionary."""
+        with self.__lock:
+            return {
+                "requests": self.__requests,
+                "new_connections": self.__new_connections,
+                "reused": max(self.__requests - self.__new_connections, 0),
+                "tls_handshakes": self.__tls_handshakes,
+            }
+
+
+class PoolAdapter(HTTPAdapter):
+    """An HTTPAdapter which counts new connections and can turn on TCP keep-alive probes."""
+
+    def __init__(self, stats=None, tcp_keepalive=False, **kwargs):
+        """Initialize the class.
+
+        :param object stats: A ConnectionStats object to update; a new one is created if not provided
+        :param bool tcp_keepalive: Turn on TCP keep-alive probes on the pooled sockets if True; the default is False
+        :param dict kwargs: Any parameters accepted by requests.adapters.HTTPAdapter (pool_connections, pool_maxsize,
+            pool_block, max_retries)
+        """
+        # These need to be set before calling HTTPAdapter.__init__, which builds the pool manager
+        self.stats = stats if stats is not None else ConnectionStats()
+        self.tcp_keepalive = tcp_keepalive
+
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        """Build the urllib3 pool manager with connection pools that report new connections to *self.stats*."""
+        if self.tcp_keepalive:
+            pool_kwargs.setdefault(
+                "socket_options", HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+            )
+
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: _counting_pool_class(pool_class, self.stats, scheme == "https")
+            for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    def send(self, request, *args, **kwargs):  # pylint: disable=signature-differs
+        """Count the request and send it."""
+        self.stats.add_request()
+
+        return super().send(request, *args, **kwargs)
+
+
+def _counting_pool_class(pool_class, stats, secure):
+    """Build a subclass of a urllib3 connection pool class which counts new connections and times their opening."""
+
+    def _new_conn(self):
+        """Count the new connection and create it."""
+        stats.add_connection(secure=secure)
+        LOGGER.debug("Opening new connection to %s:%s", self.host, self.port)
+
+        return pool_class._new_conn(self)  # pylint: disable=protected-access
+
+    return type(pool_class.__name__, (pool_class,), {
+        "_new_conn": _new_conn,
+        "ConnectionCls": _timed_connection_class(pool_class.ConnectionCls, secure),
+    })
+
+
+def _timed_connection_class(connection_class, secure):
+    """Build a subclass of a urllib3 connection class which reports the time spent connecting to the metrics."""
+
+    def _new_conn(self):
+        """Open the socket (resolving the host name and connecting), timing it."""
+        started = time.monotonic()
+        sock = connection_class._new_conn(self)  # pylint: disable=protected-access
+        self._cert_manager_socket_time = time.monotonic() - started  # pylint: disable=protected-access
+
+        return sock
+
+    def connect(self):
+        """Connect, reporting the socket and TLS handshake times."""
+        self._cert_manager_socket_time = 0.0  # pylint: disable=protected-access
+        started = time.monotonic()
+        connection_class.connect(self)
+        elapsed = time.monotonic() - started
+
+        socket_time = self._cert_manager_socket_time  # pylint: disable=protected-access
+        if secure:
+            record_connection(socket_time, max(elapsed - socket_time, 0.0))
+        else:
+            record_connection(elapsed)
+
+    return type(connection_class.__name__, (connection_class,), {"_new_conn": _new_conn, "connect": connect})
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._cache.TTLCache class and the cache shared by the endpoint classes."""
+
+import logging
+import threading
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+
+class _Flight:  # pylint: disable=too-few-public-methods
+    """Hold the outcome of a fetch which other threads are waiting on."""
+
+    def __init__(self):
+        """Initialize the class."""
+        self.event = threading.Event()
+        self.value = None
+        self.exc = None
+
+
+class TTLCache:
+    """Cache values for a limited time, fetching each missing value only once.
+
+    Keys are tuples.  When several threads ask for the same missing key at once, only the first one calls the fetch
+    function; the others wait for its result (or its exception) instead of sending the same request.
+
+    Expired values are dropped when their key is asked for, and every *ttl* seconds all of them are swept when a new
+    value is stored, so the keys which are never asked for again do not stay in memory.  The cached values are shared
+    by every caller: code handing them out must return copies of mutable values.
+    """
+
+    def __init__(self, ttl=3600):
+        """Initialize the class.
+
+        :param float ttl: The number of seconds a value is kept; the default is 3600
+        """
+        self.ttl = ttl
+        self.__lock = threading.Lock()
+        self.__entries = {}
+        self.__flights = {}
+        # The monotonic time of the next sweep of the expired values
+        self.__next_sweep = 0
+
+    def __len__(self):
+        """Return the number of values cached, including expired ones not evicted yet."""
+        return len(self.__entries)
+
+    def get(self, key, fetch, ttl=None):
+        """Return the cached value for the key, calling the fetch function if it is missing or expired.
+
+        :param tuple key: The cache key
+        :param callable fetch: A function without parameters returning the value
+        :param float ttl: The number of seconds to keep the value; the default is *self.ttl*
+        :return obj: The cached or fetched value
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    return entry[1]
+                del self.__entries[key]
+
+            flight = self.__flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.__flights[key] = _Flight()
+
+        if not leader:
+            flight.event.wait()
+            if flight.exc is not None:
+                raise flight.exc
+            return flight.value
+
+        try:
+            flight.value = fetch()
+            now = time.monotonic()
+            with self.__lock:
+                self.__entries[key] = (now + (self.ttl if ttl is None else ttl), flight.value)
+                if now >= self.__next_sweep:
+                    self.__evict(now)
+                    self.__next_sweep = now + self.ttl
+        except Exception as exc:
+            flight.exc = exc
+            raise
+        finally:
+            with self.__lock:
+                del self.__flights[key]
+            flight.event.set()
+
+        return flight.value
+
+    def invalidate(self, prefix=()):
+        """Remove the cached values whose key starts with the given prefix.
+
+        :param tuple prefix: The first elements of the keys to remove; the default removes everything
+        """
+        prefix = tuple(prefix)
+        with self.__lock:
+            for key in [key for key in self.__entries if key[:len(prefix)] == prefix]:
+                del self.__entries[key]
+        LOGGER.debug("Cache entries for %s invalidated", prefix)
+
+    def discard(self, key):
+        """Remove the cached value of one key, if there is one.
+
+        Unlike *invalidate*, this does not scan the other keys, so it can be called on every lookup.
+
+        :param tuple key: The cache key
+        """
+        with self.__lock:
+            self.__entries.pop(key, None)
+
+    def evict_expired(self):
+        """Remove all expired values."""
+        with self.__lock:
+            self.__evict(time.monotonic())
+
+    def __evict(self, now):
+        """Remove the values expired at the given time; the caller holds the lock."""
+        for key in [key for key, entry in self.__entries.items() if entry[0] <= now]:
+            del self.__entries[key]
+
+
+# The account metadata (certificate types, custom fields) rarely changes, so it is shared by all endpoint objects
+METADATA_CACHE = TTLCache()
@@ -1,15 +1,42 @@
 # -*- coding: utf-8 -*-
 """Define the cert_manager._certificate.Certificates base class."""
 
+import copy
 import logging
+import threading
 from requests.exceptions import HTTPError
 
-from ._helpers import CustomFieldsError, Pending
+from ._cache import METADATA_CACHE
+from ._custom_fields import CustomFieldsValidator
+from ._helpers import Pending, run_concurrently
 from ._endpoint import Endpoint
+from ._poller import IssuancePoller
 
 LOGGER = logging.getLogger(__name__)
 
 
+class _CustomFieldsEntry:  # pylint: disable=too-few-public-methods
+    """Hold the custom fields of an account and the validator built from them, in one cache entry."""
+
+    def __init__(self, fields):
+        """Initialize the class.
+
+        :param list fields: The custom fields, as returned by the customFields endpoint
+        """
+        self.fields = fields
+        self.__validator = None
+        self.__lock = threading.Lock()
+
+    @property
+    def validator(self):
+        """Return the CustomFieldsValidator of the fields, built on first use."""
+        with self.__lock:
+            if self.__validator is None:
+                self.__validator = CustomFieldsValidator(self.fields)
+
+            return self.__validator
+
+
 class Certificates(Endpoint):
     """Act as a superclass for all certificate-related classes.
 
@@ -29,6 +56,9 @@ class Certificates(Endpoint):
         "pemia",    # for Certificate (w/ issuer after), PEM encoded
     ]
 
+    # The cache of the certificate types and custom fields, shared by all instances
+    cache = METADATA_CACHE
+
     def __init__(self, client, endpoint, api_version="v1"):
         """Initialize the class.
 
@@ -38,47 +68,70 @@ class Certificates(Endpoint):
         """
         super().__init__(client=client, endpoint=endpoint, api_version=api_version)
 
-        # Set to None initially.  Will be filled in by methods later.
-        self.__cert_types = None
-        self.__custom_fields = None
+        # The account metadata is shared by every object talking to the same account and endpoint
+        self._cache_key = (client.base_url, client.login_uri, endpoint, api_version)
+
+    def _fetch_types(self):
+        """Retrieve the certificate types from the API, keyed by name."""
+        url = self._url("/types")
+        result = self._client.get(url)
+
+        # Build a dictionary instead of a flat list of dictionaries
+        cert_types = {}
+        for res in result.json():
+            name = res["name"]
+            cert_types[name] = {}
+            cert_types[name]["id"] = res["id"]
+            cert_types[name]["terms"] = res["terms"]
+
+        return cert_types
+
+    def _fetch_custom_fields(self):
+        """Retrieve the custom fields from the API."""
+        url = self._url("/customFields")
+        result = self._client.get(url)
+
+        return result.json()
 
     @property
     def types(self):
         """Retrieve all certificate types that are currently available.
 
+        The result is kept in *self.cache* for *self.cache.ttl* seconds and shared with all objects using the same
+        account, endpoint and API version; each call returns a copy, which the caller may change.
+
         :return list: A list of dictionaries of certificate types
         """
-        # Only go to the API if we haven't done the API call yet, or if someone
-        # specifically wants to refresh the internal cache
-        if not self.__cert_types:
-            url = self._url("/types")
-            result = self._client.get(url)
-
-            # Build a dictionary instead of a flat list of dictionaries
-            self.__cert_types = {}
-            for res in result.json():
-                name = res["name"]
-                self.__cert_types[name] = {}
-                self.__cert_types[name]["id"] = res["id"]
-                self.__cert_types[name]["terms"] = res["terms"]
-
-        return self.__cert_types
+        return copy.deepcopy(self.cache.get(self._cache_key + ("types",), self._fetch_types))
 
     @property
     def custom_fields(self):
         """Retrieve all custom fields defined for SSL certificates.
 
+        The result is kept in *self.cache* for *self.cache.ttl* seconds and shared with all objects using the same
+        account, endpoint and API version; each call returns a copy, which the caller may change.
+
         :return list: A list of dictionaries of custom fields
         """
-        # Only go to the API if we haven't done the API call yet, or if someone
-        # specifically wants to refresh the internal cache
-        if self.__custom_fields is None:
-            url = self._url("/customFields")
-            result = self._client.get(url)
+        return copy.deepcopy(self._custom_fields_entry().fields)
+
+    @property
+    def custom_fields_validator(self):
+        """Return the validator of custom field values, built once each time the custom fields are retrieved.
+
+        :return obj: A CustomFieldsValidator object
+        """
+        return self._custom_fields_entry().validator
 
-            self.__custom_fields = result.json()
+    def _custom_fields_entry(self):
+        """Return the cached custom fields, which also hold their validator so the two always expire together."""
+        return self.cache.get(
+            self._cache_key + ("custom_fields",), lambda: _CustomFieldsEntry(self._fetch_custom_fields())
+        )
 
-        return self.__custom_fields
+    def invalidate_cache(self):
+        """Drop the cached certificate types and custom fields, so they are retrieved again on next use."""
+        self.cache.invalidate(self._cache_key)
 
     def _validate_custom_fields(self, custom_fields):
         """Check the structure and contents of a list of dicts representing custom fields
@@ -86,28 +139,7 @@ class Certificates(Endpoint):
 
         :raises Exception: if any of the validation steps fail
         """
-        # Make sure all custom fields are valid if present
-        custom_field_names = [f['name'] for f in self.custom_fields]
-        for custom_field in custom_fields:
-            if not isinstance(custom_field, dict):
-                msg = "Values in the custom_fields list must be dictionaries, not {}"
-                raise CustomFieldsError(msg.format(type(custom_field)))
-            if not ('name' in custom_field and 'value' in custom_field):
-                raise CustomFieldsError(
-                    "Dictionaries in the custom_fields list must contain both a 'name' key and 'value' key"
-                )
-            if custom_field.get('name') not in custom_field_names:
-                msg = "Custom field {} not defined for your account. defined custom fields are {}"
-                raise CustomFieldsError(msg.format(custom_field.get('name'), custom_field_names))
-        mandatory_fields = [f['name'] for f in self.custom_fields if f['mandatory'] is True]
-        for field_name in mandatory_fields:
-            # for each mandatory field, there should be exactly one dict in the custom_fields list
-            # whose name matches that mandatory field name
-            matching_fields = [f for f in custom_fields if f['name'] == field_name]
-            if len(matching_fields) < 1:
-                raise CustomFieldsError(f"Missing mandatory custom field {field_name}")
-            if len(matching_fields) > 1:
-                raise CustomFieldsError(f"Too many custom field objects with name {field_name}")
+        self.custom_fields_validator.validate(custom_fields)
 
     def collect(self, cert_id, cert_format):
         """Retrieve an existing certificate from the API.
@@ -131,6 +163,43 @@ class Certificates(Endpoint):
         # The certificate is ready for collection
         return result.content.decode(result.encoding)
 
+    def collect_many(self, cert_ids, cert_format, max_workers=10):
+        """Retrieve many existing certificates from the API at the same time.
+
+        The requests are sent from a pool of worker threads sharing the session of the Client, whose connection pool
+        (*pool_maxsize*) should be at least *max_workers* to avoid opening throw-away connections.
+
+        :param iter cert_ids: The certificate IDs
+        :param str cert_format: The format in which to retreive the certificates. Allowed values: *self.valid_formats*
+        :param int max_workers: The maximum number of requests in flight; the default is 10
+        :return iter: Yield (cert_id, result) tuples as each request completes, where result is the string
+            representing the certificate, or the exception raised (i.e. Pending) for that certificate
+        """
+        if cert_format not in self.valid_formats:
+            raise ValueError(f"Invalid cert format {cert_format} provided")
+
+        return run_concurrently(lambda cert_id: self.collect(cert_id, cert_format), cert_ids, max_workers=max_workers)
+
+    def wait_for_issuance(self, cert_ids, cert_format, **kwargs):
+        """Collect pending certificates until they are issued, backing off on each certificate separately.
+
+        :param iter cert_ids: The certificate IDs, usually just enrolled
+        :param str cert_format: The format in which to retreive the certificates. Allowed values: *self.valid_formats*
+        :param dict kwargs: Any parameters accepted by cert_manager.IssuancePoller (initial_delay, max_delay, backoff,
+            max_rate, timeout, max_workers)
+        :return iter: Yield (cert_id, result) tuples as each certificate is issued, where result is the string
+            representing the certificate, or the exception raised for it.  Certificates still pending at the timeout
+            are yielded with a Pending exception.
+        """
+        if cert_format not in self.valid_formats:
+            raise ValueError(f"Invalid cert format {cert_format} provided")
+
+        poller = IssuancePoller(lambda cert_id: self.collect(cert_id, cert_format), **kwargs)
+        for cert_id in cert_ids:
+            poller.add(cert_id)
+
+        return poller.poll()
+
     def enroll(self, **kwargs):
         """Enroll a certificate request with Sectigo to generate a certificate.
 
@@ -145,6 +214,51 @@ class Certificates(Endpoint):
             Note: each object must have a 'name' key and a 'value' key
         :return dict: The certificate_id and the normal status messages for errors
         """
+        data = self._enroll_data(self.types, None, **kwargs)
+
+        return self._submit_enroll(data, **kwargs)
+
+    def enroll_many(self, requests, max_workers=10):
+        """Enroll many certificate requests, validating all of them before submitting any.
+
+        Every request is checked against one snapshot of *self.types* and *self.custom_fields*, then the valid ones
+        are submitted concurrently.  A request failing validation or submission does not stop the others.
+
+        :param list requests: A list of dictionaries, each holding the parameters *enroll* takes
+        :param int max_workers: The maximum number of enrollments in flight; the default is 10
+        :return list: For each request, in the same order, the result *enroll* returns or the exception raised
+        """
+        requests = list(requests)
+        cert_types = self.types
+        validator = self.custom_fields_validator
+
+        results = {}
+        valid = []
+        for index, request in enumerate(requests):
+            try:
+                valid.append((index, self._enroll_data(cert_types, validator, **request)))
+            except Exception as exc:  # pylint: disable=broad-except
+                results[index] = exc
+        LOGGER.debug("%s of %s enrollment requests are valid", len(valid), len(requests))
+
+        def submit(entry):
+            """Submit one validated request."""
+            index, data = entry
+            return self._submit_enroll(data, **requests[index])
+
+        for (index, _), result in run_concurrently(submit, valid, max_workers=max_workers):
+            results[index] = result
+
+        return [results[index] for index in range(len(requests))]
+
+    def _enroll_data(self, cert_types, validator, **kwargs):
+        """Validate the parameters of an enrollment and build the request body.
+
+        :param dict cert_types: The certificate types, as returned by *self.types*
+        :param object validator: The CustomFieldsValidator to use, or None to use *self.custom_fields_validator*
+        :param dict kwargs: The parameters passed to *enroll*
+        :return dict: The data to POST to the enroll endpoint
+        """
         # Retrieve all the arguments
         cert_type_name = kwargs.get("cert_type_name")
         csr = kwargs.get("csr")
@@ -152,14 +266,14 @@ class Certificates(Endpoint):
         org_id = kwargs.get("org_id")
         subject_alt_names = kwargs.get("subject_alt_names", None)
         external_requester = kwargs.get("external_requester", None)
-        custom_fields = kwargs.get("custom_fields", [])
+        custom_fields_values = kwargs.get("custom_fields", [])
 
         # Make sure a valid certificate type name was provided
-        if cert_type_name not in self.types:
+        if cert_type_name not in cert_types:
             raise ValueError(f"Incorrect certificate type specified: '{cert_type_name}'")
 
-        type_id = self.types[cert_type_name]["id"]
-        terms = self.types[cert_type_name]["terms"]
+        type_id = cert_types[cert_type_name]["id"]
+        terms = cert_types[cert_type_name]["terms"]
 
         # Make sure a valid term is specified
         if term not in terms:
@@ -168,21 +282,33 @@ class Certificates(Endpoint):
             trm = ", ".join(list(map(str, terms)))
             raise ValueError(f"Incorrect term specified: {term}.  Valid terms are {trm}.")
 
-        self._validate_custom_fields(custom_fields)
+        if validator is None:
+            validator = self.custom_fields_validator
+        validator.validate(custom_fields_values)
 
         # SAN field needs to be a comma-separated string, not a list, opposite to replace
         final_san = subject_alt_names
         if isinstance(subject_alt_names, list):
             final_san = ",".join(subject_alt_names)
 
-        url = self._url("/enroll")
         data = {
             "orgId": org_id, "csr": csr.rstrip(), "subjAltNames": final_san, "certType": type_id,
             "numberServers": 1, "serverType": -1, "term": term, "comments": f"Enrolled by {self._client.user_agent}",
             "externalRequester": external_requester
         }
-        if custom_fields:
-            data['customFields'] = custom_fields
+        if custom_fields_values:
+            data['customFields'] = custom_fields_values
+
+        return data
+
+    def _submit_enroll(self, data, **kwargs):  # pylint: disable=unused-argument
+        """POST a validated enrollment request body.
+
+        :param dict data: The body built by *_enroll_data*
+        :param dict kwargs: The parameters passed to *enroll*
+        :return dict: The enrollment result from the API
+        """
+        url = self._url("/enroll")
         result = self._client.post(url, data=data)
 
         return result.json()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._custom_fields.CustomFieldsValidator class."""
+
+import copy
+
+from ._helpers import CustomFieldsError
+
+
+class CustomFieldsValidator:
+    """Check lists of custom field values against the custom fields defined for an account.
+
+    The names of the defined and mandatory fields are turned into sets once, so checking a list of values takes a
+    single pass over it, whatever the number of mandatory fields.
+    """
+
+    # The maximum number of distinct lists of field names whose outcome is remembered
+    MAX_SHAPES = 1024
+
+    def __init__(self, fields):
+        """Initialize the class.
+
+        :param list fields: The custom fields defined for the account, as returned by the customFields endpoint
+        """
+        self.__fields = fields
+        # The list keeps the API order for error messages; the sets are for lookups
+        self.__names = [field["name"] for field in fields]
+        self.__name_set = frozenset(self.__names)
+        self.__mandatory = [field["name"] for field in fields if field["mandatory"] is True]
+        self.__mandatory_set = frozenset(self.__mandatory)
+        # The error message (or None) of the check for each list of field names seen
+        self.__outcomes = {}
+
+    @property
+    def fields(self):
+        """Return a copy of the custom fields defined for the account."""
+        return copy.deepcopy(self.__fields)
+
+    @property
+    def mandatory(self):
+        """Return the names of the mandatory custom fields."""
+        return list(self.__mandatory)
+
+    def validate(self, custom_fields):
+        """Check the structure and contents of a list of dicts representing custom fields.
+
+        The outcome is remembered for lists of well-formed values, keyed by their field names in order, so a batch
+        where every request sets the same fields is only checked once.
+
+        :param list custom_fields: The custom field values, each a dictionary with a "name" and a "value"
+        :raises CustomFieldsError: if the values are not valid
+        """
+        key = self._shape(custom_fields)
+        if key is not None and key in self.__outcomes:
+            message = self.__outcomes[key]
+        else:
+            message = self._check(custom_fields)
+            if key is not None and len(self.__outcomes) < self.MAX_SHAPES:
+                self.__outcomes[key] = message
+
+        # A new exception each time, as a raised exception keeps its traceback
+        if message is not None:
+            raise CustomFieldsError(message)
+
+    def validate_many(self, batch):
+        """Check many lists of custom field values.
+
+        :param iter batch: The lists of custom field values
+        :return list: For each list, in the same order, None if it is valid or the CustomFieldsError raised
+        """
+        errors = []
+        for custom_fields in batch:
+            try:
+                self.validate(custom_fields)
+                errors.append(None)
+            except CustomFieldsError as exc:
+                errors.append(exc)
+
+        return errors
+
+    def _check(self, custom_fields):
+        """Check a list of custom field values in a single pass, returning the error message or None."""
+        counts = dict.fromkeys(self.__mandatory, 0)
+        for custom_field in custom_fields:
+            if not isinstance(custom_field, dict):
+                msg = "Values in the custom_fields list must be dictionaries, not {}"
+                return msg.format(type(custom_field))
+            if not ("name" in custom_field and "value" in custom_field):
+                return "Dictionaries in the custom_fields list must contain both a 'name' key and 'value' key"
+            name = custom_field["name"]
+            try:
+                defined = name in self.__name_set
+            except TypeError:
+                # An unhashable name, such as a list, cannot be a field name
+                defined = False
+            if not defined:
+                msg = "Custom field {} not defined for your account. defined custom fields are {}"
+                return msg.format(name, self.__names)
+            if name in self.__mandatory_set:
+                counts[name] += 1
+
+        # Each mandatory field must be given exactly once
+        for name, count in counts.items():
+            if count < 1:
+                return f"Missing mandatory custom field {name}"
+            if count > 1:
+                return f"Too many custom field objects with name {name}"
+
+        return None
+
+    @staticmethod
+    def _shape(custom_fields):
+        """Return the tuple of field names of a list of well-formed values, or None if any value is malformed."""
+        names = []
+        for custom_field in custom_fields:
+            if not isinstance(custom_field, dict) or "name" not in custom_field or "value" not in custom_field:
+                return None
+            names.append(custom_field["name"])
+
+        key = tuple(names)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+
+        return key
@@ -2,9 +2,14 @@
 """Define the cert_manager._endpoint.Endpoint base class."""
 
 import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 LOGGER = logging.getLogger(__name__)
 
+# The API URLs overridden for the current thread or asyncio task, keyed by the id() of the Endpoint object
+_API_URL_OVERRIDES = ContextVar("cert_manager_api_url_overrides", default=None)
+
 
 class Endpoint:
     """Act as a superclass for all Sectigo Cert Manager APIs endpoints."""
@@ -30,6 +35,37 @@ class Endpoint:
         """Return the internal _api_url value."""
         return self._api_url
 
+    @property
+    def _api_url(self):
+        """Return the API URL, or the one overridden by the current call (see *_override_api_url*)."""
+        overrides = _API_URL_OVERRIDES.get()
+        if overrides and id(self) in overrides:
+            return overrides[id(self)]
+
+        return self.__api_url
+
+    @_api_url.setter
+    def _api_url(self, value):
+        """Set the API URL used by every call."""
+        self.__api_url = value
+
+    @contextmanager
+    def _override_api_url(self, api_url):
+        """Use another API URL for this object only in the current thread or asyncio task, until the block exits.
+
+        The object itself is not changed, so calls running at the same time in other threads or tasks still see
+        their own URL.
+
+        :param str api_url: The API URL to use
+        """
+        overrides = dict(_API_URL_OVERRIDES.get() or {})
+        overrides[id(self)] = api_url
+        token = _API_URL_OVERRIDES.set(overrides)
+        try:
+            yield api_url
+        finally:
+            _API_URL_OVERRIDES.reset(token)
+
     @staticmethod
     def create_api_url(base_url, service, version):
         """Build the entire Certificate Manager API URL for the service and version.
@@ -3,17 +3,48 @@
 
 import logging
 import re
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from functools import wraps
 
 from requests.exceptions import HTTPError
 
 
+# Response bodies larger than this many bytes are not logged by traffic_log
+TRAFFIC_LOG_MAX_BODY = 65536
+
+# Content types whose bodies traffic_log logs as text; anything else is treated as binary
+_TEXT_CONTENT_TYPES = ("text/", "json", "xml", "javascript", "x-www-form-urlencoded")
+
+
+def _loggable_text(response, streamed):
+    """Return the body of a response as logged by traffic_log, avoiding the decoding of large or binary bodies.
+
+    :param obj response: A requests.Response object
+    :param bool streamed: True if the body is streamed to the caller, so it must not be read
+    :return str: The body text, or a short description of the body if it is not logged
+    """
+    if streamed:
+        # Reading the text would load the whole body the caller wants to stream
+        return "<streamed>"
+
+    size = len(response.content or b"")
+    content_type = response.headers.get("Content-Type", "")
+    if content_type and not any(kind in content_type.lower() for kind in _TEXT_CONTENT_TYPES):
+        return f"<{size} bytes of {content_type}>"
+    if size > TRAFFIC_LOG_MAX_BODY:
+        return f"<{size} bytes>"
+
+    return response.text
+
+
 def traffic_log(traffic_logger=None):
     """Log traffic for the wrapped function.
 
     This will wrap any function with a call to `logger.debug()` displaying useful before and after information from
     API calls.  This obeys the log level set in logging, so if the level is not set to "DEBUG", no messages will be
-    logged.
+    logged and the wrapped function is called directly.  Binary bodies and bodies larger than
+    *TRAFFIC_LOG_MAX_BODY* bytes are summarized instead of logged.
 
     Note: The "DEBUG" level should *never* be used in production.
 
@@ -22,21 +53,26 @@ def traffic_log(traffic_logger=None):
 
     def decorator(func):
         """Wrap the actual decorator so a reference to the function can be returned."""
+        # Everything not depending on the arguments is worked out once, when the function is decorated
+        valid_logger = isinstance(traffic_logger, logging.Logger)
+
+        # Try to get rid of surrounding underscores and then upcase function name
+        func_name = func.__name__
+        match = re.search(r"^_*(\w+?)_*$", func_name)
+        if match:
+            func_name = match.group(1).upper()
 
         @wraps(func)
         def log_traffic(*args, **kwargs):
             """Decorate the wrapped function."""
             # Make sure traffic_logger was set correctly
-            if not isinstance(traffic_logger, logging.Logger):
+            if not valid_logger:
                 raise Exception(
                     "traffic_log: No logging.Logger instance provided"
                 )
 
-            # Try to get rid of surrounding underscores and then upcase function name
-            func_name = func.__name__
-            match = re.search(r"^_*(\w+?)_*$", func_name)
-            if match:
-                func_name = match.group(1).upper()
+            if not traffic_logger.isEnabledFor(logging.DEBUG):
+                return func(*args, **kwargs)
 
             # Check if the URL or headers exist in the parameters
             # Note: *self* will be the first argument, so actual arguments start after that.
@@ -72,7 +108,7 @@ def traffic_log(traffic_logger=None):
                     f"Result headers: {herr.response.headers}"
                 )
                 traffic_logger.debug(
-                    f"Text result: {herr.response.text}"
+                    f"Text result: {_loggable_text(herr.response, kwargs.get('stream'))}"
                 )
 
                 # Re-raise the original exception
@@ -89,7 +125,7 @@ def traffic_log(traffic_logger=None):
                 traffic_logger.debug(
                     f"Result headers: {result.headers}"
                 )
-                traffic_logger.debug(f"Text result: {result.text}")
+                traffic_logger.debug(f"Text result: {_loggable_text(result, kwargs.get('stream'))}")
             return result
 
         return log_traffic
@@ -102,8 +138,9 @@ def version_hack(service, version="v1"):
 
     For the most part, the Sectigo Certificate Manager API uses the same version (v1) for all API calls. However,
     there are a few calls spread throughout the API spec that use "v2" currently.  This wrapper is designed to
-    temporarily change the version to something other than what the object was initialized with so that the internal
-    *self.api_url* will be correct.
+    change the version to something other than what the object was initialized with for the duration of the call so
+    that the internal *self.api_url* will be correct.  The override only applies to the current thread or asyncio
+    task, so the object can be shared by concurrent calls using different versions.
 
     :param version: API version string to use. If None, 'v1'
     """
@@ -119,27 +156,9 @@ def version_hack(service, version="v1"):
             if not version:
                 raise Exception("version_hack: No version provided")
 
-            api = self.create_api_url(
-                self._client.base_url, service, version
-            )  # pylint: disable=protected-access
-            save_url = self.api_url
-            self._api_url = api  # pylint: disable=protected-access
-
-            try:
-                retval = func(self, *args, **kwargs)
-
-                # Reset the api_url back to the original
-                self._api_url = (
-                    save_url  # pylint: disable=protected-access
-                )
-
-                return retval
-            except Exception as exc:
-                # Reset the api_url back to the original
-                self._api_url = (
-                    save_url  # pylint: disable=protected-access
-                )
-                raise exc
+            api = self.create_api_url(self._client.base_url, service, version)  # pylint: disable=protected-access
+            with self._override_api_url(api):  # pylint: disable=protected-access
+                return func(self, *args, **kwargs)
 
         return api_version  # true decorator
 
@@ -157,6 +176,11 @@ def paginate(func):
         The `size` and `position` parameters passed through `kwargs` to this function will be used
         by the pagination wrapper to page through results.
 
+        Read-ahead is enabled by passing `prefetch`, the number of pages to keep in flight at the same time.  Results
+        are still yielded in order, and paging stops at the first page shorter than `size`.  If `total` is passed, no
+        pages past that number of results will be requested; `total=True` asks the endpoint's *count* method (with the
+        same filtering parameters) for the number of results first.
+
         :param list args: Positional parameters to pass to the wrapped function
         :param dict kwargs: A dictionary with any parameters to add to the request URL
 
@@ -166,9 +190,18 @@ def paginate(func):
             "size", 200
         )  # max seems to be 200 by default
         position = kwargs.pop("position", 0)  # 0-..
+        prefetch = kwargs.pop("prefetch", 0)
+        total = kwargs.pop("total", None)
+
+        if total is True:
+            total = _count_results(args, kwargs)
+
+        if prefetch and prefetch > 1:
+            yield from _prefetch_pages(func, args, kwargs, size=size, position=position, prefetch=prefetch, total=total)
+            return
 
         lastsize = size
-        while lastsize == size:
+        while lastsize == size and (total is None or position < total):
             retval = func(
                 *args, size=size, position=position, **kwargs
             )
@@ -179,6 +212,101 @@ def paginate(func):
     return decorator
 
 
+def _count_results(args, kwargs):
+    """Return the number of results reported by the *count* method of the endpoint, or None if there is none."""
+    count = getattr(args[0], "count", None) if args else None
+    if not callable(count):
+        return None
+
+    result = count(**kwargs)
+    # Some endpoints (i.e. Domain) return a dictionary instead of a number
+    if isinstance(result, dict):
+        result = result.get("count")
+
+    return result
+
+
+def _prefetch_pages(func, args, kwargs, *, size, position, prefetch, total):  # pylint: disable=too-many-arguments
+    """Yield results from pages fetched on worker threads, keeping up to *prefetch* pages in flight."""
+    with ThreadPoolExecutor(max_workers=prefetch, thread_name_prefix="cert_manager-paginate") as executor:
+        pending = deque()
+        next_position = position
+
+        def submit():
+            """Request the next page if it is expected to have any results."""
+            nonlocal next_position
+            if total is not None and next_position >= total:
+                return
+            pending.append(executor.submit(func, *args, size=size, position=next_position, **kwargs))
+            next_position += size
+
+        for _ in range(prefetch):
+            submit()
+
+        try:
+            while pending:
+                retval = pending.popleft().result()
+                if len(retval) < size:
+                    # This is the last page, so anything still in flight is past the end of the results
+                    yield from retval
+                    break
+                submit()
+                yield from retval
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def run_concurrently(func, items, max_workers=10, ordered=False):
+    """Call a function for every item on a pool of worker threads.
+
+    At most *max_workers* calls are in flight (and only twice that many items are taken from *items*) at any time,
+    so very long or lazily generated inputs are fine.  An exception raised by a call does not stop the others; it is
+    yielded as the result for that item instead.
+
+    :param callable func: The function to call with each item as its only argument
+    :param iter items: The items to pass to the function
+    :param int max_workers: The maximum number of calls in flight; the default is 10
+    :param bool ordered: Yield results in the order of *items* if True; the default is False, which yields results
+        as soon as they are available
+    :return iter: Yield (item, result) tuples, where result is either the return value or the exception raised
+    """
+    items = iter(items)
+    window = max(max_workers, 1) * 2
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cert_manager") as executor:
+        pending = deque()
+
+        def fill():
+            """Submit items until the window is full or the items are exhausted."""
+            while len(pending) < window:
+                try:
+                    item = next(items)
+                except StopIteration:
+                    return
+                pending.append((item, executor.submit(func, item)))
+
+        try:
+            fill()
+            while pending:
+                if ordered:
+                    done = [pending.popleft()]
+                    wait([done[0][1]])
+                else:
+                    wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+                    done = [(item, future) for item, future in pending if future.done()]
+                    for entry in done:
+                        pending.remove(entry)
+                fill()
+
+                for item, future in done:
+                    exc = future.exception()
+                    yield item, (exc if exc is not None else future.result())
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
 class Pending(Exception):
     """Serve as a generic Exception indicating a certificate is in a pending state."""
 
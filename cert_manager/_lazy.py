@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._lazy.LazyLoader class used by the list-style endpoint classes."""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+
+class LazyLoader:  # pylint: disable=too-many-instance-attributes
+    """Fetch a list from the API on first use, optionally persisting it and refreshing it in the background.
+
+    When a snapshot file is given, a recent enough snapshot written for the same URL is used instead of calling the
+    API, and every fetch rewrites it.  When a refresh interval is given, a daemon thread fetches the list again every
+    interval so readers never wait on the API after the first load.
+    """
+
+    def __init__(self, fetch, **kwargs):
+        """Initialize the class.
+
+        :param callable fetch: A function without parameters returning the list from the API
+        :param str key: A string identifying the list in the snapshot file (i.e. the API URL)
+        :param str snapshot: The path of a JSON file where the list is persisted between runs; the default is None,
+            which disables the snapshot
+        :param float snapshot_max_age: The maximum age, in seconds, of a snapshot which can be used; the default is
+            86400
+        :param float refresh: The interval, in seconds, between background refreshes; the default is None, which
+            disables the background refresh
+        """
+        self.__fetch = fetch
+        self.__key = kwargs.get("key")
+        self.__snapshot = kwargs.get("snapshot")
+        self.__snapshot_max_age = kwargs.get("snapshot_max_age", 86400)
+        self.__refresh = kwargs.get("refresh")
+
+        self.__data = None
+        self.__lock = threading.Lock()
+        self.__stop = threading.Event()
+        self.__thread = None
+
+    @property
+    def loaded(self):
+        """Return True if the list has been loaded."""
+        return self.__data is not None
+
+    def get(self, force=False):
+        """Return the list, loading it first if needed.
+
+        :param bool force: If set to True, force refreshing the data from the API
+        :return list: The list
+        """
+        data = self.__data
+        if data is not None and not force:
+            return data
+
+        with self.__lock:
+            # Another thread may have loaded the list while this one waited
+            if self.__data is not None and not force:
+                return self.__data
+
+            if self.__data is None and not force:
+                self.__data = self._load_snapshot()
+            if self.__data is None or force:
+                self.__data = self.__fetch()
+                self._save_snapshot(self.__data)
+
+            data = self.__data
+
+        self.start()
+
+        return data
+
+    def start(self):
+        """Start the background refresh thread, if a refresh interval is set and it is not running yet."""
+        if not self.__refresh or self.__thread is not None:
+            return
+
+        self.__stop.clear()
+        self.__thread = threading.Thread(target=self._run, name="cert_manager-refresh", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """Stop the background refresh thread."""
+        self.__stop.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def _run(self):
+        """Refresh the list every interval until stopped."""
+        while not self.__stop.wait(self.__refresh):
+            try:
+                data = self.__fetch()
+            except Exception as exc:  # pylint: disable=broad-except
+                LOGGER.warning("Background refresh failed, keeping the current data: %s", exc)
+                continue
+
+            # Swap the whole list so readers always see a complete one
+            with self.__lock:
+                self.__data = data
+            self._save_snapshot(data)
+
+    def _load_snapshot(self):
+        """Return the list from the snapshot file, or None if it is missing, stale or for another URL."""
+        if not self.__snapshot:
+            return None
+
+        try:
+            with open(self.__snapshot, "r", encoding="utf-8") as filep:
+                snapshot = json.load(filep)
+        except (OSError, ValueError) as exc:
+            LOGGER.debug("Snapshot %s not used: %s", self.__snapshot, exc)
+            return None
+
+        if not isinstance(snapshot, dict) or snapshot.get("key") != self.__key:
+            return None
+        if time.time() - snapshot.get("saved", 0) > self.__snapshot_max_age:
+            LOGGER.debug("Snapshot %s is too old", self.__snapshot)
+            return None
+
+        return snapshot.get("data")
+
+    def _save_snapshot(self, data):
+        """Write the list to the snapshot file, replacing it atomically."""
+        if not self.__snapshot:
+            return
+
+        directory = os.path.dirname(os.path.abspath(self.__snapshot))
+        tmp_path = None
+        try:
+            fdesc, tmp_path = tempfile.mkstemp(dir=directory, prefix=".cert_manager-")
+            with os.fdopen(fdesc, "w", encoding="utf-8") as filep:
+                json.dump({"key": self.__key, "saved": time.time(), "data": data}, filep)
+            os.replace(tmp_path, self.__snapshot)
+        except OSError as exc:
+            LOGGER.warning("Unable to write snapshot %s: %s", self.__snapshot, exc)
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""Define the per-request metrics reported by cert_manager.client.Client to its metrics callbacks."""
+
+import logging
+import math
+import re
+import threading
+from functools import lru_cache
+
+LOGGER = logging.getLogger(__name__)
+
+# Path segments replaced by a placeholder to build the endpoint template, checked in order
+SEGMENT_PATTERNS = [
+    (re.compile(r"^\d+$"), "{id}"),
+    (re.compile(r"^(x509|x509CO|x509IO|x509IOR|base64|bin|pem|pemco|pemia)$"), "{format}"),
+    (re.compile(r"^[^@]+@[^@]+$"), "{email}"),
+    # Serial numbers and UUIDs
+    (re.compile(r"^(?=.*\d)[0-9A-Fa-f:]{16,}$|^[0-9A-Fa-f]{8}(-[0-9A-Fa-f]{4}){3}-[0-9A-Fa-f]{12}$"), "{id}"),
+]
+
+# The connection times measured by the PoolAdapter for the request being sent by the current thread
+_CONNECTION_TIMES = threading.local()
+
+
+def record_connection(connect, tls=0.0):
+    """Add the time spent opening a connection to the request being sent by the current thread.
+
+    :param float connect: The seconds spent resolving the host name and opening the TCP connection
+    :param float tls: The seconds spent on the TLS handshake
+    """
+    _CONNECTION_TIMES.connect = getattr(_CONNECTION_TIMES, "connect", 0.0) + connect
+    _CONNECTION_TIMES.tls = getattr(_CONNECTION_TIMES, "tls", 0.0) + tls
+
+
+def take_connection_times():
+    """Return and reset the connection times recorded by the current thread.
+
+    :return tuple: The (connect, tls) times in seconds
+    """
+    times = (getattr(_CONNECTION_TIMES, "connect", 0.0), getattr(_CONNECTION_TIMES, "tls", 0.0))
+    _CONNECTION_TIMES.connect = 0.0
+    _CONNECTION_TIMES.tls = 0.0
+
+    return times
+
+
+@lru_cache(maxsize=4096)
+def endpoint_template(path):
+    """Return a URL path with its variable segments (IDs, formats, e-mail addresses) replaced by placeholders.
+
+    For example, "/ssl/v1/collect/1234/x509CO" becomes "/ssl/v1/collect/{id}/{format}".
+
+    :param str path: The URL path, without the query string
+    :return str: The endpoint template
+    """
+    segments = []
+    for segment in path.split("/"):
+        for pattern, placeholder in SEGMENT_PATTERNS:
+            if pattern.match(segment):
+                segment = placeholder
+                break
+        segments.append(segment)
+
+    return "/".join(segments)
+
+
+class RequestMetrics:  # pylint: disable=too-many-instance-attributes
+    """Hold the measurements of one request sent by a Client, including all its retries."""
+
+    def __init__(self, method, url, endpoint):
+        """Initialize the class.
+
+        :param str method: The HTTP method
+        :param str url: The full URL requested
+        :param str endpoint: The endpoint template of the URL (i.e. "/ssl/v1/collect/{id}/{format}")
+        """
+        self.method = method
+        self.url = url
+        self.endpoint = endpoint
+        # The HTTP status of the last response, or None if no response was received
+        self.status = None
+        self.bytes_out = 0
+        # None if the size is unknown (i.e. a streamed body without a Content-Length header)
+        self.bytes_in = None
+        # All durations are in seconds; connect includes resolving the host name
+        self.connect = 0.0
+        self.tls = 0.0
+        self.server = 0.0
+        self.total = 0.0
+        self.retries = 0
+        # The exception raised if no response was received
+        self.error = None
+
+    def as_dict(self):
+        """Return the measurements as a dictionary."""
+        return {
+            "method": self.method, "url": self.url, "endpoint": self.endpoint, "status": self.status,
+            "bytes_out": self.bytes_out, "bytes_in": self.bytes_in, "connect": self.connect, "tls": self.tls,
+            "server": self.server, "total": self.total, "retries": self.retries,
+            "error": str(self.error) if self.error is not None else None,
+        }
+
+    def add_response(self, response, streamed=False):
+        """Account for one response received (the last one of the request, or one which is retried).
+
+        :param obj response: The requests.Response object
+        :param bool streamed: True if the body was not read yet, so it must not be measured by reading it
+        """
+        self.status = response.status_code
+
+        body = response.request.body if response.request is not None else None
+        if body:
+            self.bytes_out += len(body)
+
+        length = response.headers.get("Content-Length")
+        if length is not None and length.isdigit():
+            self.bytes_in = int(length)
+        elif not streamed:
+            self.bytes_in = len(response.content or b"")
+
+        connect, tls = take_connection_times()
+        self.connect += connect
+        self.tls += tls
+        # requests measures from sending the request to parsing the headers, which includes opening the connection
+        self.server += max(response.elapsed.total_seconds() - connect - tls, 0.0)
+
+
+class LatencyHistogram:
+    """Aggregate request latencies per endpoint in memory, to report percentiles.
+
+    Latencies are counted in logarithmic buckets each about 5% wide, so the memory used does not grow with the number
+    of requests and percentiles are accurate to about 5%.  Register the object itself as a Client metrics callback.
+    """
+
+    GROWTH = 1.05
+    # Latencies below one millisecond all share the first bucket
+    MINIMUM = 0.001
+
+    def __init__(self, field="total"):
+        """Initialize the class.
+
+        :param str field: The RequestMetrics duration to aggregate; the default is "total"
+        """
+        self.field = field
+        self.__lock = threading.Lock()
+        self.__buckets = {}
+        self.__counts = {}
+        self.__errors = {}
+
+    def __call__(self, metrics):
+        """Record the latency of one request.
+
+        :param object metrics: The RequestMetrics of the request
+        """
+        key = f"{metrics.method} {metrics.endpoint}"
+        value = max(getattr(metrics, self.field), self.MINIMUM)
+        bucket = int(math.log(value / self.MINIMUM, self.GROWTH))
+        failed = metrics.error is not None or (metrics.status is not None and metrics.status >= 400)
+
+        with self.__lock:
+            buckets = self.__buckets.setdefault(key, {})
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+            self.__counts[key] = self.__counts.get(key, 0) + 1
+            if failed:
+                self.__errors[key] = self.__errors.get(key, 0) + 1
+
+    def percentiles(self, quantiles=(50, 95, 99)):
+        """Return the latency percentiles of every endpoint.
+
+        :param tuple quantiles: The percentiles to compute; the default is (50, 95, 99)
+        :return dict: For each "METHOD endpoint", a dictionary with the "count" of requests, the number of "errors"
+            and a "p<quantile>" latency in seconds for each quantile
+        """
+        with self.__lock:
+            snapshot = {key: sorted(buckets.items()) for key, buckets in self.__buckets.items()}
+            counts = dict(self.__counts)
+            errors = dict(self.__errors)
+
+        result = {}
+        for key, buckets in sorted(snapshot.items()):
+            stats = {"count": counts[key], "errors": errors.get(key, 0)}
+            for quantile in quantiles:
+                stats[f"p{quantile:g}"] = self._quantile(buckets, counts[key], quantile)
+            result[key] = stats
+
+        return result
+
+    def _quantile(self, buckets, count, quantile):
+        """Return the upper bound of the bucket holding a quantile."""
+        rank = max(math.ceil(count * quantile / 100.0), 1)
+        seen = 0
+        found = buckets[-1][0]
+        for bucket, bucket_count in buckets:
+            seen += bucket_count
+            if seen >= rank:
+                found = bucket
+                break
+
+        return self.MINIMUM * self.GROWTH ** (found + 1)
+
+    def dump(self, quantiles=(50, 95, 99)):
+        """Return the percentiles of every endpoint as printable lines.
+
+        :param tuple quantiles: The percentiles to compute; the default is (50, 95, 99)
+        :return str: One line per endpoint with its count, errors and percentiles in milliseconds
+        """
+        lines = []
+        for key, stats in self.percentiles(quantiles).items():
+            values = " ".join(f"p{quantile:g}={stats[f'p{quantile:g}'] * 1000:.1f}ms" for quantile in quantiles)
+            lines.append(f"{key} count={stats['count']} errors={stats['errors']} {values}")
+
+        return "\n".join(lines)
+
+    def reset(self):
+        """Forget all the latencies recorded."""
+        with self.__lock:
+            self.__buckets = {}
+            self.__counts = {}
+            self.__errors = {}
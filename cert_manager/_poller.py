@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._poller.IssuancePoller class."""
+
+import heapq
+import itertools
+import logging
+import random
+import time
+
+from ._helpers import Pending, run_concurrently
+from ._ratelimit import TokenBucket
+
+LOGGER = logging.getLogger(__name__)
+
+
+class IssuancePoller:  # pylint: disable=too-many-instance-attributes
+    """Poll many pending certificates until they are issued.
+
+    Every certificate has its own schedule: each time it is still pending, the delay before it is collected again is
+    multiplied by *backoff* (with a little jitter so certificates enrolled together spread out), up to *max_delay*.
+    Only the certificates which are due are collected, a few at a time, and the total request rate can be capped.
+    """
+
+    def __init__(self, collect, **kwargs):
+        """Initialize the class.
+
+        :param callable collect: A function taking a certificate ID which returns the certificate, or raises Pending
+            if it is not issued yet (i.e. a bound SSL.collect with the format already set)
+        :param float initial_delay: The delay, in seconds, before a certificate is collected again the first time it
+            is found pending; the default is 5
+        :param float max_delay: The maximum delay, in seconds, between two collections of the same certificate; the
+            default is 300
+        :param float backoff: The factor applied to the delay every time a certificate is found pending; the default
+            is 2
+        :param float max_rate: The maximum number of collect requests per second for all certificates; the default is
+            None, which sets no limit
+        :param float timeout: The maximum time, in seconds, to wait for all certificates; the default is None, which
+            waits forever
+        :param int max_workers: The maximum number of collect requests in flight; the default is 4
+        """
+        self.__collect = collect
+        self.__initial_delay = kwargs.get("initial_delay", 5)
+        self.__max_delay = kwargs.get("max_delay", 300)
+        self.__backoff = kwargs.get("backoff", 2)
+        self.__timeout = kwargs.get("timeout")
+        self.__max_workers = kwargs.get("max_workers", 4)
+
+        max_rate = kwargs.get("max_rate")
+        self.__bucket = TokenBucket(max_rate, 1) if max_rate else None
+
+        self.__schedule = []  # A heap of (due time, sequence number, cert ID)
+        self.__delays = {}
+        self.__counter = itertools.count()
+
+    def __len__(self):
+        """Return the number of certificates still pending."""
+        return len(self.__schedule)
+
+    def add(self, cert_id, delay=0):
+        """Start tracking a pending certificate.
+
+        :param cert_id: The certificate ID
+        :param float delay: The number of seconds to wait before collecting it the first time; the default is 0
+        """
+        if cert_id in self.__delays:
+            return
+        self.__delays[cert_id] = self.__initial_delay
+        heapq.heappush(self.__schedule, (time.monotonic() + delay, next(self.__counter), cert_id))
+
+    def _collect(self, cert_id):
+        """Collect one certificate, waiting for the rate cap first."""
+        if self.__bucket is not None:
+            delay = self.__bucket.reserve()
+            if delay > 0:
+                time.sleep(delay)
+
+        return self.__collect(cert_id)
+
+    def _reschedule(self, cert_id):
+        """Schedule the next collection of a certificate still pending, increasing its delay."""
+        delay = self.__delays[cert_id]
+        self.__delays[cert_id] = min(delay * self.__backoff, self.__max_delay)
+
+        due = time.monotonic() + delay * random.uniform(0.9, 1.1)
+        heapq.heappush(self.__schedule, (due, next(self.__counter), cert_id))
+        LOGGER.debug("Certificate %s still pending, collecting again in %.1fs", cert_id, delay)
+
+    def poll(self):
+        """Collect the certificates until all of them are issued, revoked or the timeout is reached.
+
+        :return iter: Yield (cert_id, result) tuples as each certificate leaves the pending state, where result is
+            the certificate, or the exception raised for it (i.e. Revoked).  Certificates still pending when the
+            timeout is reached are yielded with a Pending exception.
+        """
+        deadline = time.monotonic() + self.__timeout if self.__timeout is not None else None
+
+        while self.__schedule:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                while self.__schedule:
+                    _, _, cert_id = heapq.heappop(self.__schedule)
+                    del self.__delays[cert_id]
+                    yield cert_id, Pending(f"certificate {cert_id} still in 'pending' state after {self.__timeout}s")
+                return
+
+            due = []
+            while self.__schedule and self.__schedule[0][0] <= now:
+                due.append(heapq.heappop(self.__schedule)[2])
+
+            if not due:
+                wait = self.__schedule[0][0] - now
+                if deadline is not None:
+                    wait = min(wait, deadline - now)
+                time.sleep(wait)
+                continue
+
+            for cert_id, result in run_concurrently(self._collect, due, max_workers=self.__max_workers):
+                if isinstance(result, Pending):
+                    self._reschedule(cert_id)
+                    continue
+                del self.__delays[cert_id]
+                yield cert_id, result
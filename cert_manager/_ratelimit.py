@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._ratelimit.RateLimiter class used by cert_manager.client.Client."""
+
+import asyncio
+import logging
+import threading
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+
+class TokenBucket:  # pylint: disable=too-many-instance-attributes
+    """Hand out tokens at a steady rate, allowing short bursts.
+
+    Tokens are reserved rather than waited for under the lock: a caller takes a token even if the bucket is empty
+    (driving it negative) and is told how long to wait for its turn.  This keeps the lock hold time tiny and serves
+    callers in the order they arrived, from threads and coroutines alike.
+    """
+
+    def __init__(self, rate, burst=None):
+        """Initialize the class.
+
+        :param float rate: The number of tokens added per second
+        :param int burst: The maximum number of tokens which can be taken at once; the default is *rate* rounded up
+            to at least 1
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+
+        self.rate = float(rate)
+        self.burst = burst if burst is not None else max(int(rate + 0.999), 1)
+        self.__tokens = float(self.burst)
+        self.__last = time.monotonic()
+        self.__lock = threading.Lock()
+
+        self.acquired = 0
+        self.waited = 0
+        self.wait_time = 0.0
+
+    def reserve(self):
+        """Take a token and return the number of seconds to wait before using it.
+
+        :return float: The delay in seconds; 0 if a token was available
+        """
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(self.__tokens + (now - self.__last) * self.rate, float(self.burst))
+            self.__last = now
+            self.__tokens -= 1
+
+            delay = 0.0
+            if self.__tokens < 0:
+                delay = -self.__tokens / self.rate
+                self.waited += 1
+                self.wait_time += delay
+            self.acquired += 1
+
+        return delay
+
+    def stats(self):
+        """Return the counters of this bucket as a dictionary."""
+        return {
+            "rate": self.rate, "burst": self.burst, "acquired": self.acquired, "waited": self.waited,
+            "wait_time": self.wait_time,
+        }
+
+
+class RateLimiter:
+    """Limit the rate of requests sent to the Sectigo Cert Manager API.
+
+    A global bucket limits all requests, and buckets for endpoint prefixes (such as "/ssl" or "/dcv") can further
+    limit the requests sent to those endpoints.  One RateLimiter can be shared by several Client objects.
+    """
+
+    def __init__(self, rate=None, burst=None, prefixes=None):
+        """Initialize the class.
+
+        :param float rate: The number of requests per second allowed for all endpoints; the default is None, which
+            sets no global limit
+        :param int burst: The number of requests which can be sent at once before *rate* applies
+        :param dict prefixes: A dictionary where key is the path prefix of an endpoint (i.e. "/ssl") and value is
+            either a rate or a (rate, burst) tuple for the requests sent to that endpoint
+        """
+        self.__global = TokenBucket(rate, burst) if rate else None
+        self.__prefixes = {}
+        for prefix, limit in (prefixes or {}).items():
+            if not isinstance(limit, (list, tuple)):
+                limit = (limit, None)
+            self.__prefixes["/" + prefix.strip("/")] = TokenBucket(*limit)
+
+    def _buckets(self, path):
+        """Return the buckets which apply to the given path."""
+        buckets = [self.__global] if self.__global else []
+
+        path = "/" + path.lstrip("/")
+        for prefix in sorted(self.__prefixes, key=len, reverse=True):
+            if path == prefix or path.startswith(prefix + "/"):
+                buckets.append(self.__prefixes[prefix])
+                break
+
+        return buckets
+
+    def reserve(self, path=""):
+        """Take a token from every bucket applying to the path and return the number of seconds to wait.
+
+        :param str path: The path of the request relative to the API base URL (i.e. "/ssl/v1/types")
+        :return float: The delay in seconds
+        """
+        return max((bucket.reserve() for bucket in self._buckets(path)), default=0.0)
+
+    def acquire(self, path=""):
+        """Block the current thread until a request to the path may be sent.
+
+        :param str path: The path of the request relative to the API base URL (i.e. "/ssl/v1/types")
+        :return float: The number of seconds waited
+        """
+        delay = self.reserve(path)
+        if delay > 0:
+            LOGGER.debug("Rate limit reached for %s, waiting %.3fs", path, delay)
+            time.sleep(delay)
+
+        return delay
+
+    async def acquire_async(self, path=""):
+        """Wait, without blocking the event loop, until a request to the path may be sent.
+
+        :param str path: The path of the request relative to the API base URL (i.e. "/ssl/v1/types")
+        :return float: The number of seconds waited
+        """
+        delay = self.reserve(path)
+        if delay > 0:
+            LOGGER.debug("Rate limit reached for %s, waiting %.3fs", path, delay)
+            await asyncio.sleep(delay)
+
+        return delay
+
+    def stats(self):
+        """Return the counters of all buckets.
+
+        :return dict: The global bucket counters under "global" (if any) and the prefix bucket counters under
+            "prefixes", each with the number of requests acquired, the number which had to wait and the total time
+            spent waiting in seconds
+        """
+        stats = {"prefixes": {prefix: bucket.stats() for prefix, bucket in self.__prefixes.items()}}
+        if self.__global:
+            stats["global"] = self.__global.stats()
+
+        return stats
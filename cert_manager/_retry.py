@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._retry.RetryPolicy class used by cert_manager.client.Client."""
+
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RetryPolicy:  # pylint: disable=too-many-instance-attributes
+    """Decide whether and when a failed request to the Sectigo Cert Manager API should be sent again.
+
+    Only idempotent methods are retried by default; POST requests are only retried when the caller explicitly asks
+    for it.  The delay between attempts grows exponentially with full jitter, unless the server sent a Retry-After
+    header, which is honoured instead: in full even beyond *max_backoff*, as retrying earlier would only be refused
+    again, or not at all if it does not fit in *max_elapsed*.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "PUT", "DELETE"])
+    RETRY_STATUSES = frozenset([429, 502, 503, 504])
+
+    def __init__(self, **kwargs):
+        """Initialize the class.
+
+        :param int max_attempts: The maximum number of times a request is sent, including the first; the default is 5
+        :param float backoff_factor: The delay, in seconds, before the first retry; it doubles with every further
+            attempt.  The default is 0.5
+        :param float max_backoff: The maximum delay, in seconds, between two attempts, unless the server asked for
+            a longer one with a Retry-After header; the default is 60
+        :param float max_elapsed: The maximum time, in seconds, spent on one request including all retries and delays;
+            the default is 300
+        :param bool jitter: Randomize each delay between 0 and the computed delay if True; the default is True
+        :param bool respect_retry_after: Use the delay from a Retry-After header if present; the default is True
+        :param list statuses: The HTTP status codes which are retried; the default is *RETRY_STATUSES*
+        :param list methods: The HTTP methods which are retried without being asked; the default is
+            *IDEMPOTENT_METHODS*
+        """
+        self.max_attempts = kwargs.get("max_attempts", 5)
+        self.backoff_factor = kwargs.get("backoff_factor", 0.5)
+        self.max_backoff = kwargs.get("max_backoff", 60)
+        self.max_elapsed = kwargs.get("max_elapsed", 300)
+        self.jitter = kwargs.get("jitter", True)
+        self.respect_retry_after = kwargs.get("respect_retry_after", True)
+        self.statuses = frozenset(kwargs.get("statuses", self.RETRY_STATUSES))
+        self.methods = frozenset(method.upper() for method in kwargs.get("methods", self.IDEMPOTENT_METHODS))
+
+    def retries_method(self, method):
+        """Return True if requests with the given HTTP method are retried without being asked.
+
+        :param str method: The HTTP method
+        :return bool: True if the method is retried by default
+        """
+        return method.upper() in self.methods
+
+    def retries_status(self, status_code):
+        """Return True if a response with the given HTTP status code should be retried.
+
+        :param int status_code: The HTTP status code of the response
+        :return bool: True if the status is transient
+        """
+        return status_code in self.statuses
+
+    def backoff(self, attempt, response=None):
+        """Return the number of seconds to wait before the next attempt.
+
+        :param int attempt: The number of the attempt which just failed, starting at 1
+        :param obj response: The requests.Response object received, if any
+        :return float: The delay in seconds
+        """
+        if self.respect_retry_after and response is not None:
+            retry_after = self.parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                return retry_after
+
+        delay = min(self.backoff_factor * (2 ** (attempt - 1)), self.max_backoff)
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        return delay
+
+    def next_delay(self, attempt, started, response=None):
+        """Return the delay before the next attempt, or None if the request should not be sent again.
+
+        :param int attempt: The number of the attempt which just failed, starting at 1
+        :param float started: The time.monotonic() value when the first attempt was sent
+        :param obj response: The requests.Response object received, if any
+        :return float: The delay in seconds, or None if the attempts or the time budget are exhausted
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        delay = self.backoff(attempt, response)
+        if (time.monotonic() - started) + delay > self.max_elapsed:
+            LOGGER.debug("Not retrying: the %ss budget would be exceeded", self.max_elapsed)
+            return None
+
+        return delay
+
+    @staticmethod
+    def parse_retry_after(value):
+        """Parse the value of a Retry-After header.
+
+        :param str value: The header value, either a number of seconds or an HTTP date
+        :return float: The number of seconds to wait, or None if the value is missing or invalid
+        """
+        if not value:
+            return None
+
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+
+        return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
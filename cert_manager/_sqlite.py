@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._sqlite.SQLiteStore class used by the SQLite backed stores."""
+
+import logging
+import sqlite3
+import threading
+
+LOGGER = logging.getLogger(__name__)
+
+
+class SQLiteStore:
+    """Act as a superclass for the classes keeping their state in an SQLite database.
+
+    The connection is shared by every thread, so subclasses hold *_lock* around each use of *_conn*.  Subclasses set
+    *_SCHEMA* to the SQL script creating their tables, which is run when the database is opened.
+    """
+
+    _SCHEMA = ""
+
+    def __init__(self, path):
+        """Initialize the class.
+
+        :param str path: The path of the SQLite database file; ":memory:" keeps it in memory
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.executescript(self._SCHEMA)
+
+    def close(self):
+        """Close the database."""
+        self._conn.close()
+
+    def __enter__(self):
+        """Return the object itself in a with statement."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the database at the end of a with statement."""
+        self.close()
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""Define functions to decode large JSON responses incrementally."""
+
+import codecs
+import json
+import logging
+
+LOGGER = logging.getLogger(__name__)
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789+-.eE"
+
+# Parsed text is only dropped from the buffer once this many characters were consumed, to avoid copying it often
+_COMPACT_SIZE = 65536
+
+
+class _Buffer:
+    """Hold the decoded text not parsed yet, reading more chunks on demand."""
+
+    def __init__(self, chunks):
+        """Initialize the class.
+
+        :param iter chunks: An iterable of str chunks
+        """
+        self.__chunks = iter(chunks)
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Read the next non-empty chunk, returning False at the end of the input."""
+        if self.pos >= _COMPACT_SIZE:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+
+        for chunk in self.__chunks:
+            if chunk:
+                self.text += chunk
+                return True
+
+        self.eof = True
+        return False
+
+    def peek(self):
+        """Skip whitespace and return the next character, or an empty string at the end of the input."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars):
+        """Consume the next character, raising ValueError if it is not one of *chars*."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Invalid JSON: expected one of {chars!r} at offset {self.pos}, found {char!r}")
+        self.pos += 1
+
+        return char
+
+    def decode(self, decoder):
+        """Decode the next complete JSON value, reading more chunks until it is complete."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+
+            # A number ending with the buffer, or where a chunk was cut, may continue in the next chunk
+            if end == len(self.text) or self.text[end] in _NUMBER_CHARS:
+                if not self.eof and self.fill():
+                    continue
+
+            self.pos = end
+            return value
+
+
+def iter_json_items(chunks, key=None):
+    """Yield the items of a JSON array one by one as the text arrives.
+
+    Only one item at a time is decoded and kept in memory, so very large responses can be processed.
+
+    :param iter chunks: An iterable of str chunks making up the JSON document
+    :param str key: The name of the member holding the array if the document is an object (i.e. "reports"); the
+        default is None, which expects the document itself to be an array
+    :return iter: Yield the decoded items of the array
+    """
+    buf = _Buffer(chunks)
+    decoder = json.JSONDecoder()
+
+    if key is not None and buf.peek() == "{":
+        buf.expect("{")
+        while True:
+            if buf.peek() == "}":
+                # The member was not found
+                return
+            name = buf.decode(decoder)
+            buf.expect(":")
+            if name == key:
+                break
+            # Skip the value of any other member
+            buf.decode(decoder)
+            if buf.expect(",}") == "}":
+                return
+
+    if buf.peek() == "n":
+        # A null value holds no items
+        buf.decode(decoder)
+        return
+
+    buf.expect("[")
+    if buf.peek() == "]":
+        return
+
+    while True:
+        yield buf.decode(decoder)
+        if buf.expect(",]") == "]":
+            return
+
+
+def iter_response_items(response, key=None, chunk_size=65536):
+    """Yield the items of a JSON array from a streamed requests.Response, closing it when done.
+
+    :param obj response: A requests.Response object, received with stream=True
+    :param str key: The name of the member holding the array if the body is an object (i.e. "reports"); the default
+        is None, which expects the body itself to be an array
+    :param int chunk_size: The number of bytes read from the connection at a time; the default is 65536
+    :return iter: Yield the decoded items of the array
+    """
+    text_decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+
+    def chunks():
+        """Decode the body into text chunks."""
+        for data in response.iter_content(chunk_size=chunk_size):
+            yield text_decoder.decode(data)
+        yield text_decoder.decode(b"", final=True)
+
+    try:
+        yield from iter_json_items(chunks(), key=key)
+    finally:
+        response.close()
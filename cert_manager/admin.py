@@ -6,6 +6,7 @@ import logging
 from requests.exceptions import HTTPError
 
 from ._endpoint import Endpoint
+from ._lazy import LazyLoader
 
 LOGGER = logging.getLogger(__name__)
 
@@ -17,16 +18,26 @@ class AdminCreationResponseError(Exception):
 class Admin(Endpoint):
     """Query the Sectigo Cert Manager REST API for Admin data."""
 
-    def __init__(self, client, api_version="v1"):
+    def __init__(self, client, api_version="v1", **kwargs):
         """Initialize the class.
 
+        Note: The admins are fetched the first time they are needed, not on object instantiation
+
         :param object client: An instantiated cert_manager.Client object
         :param string api_version: The API version to use; the default is "v1"
+        :param str snapshot: The path of a JSON file where the admins are persisted between runs; the default is
+            None, which disables the snapshot
+        :param float snapshot_max_age: The maximum age, in seconds, of a snapshot which can be used; the default is
+            86400
+        :param float refresh: The interval, in seconds, between background refreshes of the admins; the default is
+            None, which disables the background refresh
         """
         super().__init__(client=client, endpoint="/admin", api_version=api_version)
 
-        self.__admins = None
-        self.all()
+        self.__admins = LazyLoader(
+            self._fetch, key=f"{client.login_uri}:{self._api_url}", snapshot=kwargs.get("snapshot"),
+            snapshot_max_age=kwargs.get("snapshot_max_age", 86400), refresh=kwargs.get("refresh"),
+        )
 
     def all(self, force=False):
         """Return a list of admins from Sectigo.
@@ -35,14 +46,17 @@ class Admin(Endpoint):
 
         :return list: A list of dictionaries representing the admins
         """
-        if (self.__admins) and (not force):
-            return self.__admins
+        return self.__admins.get(force=force)
 
+    def _fetch(self):
+        """Retrieve the admins from the API."""
         result = self._client.get(self._api_url)
 
-        self.__admins = result.json()
+        return result.json()
 
-        return self.__admins
+    def close(self):
+        """Stop the background refresh of the admins, if it is running."""
+        self.__admins.stop()
 
     def create(self, login, email, forename, surname,  # pylint: disable=too-many-arguments
                password, credentials, **kwargs):
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager.async_client.AsyncClient class."""
+
+import asyncio
+import logging
+import types
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .client import Client
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncClient:
+    """Drive the Sectigo Cert Manager APIs from an asyncio event loop.
+
+    This takes the same arguments as cert_manager.Client and builds one internally, so the default headers, the
+    authentication setup and the error-reason decoding of the API responses are identical.  Requests are run on a
+    bounded pool of worker threads which share the single requests.Session of the internal Client, so many
+    coroutines can have requests in flight at once while re-using a small number of connections.
+    """
+
+    def __init__(self, **kwargs):
+        """Initialize the class.
+
+        All parameters accepted by cert_manager.Client are accepted here as well.
+
+        :param int max_workers: The maximum number of requests in flight at the same time; the default is 10
+            Unless *pool_maxsize* is passed, the connection pool is sized to match.
+        """
+        self.__max_workers = kwargs.pop("max_workers", 10)
+        kwargs.setdefault("pool_maxsize", self.__max_workers)
+        self.__client = Client(**kwargs)
+        self.__executor = ThreadPoolExecutor(max_workers=self.__max_workers, thread_name_prefix="cert_manager")
+
+    async def __aenter__(self):
+        """Return the object itself when used as an asynchronous context manager."""
+        return self
+
+    async def __aexit__(self, *args):
+        """Shut down the worker threads when leaving the asynchronous context manager."""
+        self.close()
+
+    @property
+    def client(self):
+        """Return the internal cert_manager.Client object.
+
+        This should be passed to the endpoint classes (SSL, SMIME, Domain, etc.) whose methods are then awaited through
+        *call* or *endpoint*.
+        """
+        return self.__client
+
+    @property
+    def max_workers(self):
+        """Return the internal __max_workers value."""
+        return self.__max_workers
+
+    @property
+    def user_agent(self):
+        """Return the user-agent string of the internal Client."""
+        return self.__client.user_agent
+
+    @property
+    def base_url(self):
+        """Return the base_url value of the internal Client."""
+        return self.__client.base_url
+
+    @property
+    def headers(self):
+        """Return the headers value of the internal Client."""
+        return self.__client.headers
+
+    @property
+    def session(self):
+        """Return the requests.Session object of the internal Client."""
+        return self.__client.session
+
+    def add_headers(self, headers=None):
+        """Add the provided headers to the internal Client.
+
+        :param dict headers: A dictionary where key is the header with its value being the setting for that header.
+        """
+        self.__client.add_headers(headers)
+
+    def remove_headers(self, headers=None):
+        """Remove the requested header keys from the internal Client.
+
+        :param list headers: A list of header keys to delete
+        """
+        self.__client.remove_headers(headers)
+
+    def close(self):
+        """Shut down the worker threads and close the internal requests.Session."""
+        self.__executor.shutdown(wait=True)
+        self.__client.session.close()
+
+    async def call(self, func, *args, **kwargs):
+        """Run a blocking function on the worker threads and return its result.
+
+        This is mostly used with the methods of endpoint objects built with *self.client*.  If the function returns a
+        generator (as the paginated *list* and *find* methods do), all pages are fetched on the worker thread and a
+        list is returned, so the event loop is never blocked by network I/O.
+
+        :param callable func: The function to run
+        :param list args: Positional parameters to pass to the function
+        :param dict kwargs: Keyword parameters to pass to the function
+        :return obj: The return value of the function
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, partial(_run, func, *args, **kwargs))
+
+    def endpoint(self, endpoint):
+        """Wrap an endpoint object so all of its methods can be awaited.
+
+        :param object endpoint: An endpoint object (SSL, SMIME, Domain, etc.) built with *self.client*
+        :return obj: A cert_manager.async_client.AsyncEndpoint object
+        """
+        return AsyncEndpoint(self, endpoint)
+
+    async def head(self, url, headers=None, params=None, timeout=None):
+        """Submit a HEAD request to the provided URL.
+
+        :param str url: A URL to query
+        :param dict headers: A dictionary with any extra headers to add to the request
+        :param dict params: A dictionary with any parameters to add to the request URL
+        :return obj: A requests.Response object received as a response
+        """
+        return await self.call(self.__client.head, url, headers=headers, params=params, timeout=timeout)
+
+    async def get(self, url, headers=None, params=None, timeout=None):
+        """Submit a GET request to the provided URL.
+
+        :param str url: A URL to query
+        :param dict headers: A dictionary with any extra headers to add to the request
+        :param dict params: A dictionary with any parameters to add to the request URL
+        :return obj: A requests.Response object received as a response
+        """
+        return await self.call(self.__client.get, url, headers=headers, params=params, timeout=timeout)
+
+    async def post(self, url, headers=None, data=None, timeout=None,  # pylint: disable=too-many-arguments
+                   *, retry=False):
+        """Submit a POST request to the provided URL and data.
+
+        :param str url: A URL to query
+        :param dict headers: A dictionary with any extra headers to add to the request
+        :param dict data: A dictionary with the data to use for the body of the POST
+        :param bool retry: Retry transient failures using the retry policy if True; the default is False
+        :return obj: A requests.Response object received as a response
+        """
+        return await self.call(self.__client.post, url, headers=headers, data=data, timeout=timeout, retry=retry)
+
+    async def put(self, url, headers=None, data=None, timeout=None):
+        """Submit a PUT request to the provided URL and data.
+
+        :param str url: A URL to query
+        :param dict headers: A dictionary with any extra headers to add to the request
+        :param dict data: A dictionary with the data to use for the body of the PUT
+        :return obj: A requests.Response object received as a response
+        """
+        return await self.call(self.__client.put, url, headers=headers, data=data, timeout=timeout)
+
+    async def delete(self, url, headers=None, data=None, timeout=None):
+        """Submit a DELETE request to the provided URL.
+
+        :param str url: A URL to query
+        :param dict headers: A dictionary with any extra headers to add to the request
+        :param dict data: A dictionary with the data to use for the body of the DELETE
+        :return obj: A requests.Response object received as a response
+        """
+        return await self.call(self.__client.delete, url, headers=headers, data=data, timeout=timeout)
+
+
+class AsyncEndpoint:  # pylint: disable=too-few-public-methods
+    """Expose the methods of an endpoint object as coroutines.
+
+    Attribute access is passed through to the wrapped endpoint object; callables are returned as coroutine functions
+    which run on the worker threads of the AsyncClient.
+    """
+
+    def __init__(self, async_client, endpoint):
+        """Initialize the class.
+
+        :param object async_client: An instantiated cert_manager.AsyncClient object
+        :param object endpoint: An endpoint object built with *async_client.client*
+        """
+        self.__async_client = async_client
+        self.__endpoint = endpoint
+
+    def __getattr__(self, name):
+        """Return the attribute of the wrapped endpoint, wrapping methods in a coroutine function."""
+        attr = getattr(self.__endpoint, name)
+        if not callable(attr):
+            return attr
+
+        async def method(*args, **kwargs):
+            """Await the wrapped endpoint method."""
+            return await self.__async_client.call(attr, *args, **kwargs)
+
+        method.__name__ = name
+        method.__doc__ = attr.__doc__
+
+        return method
+
+
+def _run(func, *args, **kwargs):
+    """Call the function, exhausting it first if it returns a generator."""
+    retval = func(*args, **kwargs)
+    if isinstance(retval, types.GeneratorType):
+        retval = list(retval)
+
+    return retval
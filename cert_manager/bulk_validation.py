@@ -1,77 +1,320 @@
-from validation import Validation
-from DNS import dnslookup
+# -*- coding: utf-8 -*-
+"""Define the cert_manager.bulk_validation.BulkValidationHelper class."""
+
+import json
+import logging
+import threading
+import time
+
+from ._helpers import run_concurrently
+from ._sqlite import SQLiteStore
+from .resolver import ConcurrentResolver
+from .validation import Validation
+
+LOGGER = logging.getLogger(__name__)
+
+
+class DCVResult:  # pylint: disable=too-many-instance-attributes
+    """Hold the state of the domain control validation (DCV) of one domain."""
+
+    STARTED = "started"
+    START_FAILED = "start_failed"
+    NOT_VISIBLE = "not_visible"
+    SUBMITTED = "submitted"
+    SUBMIT_FAILED = "submit_failed"
+
+    def __init__(self, domain, method):
+        """Initialize the class.
+
+        :param str domain: The domain being validated
+        :param str method: The DCV method
+        """
+        self.domain = domain
+        self.method = method
+        self.status = None
+        # The challenge returned when DCV was started (i.e. "host" and "point" for CNAME validation)
+        self.challenge = {}
+        # The result of the submission
+        self.response = None
+        # The exception raised by the last step, or its message if the result was loaded from a DCVStateStore
+        self.error = None
+        # The times (as returned by time.time) DCV was started and submitted
+        self.started_at = None
+        self.submitted_at = None
+
+    @property
+    def ok(self):  # pylint: disable=invalid-name
+        """Return True if the last step done for the domain succeeded."""
+        return self.status in (self.STARTED, self.SUBMITTED)
+
+    @property
+    def pending(self):
+        """Return True if DCV was started for the domain but not submitted yet."""
+        return self.status in (self.STARTED, self.NOT_VISIBLE, self.SUBMIT_FAILED)
+
+    def as_dict(self):
+        """Return the challenge with the "domain" and "method", as recorded by BulkValidationHelper.start_all."""
+        data = dict(self.challenge)
+        data.update({"domain": self.domain, "method": self.method})
+
+        return data
+
+    def __repr__(self):
+        """Return a readable representation of the result."""
+        return f"DCVResult(domain={self.domain!r}, method={self.method!r}, status={self.status!r})"
+
+
+class DCVStateStore(SQLiteStore):
+    """Keep the DCV state of every domain in an SQLite database, so a new process can resume where the last stopped.
+
+    Each DCVResult is written as soon as a step of its domain finishes, with its challenge and timestamps.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS dcv (
+            domain TEXT PRIMARY KEY,
+            method TEXT NOT NULL,
+            status TEXT,
+            challenge TEXT NOT NULL,
+            error TEXT,
+            started REAL,
+            submitted REAL,
+            updated REAL NOT NULL
+        );
+    """
+
+
+    def save(self, result):
+        """Store the state of one domain, replacing the one stored before.
+
+        :param object result: The DCVResult of the domain
+        """
+        error = str(result.error) if result.error is not None else None
+        values = (result.method, result.status, json.dumps(result.challenge), error, result.started_at,
+                  result.submitted_at, time.time(), result.domain)
+        with self._lock, self._conn:
+            # Update in place rather than replace, so the domains keep the order they were first stored in
+            updated = self._conn.execute(
+                "UPDATE dcv SET method = ?, status = ?, challenge = ?, error = ?, started = ?, submitted = ?, "
+                "updated = ? WHERE domain = ?",
+                values,
+            ).rowcount
+            if not updated:
+                self._conn.execute(
+                    "INSERT INTO dcv (method, status, challenge, error, started, submitted, updated, domain) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    values,
+                )
+
+    def remove(self, domain):
+        """Forget the state of one domain.
+
+        :param str domain: The domain
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM dcv WHERE domain = ?", (domain,))
+
+    def load(self):
+        """Return the stored state of every domain, in the order the domains were first stored.
+
+        :return list: A list of DCVResult objects
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT domain, method, status, challenge, error, started, submitted FROM dcv ORDER BY rowid"
+            ).fetchall()
+
+        results = []
+        for domain, method, status, challenge, error, started, submitted in rows:
+            result = DCVResult(domain, method)
+            result.status = status
+            result.challenge = json.loads(challenge)
+            result.error = error
+            result.started_at = started
+            result.submitted_at = submitted
+            results.append(result)
+
+        return results
+
+    def pending(self):
+        """Return the state of the domains whose DCV was started but not submitted yet.
+
+        :return list: A list of DCVResult objects
+        """
+        return [result for result in self.load() if result.pending]
+
 
 class BulkValidationHelper:
     """Perform DCV for a number of domains.
-    Currently only CNAME validation is implemented.
+
+    The start and submit phases run on a pool of worker threads; requests still go through the Client, so its rate
+    limit and retry policy are shared by all of them.  Currently only CNAME validation can be submitted.
     """
 
-    def __init__(self, client):
+    def __init__(self, client, max_workers=10, resolver=None, store=None):
+        """Initialize the class.
+
+        :param object client: An instantiated cert_manager.Client object
+        :param int max_workers: The maximum number of domains processed at the same time; the default is 10
+        :param object resolver: The cert_manager.resolver.Resolver used to check the CNAME records; the default is
+            None, which uses a ConcurrentResolver querying the system name servers with pydns
+        :param store: A DCVStateStore, or the path of its database, keeping the DCV state across runs; the default
+            is None, which keeps it in memory only
+        """
         self.dcv = Validation(client)
+        self.max_workers = max_workers
+        self.resolver = resolver if resolver is not None else ConcurrentResolver()
+        self.store = DCVStateStore(store) if isinstance(store, str) else store
         self.__started = None
+        self.__results = {}
+        self.__lock = threading.Lock()
 
-    def start_all(self, only_secondlevel=True, method='cname', **kwargs):
-        """Initiate DCV for all domains with a specific matching some filter.
+        if self.store is not None:
+            # Resume the DCV started by earlier runs
+            self.__results = {result.domain: result for result in self.store.load()}
+            self.__started = self._pending() or None
+            LOGGER.info("Resumed %s started DCV requests", len(self.__started or []))
 
-        If validation was started previously, this method will throw an Exception.
+    @property
+    def results(self):
+        """Return a dictionary of the DCVResult of every domain processed, keyed by domain."""
+        with self.__lock:
+            return dict(self.__results)
 
-        :param bool only_secondlevel: filter out domains containing
-                                      more than 1 dot. To get rid of wildcard domains,
-                                      IPs and sub-domains. This is wrong for '.co.uk' and
-                                      other TLDs.
-        :param str method: DCV method
-        :param dict kwargs: filter for searching. Defaults to  order_status='NOT_INITIATED',
-                            dcv_status='NOT_VALIDATED'.
+    def _result(self, domain, method):
+        """Return the DCVResult of a domain, creating it if needed."""
+        with self.__lock:
+            result = self.__results.get(domain)
+            if result is None or result.method != method:
+                result = self.__results[domain] = DCVResult(domain, method)
 
-        :return list[dict]:  list of dicts with 'domain', and the result returned from `start`
+        return result
 
-        """
+    def _save(self, result):
+        """Persist the state of a domain if there is a store."""
+        if self.store is not None:
+            self.store.save(result)
+
+    def _pending(self):
+        """Return the recorded challenges of the domains whose DCV was started but not submitted yet."""
+        with self.__lock:
+            return [result.as_dict() for result in self.__results.values() if result.pending]
+
+    def start_all(self, only_secondlevel=True, method="cname", **kwargs):
+        """Initiate DCV for all domains matching some filter.
+
+        A domain whose DCV cannot be started does not stop the others; its DCVResult holds the error.  Domains whose
+        DCV was already started and not submitted (i.e. by an earlier run with the same store) are not started again.
 
-        if not(kwargs):
-            kwargs = {'dcv_status':'NOT_VALIDATED', 'order_status':'NOT_INITIATED'}
+        :param bool only_secondlevel: filter out domains containing more than 1 dot, to get rid of wildcard domains,
+            IPs and sub-domains.  This is wrong for '.co.uk' and other TLDs.
+        :param str method: DCV method
+        :param dict kwargs: filter for searching. Defaults to order_status='NOT_INITIATED',
+            dcv_status='NOT_VALIDATED'.
+        :return list[dict]: list of dicts with 'domain', 'method' and the result returned from `start`, for all the
+            domains whose DCV was started and not submitted yet
+        """
+        if not kwargs:
+            kwargs = {"dcv_status": "NOT_VALIDATED", "order_status": "NOT_INITIATED"}
 
         if only_secondlevel:
-            ## FIXME this filters out IPs and "normal subdomains". But
-            ## it's incorrect for .co.uk and others
-            domains = [d['domain'] for d in self.find(**kwargs) if
-                       d['domain'].count('.')==1]
+            # FIXME this filters out IPs and "normal subdomains". But it's incorrect for .co.uk and others
+            domains = [d["domain"] for d in self.dcv.find(**kwargs) if d["domain"].count(".") == 1]
         else:
-            domains = [d['domain'] for d in self.find(**kwargs)]
+            domains = [d["domain"] for d in self.dcv.find(**kwargs)]
 
+        with self.__lock:
+            pending = {domain for domain, result in self.__results.items() if result.pending}
+        domains = [domain for domain in domains if domain not in pending]
+
+        results = [result for _, result in self.start_domains(domains, method)]
+        started = {result.domain for result in results}
+        # The challenges resumed from earlier runs first, then the new ones in the order of the domains
+        self.__started = [dcv for dcv in self._pending() if dcv["domain"] not in started]
+        self.__started.extend(result.as_dict() for result in results if result.pending)
 
-        self.__started = [ self.start(d, method) | {'domain':d, 'method':method} for d in domains ]
         return self.__started
 
+    def start_domains(self, domains, method="cname"):
+        """Initiate DCV for the given domains concurrently.
+
+        :param iter domains: The domains to validate
+        :param str method: DCV method
+        :return iter: Yield (domain, DCVResult) tuples in the order of *domains*
+        """
+        def start(domain):
+            """Start the DCV of one domain."""
+            result = self._result(domain, method)
+            try:
+                result.challenge = self.dcv.start(domain, method)
+                result.status = DCVResult.STARTED
+                result.started_at = time.time()
+                result.error = None
+            except Exception as exc:  # pylint: disable=broad-except
+                result.status = DCVResult.START_FAILED
+                result.error = exc
+                LOGGER.warning("Starting DCV of %s failed: %s", domain, exc)
+            self._save(result)
+
+            return result
+
+        domains = list(domains)
+        # Record every domain first, so the results and the store keep the order of *domains* whatever order the
+        # starts complete in
+        for domain in domains:
+            self._save(self._result(domain, method))
+
+        yield from run_concurrently(start, domains, max_workers=self.max_workers, ordered=True)
+
     def submit_started_cname(self, dcvs):
         """Submit previously initiated DCV via cname. But only if recorded CNAME challenges are visible in DNS
 
-        :param dict dcvs: recorded DCV domains and challenge parameters.
+        The CNAME records are looked up in one batch with *self.resolver*, then the submissions run concurrently.
+
+        :param list dcvs: recorded DCV domains and challenge parameters.
         :return list: list of domains for which DCV was submitted.
         """
+        dcvs = list(dcvs)
+        for dcv in dcvs:
+            if dcv["method"] != "cname":
+                raise ValueError(f"Not a CNAME validation: {dcv['domain']} uses {dcv['method']}")
 
+        # All the records are looked up first, as one batch
+        answers = self.resolver.resolve_many(dcv["host"] for dcv in dcvs)
 
-        submitted = []
-        for dcv in dcvs:
-            assert( dcv['method'] == 'cname')
-            res = None
-            try:
-                res = dnslookup(dcv['host'], 'CNAME')
-                res = res[0]
-                if res[-1] == '.':
-                    res = res[:-1]
-            except:
-                pass
-            ptr = dcv['point']
-            if ptr[-1] == '.':
-                ptr = ptr[:-1]
-            if not(res and res == dcv['point']):
-                continue
+        def submit(dcv):
+            """Submit the DCV of one domain if its CNAME record is visible."""
+            result = self._result(dcv["domain"], "cname")
+            if not result.challenge:
+                result.challenge = {key: value for key, value in dcv.items() if key not in ("domain", "method")}
+            result.error = None
+
+            target = answers.get(dcv["host"])
+            if isinstance(target, Exception):
+                LOGGER.debug("CNAME lookup of %s failed: %s", dcv["host"], target)
+                result.status = DCVResult.NOT_VISIBLE
+                result.error = target
+            elif not target or target.rstrip(".").lower() != dcv["point"].rstrip(".").lower():
+                result.status = DCVResult.NOT_VISIBLE
             else:
                 try:
-                    self.dcv.submit(dcv['domain'],method='cname')
-                except:
-                    continue
-                submitted.append(dcv['domain'])
+                    result.response = self.dcv.submit(dcv["domain"], method="cname")
+                    result.status = DCVResult.SUBMITTED
+                    result.submitted_at = time.time()
+                except Exception as exc:  # pylint: disable=broad-except
+                    result.status = DCVResult.SUBMIT_FAILED
+                    result.error = exc
+                    LOGGER.warning("Submitting DCV of %s failed: %s", dcv["domain"], exc)
+            self._save(result)
+
+            return result
+
+        submitted = []
+        for _, result in run_concurrently(submit, dcvs, max_workers=self.max_workers, ordered=True):
+            if isinstance(result, Exception):
+                raise result
+            if result.status == DCVResult.SUBMITTED:
+                submitted.append(result.domain)
 
         return submitted
 
@@ -80,15 +323,15 @@ class BulkValidationHelper:
 
         :return set: domains for which DCV requests were submitted
         """
-        if not(self.__started):
-            print('No previously started DCV requests found')
-            return
+        if not self.__started:
+            print("No previously started DCV requests found")
+            return None
 
         submitted = set()
         started = self.__started
 
-        submitted.update( self.submit_started_cname([dcv for dcv in started if dcv['method']=='cname']))
-        started = [dcv for dcv in started if not(dcv['domain'] in submitted)]
+        submitted.update(self.submit_started_cname([dcv for dcv in started if dcv["method"] == "cname"]))
+        started = [dcv for dcv in started if dcv["domain"] not in submitted]
 
         # FIXME: implement other DCV methods
         # submitted.update(self.submit_started_email([dcv for dcv in started if dcv['method']=='email']))
@@ -108,5 +351,5 @@ class BulkValidationHelper:
         # FIXME: what should be printed for DCV methods email, http(s)?
 
         for dcv in self.__started:
-            if dcv['method'] == 'cname':
+            if dcv["method"] == "cname":
                 print(f"{dcv['host']} IN CNAME {dcv['point']}")
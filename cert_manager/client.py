@@ -4,11 +4,15 @@
 import logging
 import re
 import sys
+import time
+from urllib.parse import urlsplit
 
 import requests
 
 from . import __version__
+from ._adapter import ConnectionStats, PoolAdapter
 from ._helpers import traffic_log
+from ._metrics import RequestMetrics, endpoint_template, take_connection_times
 
 LOGGER = logging.getLogger(__name__)
 
@@ -54,6 +58,19 @@ class Client:  # pylint: disable=too-many-instance-attributes
         :param bool cert_auth: Use client certificate authentication if True; the default is False
         :param string user_crt_file: The path to the certificate file if using client cert auth
         :param string user_key_file: The path to the key file if using client cert auth
+        :param int pool_connections: The number of host connection pools to cache; the default is 10
+        :param int pool_maxsize: The maximum number of connections kept open per host; the default is 10
+            This should be at least the number of threads sharing this object.
+        :param bool pool_block: Wait for a free connection instead of opening a throw-away one when the pool is
+            exhausted if True; the default is False
+        :param bool keep_alive: Keep connections open between requests if True; the default is True
+        :param bool tcp_keepalive: Turn on TCP keep-alive probes on pooled connections if True; the default is False
+        :param object retry: A cert_manager.RetryPolicy object used to retry transient failures; the default is None,
+            which never retries
+        :param object rate_limit: A cert_manager.RateLimiter object which every request waits on; it can be shared by
+            several Client objects.  The default is None, which sets no limit
+        :param list metrics: Functions called with a cert_manager.RequestMetrics object after every request (i.e. a
+            cert_manager.LatencyHistogram object); the default is None, which measures nothing
         """
         # These options are required, so raise a KeyError if they are not provided.
         self.__login_uri = kwargs["login_uri"]
@@ -64,8 +81,24 @@ class Client:  # pylint: disable=too-many-instance-attributes
             "base_url", "https://cert-manager.com/api"
         )
         self.__cert_auth = kwargs.get("cert_auth", False)
+        self.__retry = kwargs.get("retry")
+        self.__rate_limit = kwargs.get("rate_limit")
+        # A tuple, replaced rather than changed, so requests in flight can iterate over it without a lock
+        self.__metrics = tuple(kwargs.get("metrics") or ())
         self.__session = requests.Session()
 
+        # Replace the default adapters so the connection pool can be sized and connection reuse can be counted
+        self.__connection_stats = ConnectionStats()
+        adapter = PoolAdapter(
+            stats=self.__connection_stats,
+            tcp_keepalive=kwargs.get("tcp_keepalive", False),
+            pool_connections=kwargs.get("pool_connections", 10),
+            pool_maxsize=kwargs.get("pool_maxsize", 10),
+            pool_block=kwargs.get("pool_block", False),
+        )
+        self.__session.mount("https://", adapter)
+        self.__session.mount("http://", adapter)
+
         self.__user_crt_file = kwargs.get("user_crt_file")
         self.__user_key_file = kwargs.get("user_key_file")
 
@@ -103,6 +136,10 @@ class Client:  # pylint: disable=too-many-instance-attributes
             self.__password = kwargs["password"]
             self.__headers["password"] = self.__password
 
+        # Ask the server to close the connection after every request if keep-alive is turned off
+        if not kwargs.get("keep_alive", True):
+            self.__headers["Connection"] = "close"
+
         self.__session.headers.update(self.__headers)
 
     @property
@@ -121,6 +158,11 @@ class Client:  # pylint: disable=too-many-instance-attributes
         """Return the internal __base_url value."""
         return self.__base_url
 
+    @property
+    def login_uri(self):
+        """Return the internal __login_uri value."""
+        return self.__login_uri
+
     @property
     def headers(self):
         """Return the internal __headers value."""
@@ -131,6 +173,44 @@ class Client:  # pylint: disable=too-many-instance-attributes
         """Return the setup internal __session requests.Session object."""
         return self.__session
 
+    @property
+    def connection_stats(self):
+        """Return the internal __connection_stats ConnectionStats object.
+
+        This counts the requests sent, the connections opened (each HTTPS one costing a TLS handshake) and the
+        requests which reused an already open connection.
+        """
+        return self.__connection_stats
+
+    @property
+    def rate_limit(self):
+        """Return the internal __rate_limit RateLimiter object, or None if requests are not rate limited."""
+        return self.__rate_limit
+
+    @property
+    def retry(self):
+        """Return the internal __retry RetryPolicy object, or None if requests are never retried."""
+        return self.__retry
+
+    @property
+    def metrics_callbacks(self):
+        """Return the functions called with the metrics of every request."""
+        return self.__metrics
+
+    def add_metrics_callback(self, callback):
+        """Call a function with a cert_manager.RequestMetrics object after every request.
+
+        :param callable callback: The function to call; it should return quickly, as it runs in the requesting thread
+        """
+        self.__metrics = self.__metrics + (callback,)
+
+    def remove_metrics_callback(self, callback):
+        """Stop calling a function added with add_metrics_callback; unknown functions are ignored.
+
+        :param callable callback: The function to remove
+        """
+        self.__metrics = tuple(func for func in self.__metrics if func != callback)
+
     def add_headers(self, headers=None):
         """Add the provided headers to the internally stored headers.
 
@@ -159,6 +239,95 @@ class Client:  # pylint: disable=too-many-instance-attributes
                     del self.__headers[head]
                     del self.__session.headers[head]
 
+    def __rate_limited(self, send, url):
+        """Wrap a requests.Session method so the rate limiter is waited on before every attempt."""
+        path = url[len(self.__base_url):] if url.startswith(self.__base_url) else url
+
+        def limited_send(*args, **kwargs):
+            """Wait for the rate limiter and send the request."""
+            self.__rate_limit.acquire(path)
+            return send(*args, **kwargs)
+
+        return limited_send
+
+    def __request(self, method, url, retry=None, **kwargs):
+        """Send a request through the internal requests.Session, retrying transient failures.
+
+        :param str method: The HTTP method to use
+        :param str url: A URL to query
+        :param bool retry: Retry transient failures if True, never retry if False; if None, the retry policy decides
+            based on the HTTP method
+        :param dict kwargs: Any other parameters to pass to the requests.Session method
+        :return obj: The last requests.Response object received
+        """
+        callbacks = self.__metrics
+        if not callbacks:
+            return self.__send(method, url, retry=retry, metrics=None, **kwargs)
+
+        path = url[len(self.__base_url):] if url.startswith(self.__base_url) else urlsplit(url).path
+        metrics = RequestMetrics(method, url, endpoint_template(path.split("?", 1)[0]))
+        # Drop any connection time left over by a request which was not measured
+        take_connection_times()
+
+        started = time.monotonic()
+        try:
+            return self.__send(method, url, retry=retry, metrics=metrics, **kwargs)
+        except Exception as exc:
+            metrics.error = exc
+            connect, tls = take_connection_times()
+            metrics.connect += connect
+            metrics.tls += tls
+            raise
+        finally:
+            metrics.total = time.monotonic() - started
+            for callback in callbacks:
+                try:
+                    callback(metrics)
+                except Exception as exc:  # pylint: disable=broad-except
+                    LOGGER.warning("Metrics callback %r failed: %s", callback, exc)
+
+    def __send(self, method, url, *, retry, metrics, **kwargs):
+        """Send a request, retrying transient failures, and account for every response in *metrics* if not None."""
+        send = getattr(self.__session, method.lower())
+        if self.__rate_limit is not None:
+            send = self.__rate_limited(send, url)
+
+        policy = self.__retry
+        if policy is None:
+            result = send(url, **kwargs)
+            if metrics is not None:
+                metrics.add_response(result, streamed=kwargs.get("stream", False))
+            return result
+        if retry is None:
+            retry = policy.retries_method(method)
+
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            if metrics is not None:
+                metrics.retries = attempt - 1
+            try:
+                result = send(url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as exc:
+                delay = policy.next_delay(attempt, started) if retry else None
+                if delay is None:
+                    raise
+                LOGGER.warning("%s %s failed (%s), retrying in %.2fs", method, url, exc, delay)
+            else:
+                if metrics is not None:
+                    metrics.add_response(result, streamed=kwargs.get("stream", False))
+                if not (retry and policy.retries_status(result.status_code)):
+                    return result
+                delay = policy.next_delay(attempt, started, result)
+                if delay is None:
+                    return result
+                LOGGER.warning("%s %s returned %s, retrying in %.2fs", method, url, result.status_code, delay)
+                # Release the connection back to the pool before waiting
+                result.close()
+
+            time.sleep(delay)
+
     @traffic_log(traffic_logger=LOGGER)
     def head(self, url, headers=None, params=None, timeout=None):
         """Submit a HEAD request to the provided URL.
@@ -168,8 +337,8 @@ class Client:  # pylint: disable=too-many-instance-attributes
         :param dict params: A dictionary with any parameters to add to the request URL
         :return obj: A requests.Response object received as a response
         """
-        result = self.__session.head(
-            url, headers=headers, params=params, timeout=timeout
+        result = self.__request(
+            "HEAD", url, headers=headers, params=params, timeout=timeout
         )
         # Raise an exception if the return code is in an error range
         result.raise_for_status()
@@ -177,20 +346,25 @@ class Client:  # pylint: disable=too-many-instance-attributes
         return result
 
     @traffic_log(traffic_logger=LOGGER)
-    def get(self, url, headers=None, params=None, timeout=None):
+    def get(self, url, headers=None, params=None, timeout=None, *, stream=False):  # pylint: disable=too-many-arguments
         """Submit a GET request to the provided URL.
 
         :param str url: A URL to query
         :param dict headers: A dictionary with any extra headers to add to the request
         :param dict params: A dictionary with any parameters to add to the request URL
+        :param bool stream: Do not read the response body until it is accessed if True (i.e. to decode it with
+            cert_manager._stream.iter_response_items); the default is False
         :return obj: A requests.Response object received as a response
         """
-        result = self.__session.get(
+        extra = {"stream": True} if stream else {}
+        result = self.__request(
+            "GET",
             url,
             headers=headers,
             params=params,
             hooks={"response": _response_hook},
             timeout=timeout,
+            **extra,
         )
         # Raise an exception if the return code is in an error range
         result.raise_for_status()
@@ -198,20 +372,29 @@ class Client:  # pylint: disable=too-many-instance-attributes
         return result
 
     @traffic_log(traffic_logger=LOGGER)
-    def post(self, url, headers=None, data=None, timeout=None):
+    def post(self, url, headers=None, data=None, timeout=None, *, retry=False,  # pylint: disable=too-many-arguments
+             stream=False):
         """Submit a POST request to the provided URL and data.
 
         :param str url: A URL to query
         :param dict headers: A dictionary with any extra headers to add to the request
         :param dict data: A dictionary with the data to use for the body of the POST
+        :param bool retry: Retry transient failures using the retry policy if True; the default is False as POST
+            requests are usually not idempotent
+        :param bool stream: Do not read the response body until it is accessed if True (i.e. to decode it with
+            cert_manager._stream.iter_response_items); the default is False
         :return obj: A requests.Response object received as a response
         """
-        result = self.__session.post(
+        extra = {"stream": True} if stream else {}
+        result = self.__request(
+            "POST",
             url,
+            retry=retry,
             json=data,
             headers=headers,
             hooks={"response": _response_hook},
             timeout=timeout,
+            **extra,
         )
         if result.reason:
             LOGGER.warning(f"API error reason: {result.reason}")
@@ -229,8 +412,8 @@ class Client:  # pylint: disable=too-many-instance-attributes
         :param dict data: A dictionary with the data to use for the body of the PUT
         :return obj: A requests.Response object received as a response
         """
-        result = self.__session.put(
-            url, json=data, headers=headers, timeout=timeout
+        result = self.__request(
+            "PUT", url, json=data, headers=headers, timeout=timeout
         )
         # Raise an exception if the return code is in an error range
         result.raise_for_status()
@@ -246,7 +429,8 @@ class Client:  # pylint: disable=too-many-instance-attributes
         :param dict data: A dictionary with the data to use for the body of the DELETE
         :return obj: A requests.Response object received as a response
         """
-        result = self.__session.delete(
+        result = self.__request(
+            "DELETE",
             url,
             json=data,
             headers=headers,
@@ -45,6 +45,9 @@ class Domain(Endpoint):
     def find(self, **kwargs):
         """Return a list of domains matching the given parameters from Sectigo.
 
+        To fetch several pages concurrently, pass `prefetch` with the number of pages to keep in flight.  Passing
+        `total=True` as well uses *count* to avoid requesting pages past the last domain.
+
         :param dict kwargs: A dictonary of parameters that will be passed to the API to execute teh search
 
         :return list: A list of dictionaries representing the domains that match the given parameters
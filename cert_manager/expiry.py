@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager.expiry.ExpiryIndex class."""
+
+import bisect
+import logging
+from datetime import date, datetime, timedelta, timezone
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _to_date(value):
+    """Return a datetime.date from a date, datetime or ISO date string, or None if it cannot be parsed."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def _range_date(value, name):
+    """Return the datetime.date of a range bound, None for an open bound, or raise a ValueError."""
+    if value is None:
+        return None
+
+    day = _to_date(value)
+    if day is None:
+        raise ValueError(f"Invalid {name} date: {value!r}")
+
+    return day
+
+
+class ExpiryIndex:  # pylint: disable=too-many-instance-attributes
+    """Index certificates by expiry date, overall and per organization.
+
+    Certificates are kept in lists sorted by expiry date, so finding the certificates expiring in a date range costs
+    two binary searches plus the number of certificates returned, instead of a scan of every certificate.  The index
+    can be built from any certificate dictionaries holding an expiry date, such as the results of SSL.get, the SSL
+    certificate report or an Inventory.
+    """
+
+    def __init__(self, certs=None, **kwargs):
+        """Initialize the class.
+
+        :param iter certs: The certificate dictionaries to index; the default is None, which starts empty
+        :param str expiry_field: The field holding the expiry date; the default is "expires"
+        :param str org_field: The field holding the organization ID; the default is "orgId"
+        :param list id_fields: The fields which may hold the certificate ID, in order of preference; the default is
+            ["sslId", "id"]
+        :param list skip_statuses: The statuses (case insensitive) of certificates which are never renewed; the
+            default is ["revoked", "replaced"]
+        """
+        self.__expiry_field = kwargs.get("expiry_field", "expires")
+        self.__org_field = kwargs.get("org_field", "orgId")
+        self.__id_fields = kwargs.get("id_fields", ["sslId", "id"])
+        self.__skip_statuses = {status.lower() for status in kwargs.get("skip_statuses", ["revoked", "replaced"])}
+
+        # The sort keys are (expiry date, str(cert ID)) tuples, so IDs of any type sort together
+        self.__certs = {}
+        self.__keys = {}
+        self.__ids = {}
+        self.__sorted = []
+        self.__by_org = {}
+
+        if certs:
+            self.update(certs)
+
+    def __len__(self):
+        """Return the number of certificates indexed."""
+        return len(self.__certs)
+
+    @classmethod
+    def from_inventory(cls, inventory, kind="ssl", **kwargs):
+        """Build an index over the certificates stored in an Inventory.
+
+        :param object inventory: An instantiated cert_manager.Inventory object
+        :param str kind: The kind of certificates to index; the default is "ssl"
+        :param dict kwargs: Any other parameters to pass to the class initializer
+        :return obj: An ExpiryIndex object
+        """
+        return cls(inventory.all(kind), **kwargs)
+
+    def update(self, certs):
+        """Add certificates to the index, replacing the ones already indexed with the same ID.
+
+        The new sort keys are appended and each sorted list is sorted once, so building an index costs O(n log n)
+        instead of one insertion per certificate.
+
+        :param iter certs: The certificate dictionaries to index
+        :return int: The number of certificates skipped because they have no ID or no valid expiry date
+        """
+        skipped = 0
+        entries = {}
+        for cert in certs:
+            entry = self._entry(cert)
+            if entry is None:
+                skipped += 1
+                continue
+            # The last certificate with an ID wins, as it would with successive calls to add
+            entries.pop(entry[0], None)
+            entries[entry[0]] = entry
+
+        stale = {}
+        for cert_id in entries:
+            if cert_id in self.__keys:
+                key, org_id = self.__keys.pop(cert_id)
+                del self.__certs[cert_id]
+                del self.__ids[key]
+                stale.setdefault(org_id, set()).add(key)
+        if stale:
+            stale_keys = set().union(*stale.values())
+            self.__sorted = [key for key in self.__sorted if key not in stale_keys]
+            for org_id, keys in stale.items():
+                self.__by_org[org_id] = [key for key in self.__by_org[org_id] if key not in keys]
+                if not self.__by_org[org_id]:
+                    del self.__by_org[org_id]
+
+        changed = set()
+        for cert_id, cert, key, org_id in entries.values():
+            self.__certs[cert_id] = cert
+            self.__keys[cert_id] = (key, org_id)
+            self.__ids[key] = cert_id
+            self.__sorted.append(key)
+            self.__by_org.setdefault(org_id, []).append(key)
+            changed.add(org_id)
+        if entries:
+            self.__sorted.sort()
+            for org_id in changed:
+                self.__by_org[org_id].sort()
+
+        if skipped:
+            LOGGER.debug("%s certificates without an ID or an expiry date were not indexed", skipped)
+
+        return skipped
+
+    def add(self, cert):
+        """Add one certificate to the index, replacing the one already indexed with the same ID.
+
+        :param dict cert: The certificate dictionary
+        :return bool: True if the certificate was indexed, False if it has no ID or no valid expiry date
+        """
+        entry = self._entry(cert)
+        if entry is None:
+            return False
+
+        cert_id, cert, key, org_id = entry
+        self.remove(cert_id)
+
+        self.__certs[cert_id] = cert
+        self.__keys[cert_id] = (key, org_id)
+        self.__ids[key] = cert_id
+        bisect.insort(self.__sorted, key)
+        bisect.insort(self.__by_org.setdefault(org_id, []), key)
+
+        return True
+
+    def remove(self, cert_id):
+        """Remove a certificate from the index; unknown IDs are ignored.
+
+        :param cert_id: The certificate ID
+        """
+        if cert_id not in self.__keys:
+            return
+
+        key, org_id = self.__keys.pop(cert_id)
+        del self.__certs[cert_id]
+        del self.__ids[key]
+        for keys in (self.__sorted, self.__by_org[org_id]):
+            del keys[bisect.bisect_left(keys, key)]
+        if not self.__by_org[org_id]:
+            del self.__by_org[org_id]
+
+    def get(self, cert_id):
+        """Return the indexed certificate with the given ID.
+
+        :param cert_id: The certificate ID
+        :return dict: The certificate dictionary, or None if it is not indexed
+        """
+        return self.__certs.get(cert_id)
+
+    @property
+    def org_ids(self):
+        """Return the IDs of the organizations with indexed certificates."""
+        return list(self.__by_org)
+
+    def expiring(self, start=None, end=None, org_id=None):
+        """Return the certificates expiring between two dates, sorted by expiry date.
+
+        :param start: The first day of the range (date, datetime or ISO date string); the default is None, which
+            includes all certificates expiring before *end*
+        :param end: The last day of the range, included; the default is None, which includes all certificates
+            expiring after *start*
+        :param org_id: Only return the certificates of this organization; the default is None, which returns the
+            certificates of all organizations
+        :return list: A list of certificate dictionaries
+        :raise ValueError: If *start* or *end* is not a valid date
+        """
+        first_day = _range_date(start, "start")
+        last_day = _range_date(end, "end")
+        keys = self.__by_org.get(org_id, []) if org_id is not None else self.__sorted
+
+        first = bisect.bisect_left(keys, (first_day, "")) if first_day is not None else 0
+        # Every key of the last day sorts before (next day, "")
+        last = bisect.bisect_left(keys, (last_day + timedelta(days=1), "")) if last_day is not None else len(keys)
+
+        return [self.__certs[self.__ids[key]] for key in keys[first:last]]
+
+    def renewal_plan(self, window_days=30, org_id=None, today=None, include_expired=False):
+        """Yield the IDs of the certificates to renew, in expiry order.
+
+        :param int window_days: Renew the certificates expiring within this many days; the default is 30
+        :param org_id: Only plan the certificates of this organization; the default is None, which plans all
+            organizations
+        :param today: The day the window starts; the default is the current UTC date
+        :param bool include_expired: Also yield the certificates which already expired; the default is False
+        :return iter: Yield certificate IDs, ready to pass to SSL.renew
+        """
+        today = _range_date(today, "today") if today is not None else datetime.now(timezone.utc).date()
+        start = None if include_expired else today
+
+        for cert in self.expiring(start, today + timedelta(days=window_days), org_id=org_id):
+            if str(cert.get("status", "")).lower() in self.__skip_statuses:
+                continue
+            yield self._cert_id(cert)
+
+    def _entry(self, cert):
+        """Return the (cert ID, cert, sort key, org ID) tuple of a certificate, or None if it cannot be indexed."""
+        cert_id = self._cert_id(cert)
+        expires = _to_date(cert.get(self.__expiry_field)) if cert.get(self.__expiry_field) else None
+        if cert_id is None or expires is None:
+            return None
+
+        return cert_id, cert, (expires, str(cert_id)), cert.get(self.__org_field)
+
+    def _cert_id(self, cert):
+        """Return the ID of a certificate dictionary, or None if it has none."""
+        return next((cert[field] for field in self.__id_fields if cert.get(field) is not None), None)
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager.inventory.Inventory class."""
+
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from ._sqlite import SQLiteStore
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _today():
+    """Return the current UTC date."""
+    return datetime.now(timezone.utc).date()
+
+
+def _list_record(row, report_id, list_id):
+    """Return a (cert_id, record) tuple for a report row, with its ID under the field used by the list results."""
+    cert_id = row[report_id]
+    if report_id == list_id:
+        return cert_id, row
+
+    record = {key: value for key, value in row.items() if key != report_id}
+    record[list_id] = cert_id
+
+    return cert_id, record
+
+
+class Inventory(SQLiteStore):  # pylint: disable=too-many-instance-attributes
+    """Keep a local SQLite copy of the SSL and S/MIME certificates, updated incrementally.
+
+    The first sync of a kind of certificate lists all of them.  Later syncs only ask the Report endpoint for the
+    certificates requested, issued, revoked or expired since the last sync (with a day of overlap) and merge those
+    rows into the stored records.  A full sync is done again every *full_sync_days* days, which also removes the
+    certificates no longer returned by the API.
+    """
+
+    # For each kind of certificate: the ID field of the list results, the report name, the ID field of its rows and
+    # its date attributes
+    KINDS = {
+        "ssl": {
+            "list_id": "sslId",
+            "report": "ssl-certificates",
+            "report_id": "id",
+            # 2=revocation, 3=expiration, 4=requested, 5=issuance
+            "date_attributes": [2, 3, 4, 5],
+        },
+        "smime": {
+            "list_id": "id",
+            "report": "client-certificates",
+            "report_id": "id",
+            # 0=enrolled, 1=downloaded, 2=revocation, 3=expired
+            "date_attributes": [0, 1, 2, 3],
+        },
+    }
+
+    BATCH_SIZE = 500
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS certificates (
+            kind TEXT NOT NULL,
+            cert_id TEXT NOT NULL,
+            data TEXT NOT NULL,
+            generation INTEGER NOT NULL,
+            updated REAL NOT NULL,
+            PRIMARY KEY (kind, cert_id)
+        );
+        CREATE TABLE IF NOT EXISTS sync_state (
+            kind TEXT PRIMARY KEY,
+            last_sync TEXT NOT NULL,
+            last_full_sync TEXT NOT NULL,
+            generation INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, path, report, **kwargs):
+        """Initialize the class.
+
+        :param str path: The path of the SQLite database file; ":memory:" keeps it in memory
+        :param object report: An instantiated cert_manager.Report object
+        :param object ssl: An instantiated cert_manager.SSL object, needed to sync SSL certificates
+        :param object smime: An instantiated cert_manager.SMIME object, needed to sync S/MIME certificates
+        :param int full_sync_days: The number of days after which a full sync is done again; the default is 7
+        :param int window_days: The number of days in each report request; the default is 30
+        :param int max_workers: The maximum number of report requests in flight; the default is 4
+        :param int prefetch: The number of list pages to keep in flight during a full sync; the default is 0
+        """
+        self.__report = report
+        self.__endpoints = {"ssl": kwargs.get("ssl"), "smime": kwargs.get("smime")}
+        self.__full_sync_days = kwargs.get("full_sync_days", 7)
+        self.__window_days = kwargs.get("window_days", 30)
+        self.__max_workers = kwargs.get("max_workers", 4)
+        self.__prefetch = kwargs.get("prefetch", 0)
+
+        super().__init__(path)
+
+    def sync(self, kind=None, full=False):
+        """Bring the stored certificates up to date with the API.
+
+        :param str kind: The kind of certificates to sync ("ssl" or "smime"); the default syncs every kind with an
+            endpoint object
+        :param bool full: List all certificates even if an incremental sync is possible; the default is False
+        :return list: A dictionary for each kind synced, with the "kind", the "mode" ("full" or "incremental"), the
+            number of certificates "updated" and "removed", and the "seconds" spent
+        """
+        kinds = [kind] if kind else [name for name in self.KINDS if self.__endpoints.get(name)]
+
+        results = []
+        for name in kinds:
+            if name not in self.KINDS:
+                raise ValueError(f"Unknown kind of certificate: {name}")
+            if not self.__endpoints.get(name):
+                raise ValueError(f"No endpoint object was provided to sync {name} certificates")
+
+            state = self._state(name)
+            due = state is None or (
+                _today() - datetime.fromisoformat(state["last_full_sync"]).date()
+            ).days >= self.__full_sync_days
+
+            started = time.monotonic()
+            if full or due:
+                result = self._full_sync(name, state)
+            else:
+                result = self._incremental_sync(name, state)
+            result["seconds"] = time.monotonic() - started
+
+            LOGGER.info("Inventory %s sync of %s: %s updated, %s removed in %.1fs", result["mode"], name,
+                        result["updated"], result["removed"], result["seconds"])
+            results.append(result)
+
+        return results
+
+    def get(self, kind, cert_id):
+        """Return the stored record of a certificate.
+
+        :param str kind: The kind of certificate ("ssl" or "smime")
+        :param cert_id: The certificate ID
+        :return dict: The certificate record, or None if it is not stored
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM certificates WHERE kind = ? AND cert_id = ?", (kind, str(cert_id))
+            ).fetchone()
+
+        return json.loads(row[0]) if row else None
+
+    def all(self, kind):
+        """Return the stored records of one kind of certificate, sorted by ID.
+
+        :param str kind: The kind of certificate ("ssl" or "smime")
+        :return list: A list of dictionaries representing the certificates
+        """
+        # The IDs are stored as text, so they are sorted as numbers first, or "10" would come before "9"
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM certificates WHERE kind = ? ORDER BY CAST(cert_id AS INTEGER), cert_id", (kind,)
+            ).fetchall()
+
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self, kind):
+        """Return the number of stored certificates of one kind.
+
+        :param str kind: The kind of certificate ("ssl" or "smime")
+        :return int: The number of certificates
+        """
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM certificates WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def last_sync(self, kind):
+        """Return the date of the last sync of one kind of certificate.
+
+        :param str kind: The kind of certificate ("ssl" or "smime")
+        :return str: The ISO date of the last sync, or None if it was never synced
+        """
+        state = self._state(kind)
+
+        return state["last_sync"] if state else None
+
+    def _state(self, kind):
+        """Return the sync state of one kind of certificate, or None if it was never synced."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_sync, last_full_sync, generation FROM sync_state WHERE kind = ?", (kind,)
+            ).fetchone()
+
+        if not row:
+            return None
+
+        return {"last_sync": row[0], "last_full_sync": row[1], "generation": row[2]}
+
+    def _save_state(self, kind, last_sync, last_full_sync, generation):
+        """Store the sync state of one kind of certificate."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (kind, last_sync, last_full_sync, generation) VALUES (?, ?, ?, ?)",
+                (kind, last_sync, last_full_sync, generation),
+            )
+
+    def _upsert(self, kind, records, generation, merge):
+        """Store records in batches, merging them with the stored ones if *merge* is True.
+
+        :param iter records: An iterable of (cert_id, record) tuples
+        :return int: The number of records stored
+        """
+        count = 0
+        batch = []
+        for cert_id, record in records:
+            batch.append((str(cert_id), record))
+            if len(batch) >= self.BATCH_SIZE:
+                count += self._write_batch(kind, batch, generation, merge)
+                batch = []
+        if batch:
+            count += self._write_batch(kind, batch, generation, merge)
+
+        return count
+
+    def _write_batch(self, kind, batch, generation, merge):
+        """Write one batch of records in a single transaction."""
+        now = time.time()
+        with self._lock, self._conn:
+            if merge:
+                merged = []
+                for cert_id, record in batch:
+                    row = self._conn.execute(
+                        "SELECT data FROM certificates WHERE kind = ? AND cert_id = ?", (kind, cert_id)
+                    ).fetchone()
+                    if row:
+                        record = {**json.loads(row[0]), **record}
+                    merged.append((cert_id, record))
+                batch = merged
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO certificates (kind, cert_id, data, generation, updated) VALUES (?, ?, ?, ?, ?)",
+                [(kind, cert_id, json.dumps(record), generation, now) for cert_id, record in batch],
+            )
+
+        return len(batch)
+
+    def _full_sync(self, kind, state):
+        """List all certificates, then remove the stored ones which were not listed."""
+        generation = (state["generation"] if state else 0) + 1
+        id_field = self.KINDS[kind]["list_id"]
+        today = _today().isoformat()
+
+        kwargs = {"prefetch": self.__prefetch} if self.__prefetch else {}
+        records = (
+            (record[id_field], record) for record in self.__endpoints[kind].list(**kwargs) if id_field in record
+        )
+        updated = self._upsert(kind, records, generation, merge=False)
+
+        # Only reached if the whole list was read, so a failed sync never removes anything
+        with self._lock, self._conn:
+            removed = self._conn.execute(
+                "DELETE FROM certificates WHERE kind = ? AND generation != ?", (kind, generation)
+            ).rowcount
+        self._save_state(kind, today, today, generation)
+
+        return {"kind": kind, "mode": "full", "updated": updated, "removed": removed}
+
+    def _incremental_sync(self, kind, state):
+        """Merge the report rows of the certificates which changed since the last sync."""
+        settings = self.KINDS[kind]
+        today = _today()
+        # Overlap with the last sync by one day, as it may have run before the end of that day
+        start = datetime.fromisoformat(state["last_sync"]).date() - timedelta(days=1)
+
+        updated = 0
+        for attribute in settings["date_attributes"]:
+            rows = self.__report.get_windowed(
+                settings["report"], start, today, window_days=self.__window_days, max_workers=self.__max_workers,
+                certificateDateAttribute=attribute,
+            )
+            report_id, list_id = settings["report_id"], settings["list_id"]
+            records = (_list_record(row, report_id, list_id) for row in rows if report_id in row)
+            updated += self._upsert(kind, records, state["generation"], merge=True)
+
+        self._save_state(kind, today.isoformat(), state["last_full_sync"], state["generation"])
+
+        return {"kind": kind, "mode": "incremental", "updated": updated, "removed": 0}
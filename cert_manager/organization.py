@@ -4,6 +4,7 @@
 import logging
 
 from ._endpoint import Endpoint
+from ._lazy import LazyLoader
 
 LOGGER = logging.getLogger(__name__)
 
@@ -11,18 +12,27 @@ LOGGER = logging.getLogger(__name__)
 class Organization(Endpoint):
     """Query the Sectigo Cert Manager REST API for Organization data."""
 
-    def __init__(self, client, api_version="v1"):
+    def __init__(self, client, api_version="v1", **kwargs):
         """Initialize the class.
 
-        Note: The *all* method will be run on object instantiation to fetch all organizations
+        Note: The organizations are fetched the first time they are needed, not on object instantiation
 
         :param object client: An instantiated cert_manager.Client object
         :param string api_version: The API version to use; the default is "v1"
+        :param str snapshot: The path of a JSON file where the organizations are persisted between runs; the default is
+            None, which disables the snapshot
+        :param float snapshot_max_age: The maximum age, in seconds, of a snapshot which can be used; the default is
+            86400
+        :param float refresh: The interval, in seconds, between background refreshes of the organizations; the
+            default is None, which disables the background refresh
         """
         super().__init__(client=client, endpoint="/organization", api_version=api_version)
 
-        self.__orgs = None
-        self.all()
+        self.__orgs = LazyLoader(
+            self._fetch, key=f"{client.login_uri}:{self._api_url}", snapshot=kwargs.get("snapshot"),
+            snapshot_max_age=kwargs.get("snapshot_max_age", 86400), refresh=kwargs.get("refresh"),
+        )
+        self.__index = None
 
     def all(self, force=False):
         """Return a list of organizations from Sectigo.
@@ -31,14 +41,17 @@ class Organization(Endpoint):
 
         :return list: A list of dictionaries representing the organizations
         """
-        if (self.__orgs) and (not force):
-            return self.__orgs
+        return self.__orgs.get(force=force)
 
+    def _fetch(self):
+        """Retrieve the organizations from the API."""
         result = self._client.get(self._api_url)
 
-        self.__orgs = result.json()
+        return result.json()
 
-        return self.__orgs
+    def close(self):
+        """Stop the background refresh of the organizations, if it is running."""
+        self.__orgs.stop()
 
     def find(self, org_name=None, dept_name=None):
         """Return a dictionary of organization information.
@@ -58,8 +71,6 @@ class Organization(Endpoint):
 
         :return list: A list of dictionaries representing the organization or department
         """
-        ret = {}
-
         # Use .all to get the data in case it still needs to be fetched
         result = self.all()
 
@@ -67,28 +78,70 @@ class Organization(Endpoint):
         if (not org_name) and (not dept_name):
             return result
 
-        # Start out with everything
-        org_data = result
-        if org_name:
-            # If we are searching for an org name, start out with nothing
-            org_data = []
-            for res in result:
-                # Only add to the org data if we find the org we were looking for
-                if res["name"] == org_name:
-                    org_data.append(res)
-
-        ret = org_data
-        if dept_name:
-            ret = []
-            # Go through all the remaining orgs
-            for org in org_data:
-                # If there's no department field, we can't check departments, so move on
-                if "departments" not in org:
-                    continue
-
-                # Search through all departments for the provided department name
-                for dept in org["departments"]:
-                    if dept["name"] == dept_name:
-                        ret.append(dept)
-
-        return ret
+        index = self._index(result)
+        if not dept_name:
+            return list(index.orgs_by_name.get(org_name, []))
+        if not org_name:
+            return list(index.depts_by_name.get(dept_name, []))
+
+        return list(index.depts_by_org_and_name.get((org_name, dept_name), []))
+
+    def get_by_id(self, entity_id):
+        """Return the organization or department with the given ID.
+
+        :param int entity_id: The ID of the organization or department
+        :return dict: A dictionary representing the organization or department, or None if not found
+        """
+        index = self._index(self.all())
+
+        if entity_id in index.orgs_by_id:
+            return index.orgs_by_id[entity_id]
+        path = index.dept_paths.get(entity_id)
+
+        return path[1] if path else None
+
+    def find_department_path(self, dept_id):
+        """Return the organization and the department for a department ID.
+
+        :param int dept_id: The ID of the department
+        :return tuple: A (organization, department) tuple of dictionaries, or None if not found
+        """
+        return self._index(self.all()).dept_paths.get(dept_id)
+
+    def _index(self, orgs):
+        """Return the lookup index for the given list of organizations, building it if the list changed."""
+        index = self.__index
+        # The list is replaced as a whole whenever it is fetched again, so its identity tells if the index is stale
+        if index is None or index.orgs is not orgs:
+            index = _OrganizationIndex(orgs)
+            self.__index = index
+
+        return index
+
+
+class _OrganizationIndex:  # pylint: disable=too-few-public-methods
+    """Hold dictionaries to look up organizations and departments by name or ID."""
+
+    def __init__(self, orgs):
+        """Build the indexes for a list of organizations.
+
+        :param list orgs: A list of dictionaries representing the organizations, as returned by the API
+        """
+        self.orgs = orgs
+        self.orgs_by_name = {}
+        self.orgs_by_id = {}
+        self.depts_by_name = {}
+        self.depts_by_org_and_name = {}
+        self.dept_paths = {}
+
+        for org in orgs:
+            self.orgs_by_name.setdefault(org["name"], []).append(org)
+            if "id" in org:
+                self.orgs_by_id[org["id"]] = org
+
+            # If there's no department field, there are no departments to index
+            for dept in org.get("departments", []):
+                self.depts_by_name.setdefault(dept["name"], []).append(dept)
+                self.depts_by_org_and_name.setdefault((org["name"], dept["name"]), []).append(dept)
+                if "id" in dept:
+                    self.dept_paths[dept["id"]] = (org, dept)
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager.renewal.BulkRenewer class."""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from ._helpers import run_concurrently
+
+LOGGER = logging.getLogger(__name__)
+
+
+class BulkRenewer:
+    """Renew many certificates concurrently, recording each outcome in a checkpoint file.
+
+    The checkpoint is a JSON Lines journal: one line is appended (and flushed) as each renewal finishes, so after a
+    crash the next run skips the certificates already renewed.  Requests still go through the Client, so its retry
+    policy and rate limit apply to every renewal.
+    """
+
+    def __init__(self, renew, **kwargs):
+        """Initialize the class.
+
+        :param callable renew: A function renewing one certificate given its ID or serial number (i.e. SSL.renew)
+        :param str checkpoint: The path of the checkpoint file; the default is None, which keeps no checkpoint
+        :param int max_workers: The maximum number of renewals in flight; the default is 8
+        :param bool retry_failed: Renew again the certificates whose renewal failed in an earlier run; the default is
+            True
+        :param bool fsync: Force each checkpoint line to disk before going on; the default is False
+        """
+        self.__renew = renew
+        self.__checkpoint = kwargs.get("checkpoint")
+        self.__max_workers = kwargs.get("max_workers", 8)
+        self.__retry_failed = kwargs.get("retry_failed", True)
+        self.__fsync = kwargs.get("fsync", False)
+
+        self.__lock = threading.Lock()
+        self.__outcomes = self._load_checkpoint()
+
+    @classmethod
+    def for_ssl(cls, ssl, **kwargs):
+        """Return a BulkRenewer for SSL certificate IDs.
+
+        :param object ssl: An instantiated cert_manager.SSL object
+        :param dict kwargs: Any other parameters to pass to the class initializer
+        :return obj: A BulkRenewer object
+        """
+        return cls(ssl.renew, **kwargs)
+
+    @classmethod
+    def for_smime(cls, smime, by="serial", **kwargs):
+        """Return a BulkRenewer for S/MIME certificate serial or order numbers.
+
+        :param object smime: An instantiated cert_manager.SMIME object
+        :param str by: "serial" to renew by serial number or "order" to renew by order number; the default is
+            "serial"
+        :param dict kwargs: Any other parameters to pass to the class initializer
+        :return obj: A BulkRenewer object
+        """
+        if by not in ("serial", "order"):
+            raise ValueError(f"by must be 'serial' or 'order', not {by!r}")
+
+        if by == "order":
+            return cls(lambda order_num: smime.renew(order_num=order_num), **kwargs)
+
+        return cls(lambda serial_num: smime.renew(serial_num=serial_num), **kwargs)
+
+    @property
+    def outcomes(self):
+        """Return a dictionary of the last outcome of every certificate, keyed by str(ID)."""
+        with self.__lock:
+            return dict(self.__outcomes)
+
+    def summary(self):
+        """Return the number of certificates renewed and failed so far.
+
+        :return dict: The number of outcomes under "ok" and "failed"
+        """
+        with self.__lock:
+            succeeded = sum(1 for outcome in self.__outcomes.values() if outcome["ok"])
+            return {"ok": succeeded, "failed": len(self.__outcomes) - succeeded}
+
+    def run(self, cert_ids):
+        """Renew the certificates, skipping the ones already renewed according to the checkpoint.
+
+        :param iter cert_ids: The certificate IDs (or serial or order numbers) to renew
+        :return iter: Yield one dictionary per certificate renewed in this run, with the "id", "ok" (True if the
+            renewal succeeded), and either the "result" of the renewal or the "error" message
+        """
+        todo = (cert_id for cert_id in cert_ids if not self._done(cert_id))
+
+        for cert_id, result in run_concurrently(self.__renew, todo, max_workers=self.__max_workers):
+            outcome = {"id": cert_id, "ok": not isinstance(result, Exception), "at": time.time()}
+            if outcome["ok"]:
+                outcome["result"] = result
+            else:
+                outcome["error"] = str(result)
+                LOGGER.warning("Renewal of %s failed: %s", cert_id, result)
+
+            self._record(outcome)
+            yield outcome
+
+    def _done(self, cert_id):
+        """Return True if the certificate does not need to be renewed in this run."""
+        with self.__lock:
+            outcome = self.__outcomes.get(str(cert_id))
+
+        if outcome is None:
+            return False
+
+        return outcome["ok"] or not self.__retry_failed
+
+    def _record(self, outcome):
+        """Store an outcome and append it to the checkpoint file."""
+        with self.__lock:
+            self.__outcomes[str(outcome["id"])] = outcome
+            if not self.__checkpoint:
+                return
+
+            with open(self.__checkpoint, "a", encoding="utf-8") as filep:
+                filep.write(json.dumps(outcome, default=str) + "\n")
+                filep.flush()
+                if self.__fsync:
+                    os.fsync(filep.fileno())
+
+    def _load_checkpoint(self):
+        """Read the outcomes recorded by earlier runs; the last line for a certificate wins."""
+        outcomes = {}
+        if not self.__checkpoint or not os.path.exists(self.__checkpoint):
+            return outcomes
+
+        with open(self.__checkpoint, "r", encoding="utf-8") as filep:
+            lines = filep.read().split("\n")
+
+        for line in lines:
+            if not line:
+                continue
+            try:
+                outcome = json.loads(line)
+            except ValueError:
+                # A line cut short by a crash
+                LOGGER.debug("Ignoring a truncated line in %s", self.__checkpoint)
+                continue
+            outcomes[str(outcome["id"])] = outcome
+
+        if lines[-1]:
+            # End the truncated line so the next outcome starts on a line of its own
+            with open(self.__checkpoint, "a", encoding="utf-8") as filep:
+                filep.write("\n")
+
+        LOGGER.info("Loaded %s outcomes from %s", len(outcomes), self.__checkpoint)
+
+        return outcomes
@@ -2,9 +2,12 @@
 """Define the cert_manager.report.Report class."""
 
 import logging
+from datetime import date, datetime, timedelta
 from requests.exceptions import HTTPError
 
 from ._endpoint import Endpoint
+from ._helpers import run_concurrently
+from ._stream import iter_response_items
 
 LOGGER = logging.getLogger(__name__)
 
@@ -20,30 +23,42 @@ class Report(Endpoint):
         """
         super().__init__(client=client, endpoint="/report", api_version=api_version)
 
-    def get(self, report_name, **kwargs):
+    def get(self, report_name, stream=False, **kwargs):
         """Get any available reports provided in the REST Sctigo API.
 
         :param str report_name: Name of report based on the api url suffix
+        :param bool stream: Return an iterator over the report rows, decoded one at a time as the response arrives, if
+            True; the default is False, which returns the whole report data at once
         :param dict kwargs: Additional fields that will be passed to the API
 
         Search fields for reports can be found in the Sectigo API Documentation.
         Additional request fields are documented in Sectigo API Documentation
         https://sectigo.com/faqs/detail/Sectigo-Certificate-Manager-SCM-REST-API/kA01N000000XDkE
 
-        return dict: The report data
+        return dict: The report data, or an iterator over the rows in "reports" if *stream* is True
         """
-        data = {}
-        for key, value in kwargs.items():
-            data[key] = value
+        result = self._post(report_name, kwargs, stream=stream)
+
+        if stream:
+            return iter_response_items(result, key="reports")
+
+        return result.json()
+
+    def _post(self, report_name, data, stream=False):
+        """Request a report, returning the requests.Response object.
 
+        :param str report_name: Name of report based on the api url suffix
+        :param dict data: The fields passed to the API
+        :param bool stream: Return as soon as the headers are received, leaving the body to be read; the default is
+            False
+        :return obj: The requests.Response object
+        """
         # split report name where path includes sub paths, ie: "discovery/log"
         report_name_list = report_name.split('/')
         url = self._url(*report_name_list)
-        for key, value in kwargs.items():
-            data[key] = value
 
         try:
-            result = self._client.post(url, data=data)
+            return self._client.post(url, data=dict(data), stream=stream)
         except HTTPError as exc:
             status_code = exc.response.status_code
             if status_code == 400:
@@ -51,7 +66,62 @@ class Report(Endpoint):
                 raise ValueError(err_response["description"]) from exc
             raise exc
 
-        return result.json()
+    def get_windowed(self, report_name, start, end, **kwargs):
+        """Get a report for a long date range by splitting it into smaller windows fetched in parallel.
+
+        Each window is requested with its own "from" and "to" fields, at most *max_workers* at a time, and the rows
+        are yielded in date order.  A row already yielded for an earlier window (same *id_field* value) is skipped.
+
+        The windows are streamed: the requests are sent ahead, but each body is decoded one row at a time as it is
+        iterated over, so memory holds one row and the IDs seen rather than whole windows.  Up to twice *max_workers*
+        responses may be waiting to be read, each holding a connection open.
+
+        :param str report_name: Name of report based on the api url suffix (i.e. "ssl-certificates")
+        :param start: The first day of the range, as a date, datetime or ISO date string
+        :param end: The last day of the range, as a date, datetime or ISO date string
+        :param int window_days: The number of days in each window; the default is 30
+        :param int max_workers: The maximum number of windows fetched at the same time; the default is 4
+        :param str id_field: The row field identifying a certificate; the default is "id"
+        :param dict kwargs: Additional fields that will be passed to the API with each window
+
+        return iter: Yield the rows of all windows; an exception raised for a window stops the iteration
+        """
+        window_days = kwargs.pop("window_days", 30)
+        max_workers = kwargs.pop("max_workers", 4)
+        id_field = kwargs.pop("id_field", "id")
+
+        # Every response received, to close the ones not read if the iteration stops early
+        received = []
+
+        def fetch(window):
+            """Request the rows of one window, returning as soon as the headers are received."""
+            fields = dict(kwargs)
+            fields["from"], fields["to"] = window[0].isoformat(), window[1].isoformat()
+            result = self._post(report_name, fields, stream=True)
+            received.append(result)
+            return result
+
+        seen = set()
+        windows = _date_windows(_to_date(start), _to_date(end), window_days)
+        results = run_concurrently(fetch, windows, max_workers=max_workers, ordered=True)
+        try:
+            for window, result in results:
+                if isinstance(result, Exception):
+                    LOGGER.error("Report %s failed for %s to %s", report_name, window[0], window[1])
+                    raise result
+
+                for row in iter_response_items(result, key="reports"):
+                    row_id = row.get(id_field)
+                    if row_id is not None:
+                        if row_id in seen:
+                            continue
+                        seen.add(row_id)
+                    yield row
+        finally:
+            # Wait for the requests in flight, then release their connections
+            results.close()
+            for result in received:
+                result.close()
 
     # Commonly used re
     def get_ssl_certs(self, **kwargs):
@@ -64,6 +134,7 @@ class Report(Endpoint):
             "certificateStatus": Cert status(number): 0=Any,1=Requested,2=Issued,3=Revoked,4=Expired
             "organizationIds": Array of unique Org IDs to fiter search
            Other fields:  certificateRequestSource, serialNumberFormat, externalRequester
+        Pass stream=True to iterate over the rows instead of loading the whole report at once.
 
         return dict: The report data
         """
@@ -84,6 +155,7 @@ class Report(Endpoint):
             "certificateStatus": Cert status(number): 0=Any,2=Enrolled-downloaded,3=Revoked,4=Expired,
                                               5=Enrolled-Pending_download,6=not_enrolled
             "organizationIds": Array of unique Org IDs to fiter search
+        Pass stream=True to iterate over the rows instead of loading the whole report at once.
 
         return dict: The report data
         """
@@ -102,6 +174,7 @@ class Report(Endpoint):
             "certificateStatus": Cert status(number): 0=Any,2=Enrolled-downloaded,,3=Revoked,4=Expired,
                                    5=Enrolled-Pending_download, 6=not_enrolled
             "organizationIds": Array of unique Org IDs to fiter search
+        Pass stream=True to iterate over the rows instead of loading the whole report at once.
 
         return dict: The report data
         """
@@ -131,3 +204,24 @@ class Report(Endpoint):
         report_url = "domains"
 
         return self.get(report_url)
+
+
+def _to_date(value):
+    """Return a datetime.date from a date, datetime or ISO date string."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+
+    return date.fromisoformat(value[:10])
+
+
+def _date_windows(start, end, days):
+    """Yield consecutive (first day, last day) tuples of at most *days* days covering start to end inclusive."""
+    if days < 1:
+        raise ValueError("window_days must be at least 1")
+
+    while start <= end:
+        last = min(start + timedelta(days=days - 1), end)
+        yield start, last
+        start = last + timedelta(days=1)
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""Define the DNS resolvers used to check CNAME DCV challenges."""
+
+import abc
+import logging
+
+from ._cache import TTLCache
+from ._helpers import run_concurrently
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _normalize(name):
+    """Return a host name in lower case without its trailing dot."""
+    return name.rstrip(".").lower()
+
+
+class Resolver(abc.ABC):
+    """Act as a superclass for the resolvers: look up the CNAME records of host names.
+
+    Subclasses must implement *resolve_cname*, or they cannot be instantiated; *resolve_many* looks the hosts up one
+    after the other unless overridden.
+    """
+
+    @abc.abstractmethod
+    def resolve_cname(self, host):
+        """Return the target of the CNAME record of a host.
+
+        :param str host: The host name to look up
+        :return str: The CNAME target without its trailing dot, or None if the host has no CNAME record
+        :raises Exception: if the lookup failed (i.e. it timed out)
+        """
+        raise NotImplementedError
+
+    def resolve_many(self, hosts):
+        """Look up the CNAME records of many hosts.
+
+        :param iter hosts: The host names to look up
+        :return dict: For each host, the CNAME target, None if it has no CNAME record, or the exception raised by the
+            lookup
+        """
+        answers = {}
+        for host in hosts:
+            if host in answers:
+                continue
+            try:
+                answers[host] = self.resolve_cname(host)
+            except Exception as exc:  # pylint: disable=broad-except
+                answers[host] = exc
+
+        return answers
+
+
+class PyDNSResolver(Resolver):
+    """Look up CNAME records with pydns (the py3dns package), which is only imported when first used."""
+
+    def __init__(self, timeout=5, servers=None):
+        """Initialize the class.
+
+        :param float timeout: The number of seconds to wait for each answer; the default is 5
+        :param list servers: The addresses of the name servers to query; the default is None, which uses the servers
+            of the system
+        """
+        self.timeout = timeout
+        self.servers = servers
+
+    def resolve_cname(self, host):
+        """Return the target of the CNAME record of a host.
+
+        :param str host: The host name to look up
+        :return str: The CNAME target without its trailing dot, or None if the host has no CNAME record
+        :raises Exception: if the lookup failed (i.e. it timed out)
+        """
+        import DNS  # pylint: disable=import-outside-toplevel,import-error
+
+        kwargs = {"name": host, "qtype": "CNAME", "timeout": self.timeout}
+        if self.servers:
+            kwargs["server"] = list(self.servers)
+        elif not DNS.defaults["server"]:
+            DNS.DiscoverNameServers()
+
+        response = DNS.DnsRequest(**kwargs).req()
+        targets = [answer["data"] for answer in response.answers if answer.get("typename") == "CNAME"]
+
+        return targets[0].rstrip(".") if targets else None
+
+
+class ConcurrentResolver(Resolver):
+    """Look up many hosts at once with another resolver, remembering the hosts without a CNAME record for a while.
+
+    Duplicate hosts in a batch are only looked up once, and the lookups run on a pool of worker threads.  A host
+    found without a CNAME record is not looked up again for *negative_ttl* seconds; failed lookups are not
+    remembered.
+    """
+
+    def __init__(self, resolver=None, max_workers=32, negative_ttl=60):
+        """Initialize the class.
+
+        :param object resolver: The resolver making each lookup; the default is None, which uses a PyDNSResolver
+        :param int max_workers: The maximum number of lookups in flight; the default is 32
+        :param float negative_ttl: The number of seconds to remember a host has no CNAME record; the default is 60,
+            and 0 disables it
+        """
+        self.resolver = resolver if resolver is not None else PyDNSResolver()
+        self.max_workers = max_workers
+        self.__negative = TTLCache(ttl=negative_ttl)
+
+    def resolve_cname(self, host):
+        """Return the target of the CNAME record of a host.
+
+        :param str host: The host name to look up
+        :return str: The CNAME target without its trailing dot, or None if the host has no CNAME record
+        :raises Exception: if the lookup failed (i.e. it timed out)
+        """
+        key = (_normalize(host),)
+        target = self.__negative.get(key, lambda: self.resolver.resolve_cname(host))
+        if target is not None:
+            # Only the hosts without a record are remembered
+            self.__negative.discard(key)
+
+        return target
+
+    def resolve_many(self, hosts):
+        """Look up the CNAME records of many hosts concurrently.
+
+        :param iter hosts: The host names to look up
+        :return dict: For each host, the CNAME target, None if it has no CNAME record, or the exception raised by the
+            lookup
+        """
+        unique = list(dict.fromkeys(hosts))
+        answers = dict(run_concurrently(self.resolve_cname, unique, max_workers=self.max_workers))
+        LOGGER.debug("Resolved %s hosts, %s with a CNAME record", len(unique),
+                     sum(1 for target in answers.values() if isinstance(target, str)))
+
+        return answers
+
+    def clear(self):
+        """Forget the hosts remembered without a CNAME record."""
+        self.__negative.invalidate()
+
+
+class StubResolver(Resolver):
+    """Answer CNAME lookups from a dictionary, for tests and dry runs."""
+
+    def __init__(self, records=None):
+        """Initialize the class.
+
+        :param dict records: The CNAME targets keyed by host name; a target may be an exception to raise instead
+        """
+        self.__records = {}
+        self.queries = []
+        for host, target in (records or {}).items():
+            self.add(host, target)
+
+    def add(self, host, target):
+        """Set the CNAME target of a host.
+
+        :param str host: The host name
+        :param target: The CNAME target, None to remove the record, or an exception to raise when it is looked up
+        """
+        if target is None:
+            self.__records.pop(_normalize(host), None)
+        else:
+            self.__records[_normalize(host)] = target
+
+    def resolve_cname(self, host):
+        """Return the target of the CNAME record of a host.
+
+        :param str host: The host name to look up
+        :return str: The CNAME target without its trailing dot, or None if the host has no CNAME record
+        :raises Exception: if an exception was set as the target of the host
+        """
+        self.queries.append(host)
+        target = self.__records.get(_normalize(host))
+        if isinstance(target, Exception):
+            raise target
+
+        return target.rstrip(".") if target is not None else None
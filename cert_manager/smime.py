@@ -5,7 +5,8 @@ import logging
 from requests.exceptions import HTTPError
 
 from ._certificates import Certificates
-from ._helpers import Pending, Revoked, paginate, version_hack
+from ._helpers import Pending, Revoked, paginate, run_concurrently, version_hack
+from ._poller import IssuancePoller
 
 LOGGER = logging.getLogger(__name__)
 
@@ -73,6 +74,18 @@ class SMIME(Certificates):
         :param int timeout: request timeout
         :return dict: The orderNumber (Obsolete, backendCertId should be used instead) and backendCertId
         """
+        data = self._enroll_data(self.types, None, **kwargs)
+
+        return self._submit_enroll(data, **kwargs)
+
+    def _enroll_data(self, cert_types, validator, **kwargs):
+        """Validate the parameters of an enrollment and build the request body.
+
+        :param dict cert_types: The certificate types, as returned by *self.types*
+        :param object validator: The CustomFieldsValidator to use, or None to use *self.custom_fields_validator*
+        :param dict kwargs: The parameters passed to *enroll*
+        :return dict: The data to POST to the enroll endpoint
+        """
         # Retrieve all the arguments
         cert_type_name = kwargs.get("cert_type_name")
         csr = kwargs.get("csr")
@@ -85,16 +98,16 @@ class SMIME(Certificates):
         common_name = kwargs.get("common_name")
         term = kwargs.get("term")
         org_id = kwargs.get("org_id")
-        custom_fields = kwargs.get("custom_fields", [])
+        custom_fields_values = kwargs.get("custom_fields", [])
         eppn = kwargs.get("eppn")
         upn = kwargs.get("upn")
 
         # Make sure a valid certificate type name was provided
-        if cert_type_name not in self.types:
+        if cert_type_name not in cert_types:
             raise Exception(f"Incorrect certificate type specified: '{cert_type_name}'")
 
-        type_id = self.types[cert_type_name]["id"]
-        terms = self.types[cert_type_name]["terms"]
+        type_id = cert_types[cert_type_name]["id"]
+        terms = cert_types[cert_type_name]["terms"]
 
         # Make sure a valid term is specified
         if term not in terms:
@@ -105,9 +118,10 @@ class SMIME(Certificates):
                 f"Incorrect term specified: {term}.  Valid terms are {trm}."
             )
 
-        self._validate_custom_fields(custom_fields)
+        if validator is None:
+            validator = self.custom_fields_validator
+        validator.validate(custom_fields_values)
 
-        url = self._url("/enroll")
         data = {
             "orgId": org_id,
             "csr": csr.rstrip(),
@@ -123,10 +137,20 @@ class SMIME(Certificates):
             "eppn": eppn,
             "upn": upn,
         }
-        if custom_fields:
-            data["customFields"] = custom_fields
-        timeout = kwargs.pop("timeout", None)
-        result = self._client.post(url, data=data, timeout=timeout)
+        if custom_fields_values:
+            data["customFields"] = custom_fields_values
+
+        return data
+
+    def _submit_enroll(self, data, **kwargs):
+        """POST a validated enrollment request body.
+
+        :param dict data: The body built by *_enroll_data*
+        :param dict kwargs: The parameters passed to *enroll*, of which only *timeout* is used
+        :return dict: The enrollment result from the API
+        """
+        url = self._url("/enroll")
+        result = self._client.post(url, data=data, timeout=kwargs.get("timeout"))
 
         return result.json()
 
@@ -162,6 +186,39 @@ class SMIME(Certificates):
         # The certificate is ready for collection
         return result.content.decode(result.encoding)
 
+    def collect_many(self, cert_ids, cert_format=None, max_workers=10, timeout=None):
+        """Retrieve many existing client certificates from the API at the same time.
+
+        :param iter cert_ids: The Certificate IDs given on enroll success
+        :param str cert_format: Format for returned certificates, passed to *collect* as its output_format
+        :param int max_workers: The maximum number of requests in flight; the default is 10
+        :param int timeout: request timeout
+        :return iter: Yield (cert_id, result) tuples as each request completes, where result is the string
+            representing the certificate, or the exception raised (i.e. Pending or Revoked) for that certificate
+        """
+        return run_concurrently(
+            lambda cert_id: self.collect(cert_id, output_format=cert_format, timeout=timeout),
+            cert_ids,
+            max_workers=max_workers,
+        )
+
+    def wait_for_issuance(self, cert_ids, cert_format=None, **kwargs):
+        """Collect pending client certificates until they are issued, backing off on each certificate separately.
+
+        :param iter cert_ids: The Certificate IDs given on enroll success
+        :param str cert_format: Format for returned certificates, passed to *collect* as its output_format
+        :param dict kwargs: Any parameters accepted by cert_manager.IssuancePoller (initial_delay, max_delay, backoff,
+            max_rate, timeout, max_workers)
+        :return iter: Yield (cert_id, result) tuples as each certificate is issued, where result is the string
+            representing the certificate, or the exception raised for it (i.e. Revoked).  Certificates still pending
+            at the timeout are yielded with a Pending exception.
+        """
+        poller = IssuancePoller(lambda cert_id: self.collect(cert_id, output_format=cert_format), **kwargs)
+        for cert_id in cert_ids:
+            poller.add(cert_id)
+
+        return poller.poll()
+
     @version_hack(service="smime", version="v2")
     def replace(self, **kwargs):
         """Replace a pre-existing client certificate.
@@ -29,6 +29,9 @@ class SSL(Certificates):
         referenced at:
         https://sectigo.com/uploads/audio/Certificate-Manager-20.1-Rest-API.html#resource-SSL-list
 
+        To fetch several pages concurrently, pass `prefetch` with the number of pages to keep in flight.  Passing
+        `total=True` as well uses *count* to avoid requesting pages past the last certificate.
+
         :param dict kwargs: A dictionary of arguments to pass to the API
 
         :return iter: An iterator object is returned to cycle through the certificates
@@ -0,0 +1,855 @@
+# -*- coding: utf-8 -*-
+"""Define an in-memory stand-in for the Sectigo Cert Manager API, for load and integration tests.
+
+The Simulator class is a WSGI application implementing the endpoints called by this library, backed by dictionaries
+instead of a real account.  It can also run itself on a local HTTP/1.1 server (with keep-alive, like the real API) in
+a background thread, so a Client can be pointed at it to benchmark throughput without touching production.
+
+It is test scaffolding, shipped with the tests and the benchmarks rather than with the cert_manager package.
+"""
+
+import base64
+import io
+import json
+import logging
+import random
+import re
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote
+
+LOGGER = logging.getLogger(__name__)
+
+# The error codes returned by the API when collecting certificates, see cert_manager._helpers.Pending and Revoked
+PENDING_CODE = -183
+REVOKED_CODE = -192
+
+REASONS = {
+    200: "OK", 201: "Created", 204: "No Content", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+    405: "Method Not Allowed", 429: "Too Many Requests", 500: "Internal Server Error", 502: "Bad Gateway",
+    503: "Service Unavailable", 504: "Gateway Timeout",
+}
+
+DEFAULT_TYPES = {
+    "ssl": [
+        {"id": 224, "name": "InCommon SSL (SHA-2)", "terms": [365, 730]},
+        {"id": 227, "name": "InCommon Multi Domain SSL (SHA-2)", "terms": [365, 730]},
+        {"id": 228, "name": "InCommon Wildcard SSL Certificate (SHA-2)", "terms": [365, 730]},
+    ],
+    "smime": [
+        {"id": 301, "name": "InCommon Client Certificate", "terms": [365, 730, 1095]},
+    ],
+}
+
+# The parameters of list requests which are not filters
+PAGING_PARAMS = ("size", "position")
+
+
+class _Response:  # pylint: disable=too-few-public-methods
+    """Hold the status, body and extra headers of a simulated response."""
+
+    def __init__(self, status=200, body=None, headers=None):
+        """Initialize the class.
+
+        :param int status: The HTTP status code
+        :param body: A dictionary or list sent as JSON, a string sent as plain text, or None for an empty body
+        :param dict headers: Any extra headers to send
+        """
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+
+def _error(status, code, description):
+    """Return an API error response."""
+    return _Response(status, {"code": code, "description": description})
+
+
+class _Request:  # pylint: disable=too-few-public-methods
+    """Hold the parts of a request used by the endpoint handlers."""
+
+    def __init__(self, method, path, params, body, location):
+        """Initialize the class.
+
+        :param str method: The HTTP method
+        :param str path: The URL path without the simulator prefix
+        :param dict params: The query string parameters (the first value of each)
+        :param body: The decoded JSON body, or None
+        :param str location: The URL of the simulator prefix, used to build Location headers
+        """
+        self.method = method
+        self.path = path
+        self.params = params
+        self.body = body if body is not None else {}
+        self.location = location
+        self.match = None
+
+
+class Simulator:  # pylint: disable=too-many-instance-attributes,too-many-public-methods
+    """Simulate the Sectigo Cert Manager API in memory.
+
+    Lists are paginated with the "size" and "position" parameters and send an X-Total-Count header, created objects
+    are returned with a Location header, and collecting a certificate answers with the pending error code until it
+    has been polled *pending_polls* times (or the revoked error code once it is revoked).
+
+    Every response can be delayed by *latency* seconds and failed at random with *error_rate*; *add_fault* injects
+    errors for chosen requests.
+
+    Requests are answered concurrently.  The stored objects are replaced instead of changed in place, so the handlers
+    only hold the lock to look up and store objects, and copy or filter them without it.
+    """
+
+    def __init__(self, **kwargs):
+        """Initialize the class.
+
+        :param str prefix: The URL path the API is served under; the default is "/api"
+        :param latency: The seconds to wait before each response, as a number or a (minimum, maximum) tuple of a
+            uniform random range; the default is 0
+        :param float error_rate: The probability of failing a request with *error_status*; the default is 0
+        :param int error_status: The HTTP status of random failures; the default is 503
+        :param int pending_polls: The number of times a new certificate is reported as pending when collected; the
+            default is 0
+        :param int max_page_size: The largest page returned by list endpoints; the default is 200
+        :param list custom_fields: The custom fields defined for the account; the default is none
+        :param int seed: The seed of the random generator used for latency and errors
+        :param int ssl_certs: The number of SSL certificates to create up front; the default is 0
+        :param int smime_certs: The number of S/MIME certificates to create up front; the default is 0
+        :param int domains: The number of domains to create up front; the default is 0
+        """
+        prefix = kwargs.get("prefix", "/api").strip("/")
+        self.prefix = f"/{prefix}" if prefix else ""
+        self.latency = kwargs.get("latency", 0)
+        self.error_rate = kwargs.get("error_rate", 0.0)
+        self.error_status = kwargs.get("error_status", 503)
+        self.pending_polls = kwargs.get("pending_polls", 0)
+        self.max_page_size = kwargs.get("max_page_size", 200)
+
+        self.__random = random.Random(kwargs.get("seed"))
+        self.__lock = threading.RLock()
+        self.__faults = []
+        self.__counts = {}
+        self.__server = None
+        self.__thread = None
+
+        self.__types = {kind: list(types) for kind, types in DEFAULT_TYPES.items()}
+        self.__custom_fields = {kind: list(kwargs.get("custom_fields", [])) for kind in DEFAULT_TYPES}
+        self.__next_id = 1000
+        self.__data = {
+            "ssl": {}, "smime": {}, "domain": {}, "acme": {}, "person": {}, "admin": {},
+            "organization": {1: {"id": 1, "name": "Example Org", "departments": []}},
+        }
+
+        for _ in range(kwargs.get("ssl_certs", 0)):
+            self._new_cert("ssl", self.__types["ssl"][0], 365, 1, status="Issued")
+        for _ in range(kwargs.get("smime_certs", 0)):
+            self._new_cert("smime", self.__types["smime"][0], 365, 1, status="Issued")
+        for index in range(kwargs.get("domains", 0)):
+            self.add("domain", {"name": f"domain{index}.example.com"})
+
+        self.__routes = [(method, re.compile(pattern), handler, extra) for method, pattern, handler, extra in [
+            ("GET", r"^/ssl/v1$", self._list, {"kind": "ssl"}),
+            ("HEAD", r"^/ssl/v1$", self._list, {"kind": "ssl"}),
+            ("GET", r"^/(?P<kind>ssl|smime)/v1/types$", self._types, {}),
+            ("GET", r"^/(?P<kind>ssl|smime)/v1/customFields$", self._custom_fields_list, {}),
+            ("POST", r"^/(?P<kind>ssl|smime)/v1/enroll$", self._enroll, {}),
+            ("GET", r"^/ssl/v1/collect/(?P<cert_id>\d+)/(?P<cert_format>\w+)$", self._collect, {"kind": "ssl"}),
+            ("GET", r"^/ssl/v1/(?P<item_id>\d+)$", self._get, {"kind": "ssl"}),
+            ("POST", r"^/ssl/v1/renewById/(?P<key>\d+)$", self._renew, {"kind": "ssl", "by": "id"}),
+            ("POST", r"^/ssl/v1/replace/(?P<key>\d+)$", self._replace, {"kind": "ssl"}),
+            ("POST", r"^/ssl/v1/revoke/(?P<key>\d+)$", self._revoke, {"kind": "ssl", "by": "id"}),
+            ("GET", r"^/smime/v2$", self._list, {"kind": "smime"}),
+            ("GET", r"^/smime/v2/byPersonEmail/(?P<email>[^/]+)$", self._smime_by_email, {}),
+            ("GET", r"^/smime/v1/collect/(?P<cert_id>\d+)$", self._collect, {"kind": "smime"}),
+            ("POST", r"^/smime/v2/replace/order/(?P<key>\d+)$", self._replace, {"kind": "smime"}),
+            ("POST", r"^/smime/v2/renew/(?P<by>order|serial)/(?P<key>[^/]+)$", self._renew, {"kind": "smime"}),
+            ("POST", r"^/smime/v1/revoke/(?P<by>order|serial)/(?P<key>[^/]+)$", self._revoke, {"kind": "smime"}),
+            ("POST", r"^/smime/v1/revoke$", self._smime_revoke_email, {}),
+            ("GET", r"^/domain/v1$", self._list, {"kind": "domain"}),
+            ("POST", r"^/domain/v1$", self._create, {"kind": "domain"}),
+            ("GET", r"^/domain/v1/count$", self._count, {"kind": "domain"}),
+            ("GET", r"^/domain/v1/(?P<item_id>\d+)$", self._get, {"kind": "domain"}),
+            ("DELETE", r"^/domain/v1/(?P<item_id>\d+)$", self._delete, {"kind": "domain"}),
+            ("PUT", r"^/domain/v1/(?P<item_id>\d+)/(?P<state>activate|suspend)$", self._domain_state, {}),
+            ("POST", r"^/domain/v1/(?P<item_id>\d+)/delegation$", self._delegation, {"action": "add"}),
+            ("DELETE", r"^/domain/v1/(?P<item_id>\d+)/delegation$", self._delegation, {"action": "remove"}),
+            ("POST", r"^/domain/v1/(?P<item_id>\d+)/delegation/(?P<action>approve|reject)$", self._delegation, {}),
+            ("GET", r"^/dcv/v2/validation$", self._dcv_list, {}),
+            ("POST", r"^/dcv/v2/validation/status$", self._dcv_status, {}),
+            ("POST", r"^/dcv/v2/validation/start/domain/(?P<method>\w+)$", self._dcv_start, {}),
+            ("POST", r"^/dcv/v2/validation/submit/domain/(?P<method>\w+)$", self._dcv_submit, {}),
+            ("POST", r"^/dcv/v2/validation/clear$", self._dcv_clear, {}),
+            ("GET", r"^/acme/v2/account$", self._list, {"kind": "acme"}),
+            ("POST", r"^/acme/v2/account$", self._create, {"kind": "acme"}),
+            ("GET", r"^/acme/v2/account/(?P<item_id>\d+)$", self._get, {"kind": "acme"}),
+            ("PUT", r"^/acme/v2/account/(?P<item_id>\d+)$", self._update, {"kind": "acme"}),
+            ("DELETE", r"^/acme/v2/account/(?P<item_id>\d+)$", self._delete, {"kind": "acme"}),
+            ("GET", r"^/acme/v2/account/(?P<item_id>\d+)/domains?$", self._acme_domains, {}),
+            ("POST", r"^/acme/v2/account/(?P<item_id>\d+)/domains?$", self._acme_domains, {}),
+            ("DELETE", r"^/acme/v2/account/(?P<item_id>\d+)/domains?$", self._acme_domains, {}),
+            ("GET", r"^/person/v1$", self._list, {"kind": "person"}),
+            ("POST", r"^/person/v1$", self._create, {"kind": "person"}),
+            ("GET", r"^/person/v1/id/byEmail/(?P<email>[^/]+)$", self._person_by_email, {}),
+            ("GET", r"^/person/v1/(?P<item_id>\d+)$", self._get, {"kind": "person"}),
+            ("PUT", r"^/person/v1/(?P<item_id>\d+)$", self._update, {"kind": "person"}),
+            ("DELETE", r"^/person/v1/(?P<item_id>\d+)$", self._delete, {"kind": "person"}),
+            ("GET", r"^/organization/v1$", self._all, {"kind": "organization"}),
+            ("GET", r"^/admin/v1$", self._all, {"kind": "admin"}),
+            ("POST", r"^/admin/v1$", self._create, {"kind": "admin"}),
+            ("GET", r"^/admin/v1/idp$", self._admin_idp, {}),
+            ("GET", r"^/admin/v1/(?P<item_id>\d+)$", self._get, {"kind": "admin"}),
+            ("PUT", r"^/admin/v1/(?P<item_id>\d+)$", self._update, {"kind": "admin"}),
+            ("DELETE", r"^/admin/v1/(?P<item_id>\d+)$", self._delete, {"kind": "admin"}),
+            ("POST", r"^/report/v1/(?P<name>.+)$", self._report, {}),
+        ]]
+
+    @property
+    def base_url(self):
+        """Return the base URL to pass to a Client while the simulator is running, or None."""
+        if self.__server is None:
+            return None
+
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}{self.prefix}"
+
+    @property
+    def counts(self):
+        """Return the number of requests received for each "METHOD path"."""
+        with self.__lock:
+            return dict(self.__counts)
+
+    def add(self, kind, record):
+        """Store an object, as if it was created through the API.
+
+        :param str kind: The kind of object ("ssl", "smime", "domain", "acme", "person", "admin" or "organization")
+        :param dict record: The object fields; an "id" is added unless present
+        :return int: The ID of the object
+        """
+        with self.__lock:
+            record = dict(record)
+            if "id" not in record:
+                record["id"] = self._new_id()
+            if kind == "domain":
+                record.setdefault("state", "ACTIVE")
+                record.setdefault("delegations", [])
+                record.setdefault("dcvStatus", "NOT_VALIDATED")
+                record.setdefault("dcvOrderStatus", "NOT_INITIATED")
+            self.__data[kind][record["id"]] = record
+
+            return record["id"]
+
+    def get(self, kind, item_id):
+        """Return a copy of a stored object, or None if there is no such object."""
+        with self.__lock:
+            record = self.__data[kind].get(int(item_id))
+
+            return dict(record) if record is not None else None
+
+    def add_fault(self, path, status=500, **kwargs):
+        """Fail the requests whose path matches a pattern.
+
+        :param str path: A regular expression searched in the URL path, without the simulator prefix
+        :param int status: The HTTP status to answer with; the default is 500
+        :param str method: Only fail requests with this HTTP method; the default is any method
+        :param int count: The number of requests to fail before the fault is removed; the default is None, which
+            fails every matching request
+        :param dict body: The JSON error body; the default is an API error with code -1
+        :param dict headers: Any headers to add to the response, i.e. Retry-After
+        :param float delay: Extra seconds to wait before answering; the default is 0
+        """
+        fault = {
+            "path": re.compile(path), "status": status, "method": kwargs.get("method"), "count": kwargs.get("count"),
+            "body": kwargs.get("body"), "headers": kwargs.get("headers"), "delay": kwargs.get("delay", 0),
+        }
+        with self.__lock:
+            self.__faults.append(fault)
+
+    def clear_faults(self):
+        """Remove all the faults added with *add_fault*."""
+        with self.__lock:
+            self.__faults = []
+
+    def start(self, host="127.0.0.1", port=0):
+        """Serve the simulator over HTTP from a background thread.
+
+        :param str host: The address to listen on; the default is "127.0.0.1"
+        :param int port: The port to listen on; the default is 0, which picks a free port
+        :return str: The base URL to pass to a Client
+        """
+        if self.__server is not None:
+            raise RuntimeError("The simulator is already running")
+
+        self.__server = ThreadingHTTPServer((host, port), _handler_class(self))
+        self.__server.daemon_threads = True
+        # A short poll interval so stop() does not wait for long
+        self.__thread = threading.Thread(
+            target=self.__server.serve_forever, kwargs={"poll_interval": 0.05}, name="cert-manager-simulator"
+        )
+        self.__thread.daemon = True
+        self.__thread.start()
+        LOGGER.debug("Simulator listening on %s", self.base_url)
+
+        return self.base_url
+
+    def stop(self):
+        """Stop serving the simulator over HTTP."""
+        if self.__server is None:
+            return
+
+        self.__server.shutdown()
+        self.__server.server_close()
+        self.__thread.join()
+        self.__server = None
+        self.__thread = None
+
+    def __enter__(self):
+        """Start serving over HTTP when entering a with block."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        """Stop serving over HTTP when leaving a with block."""
+        self.stop()
+
+    def __call__(self, environ, start_response):
+        """Answer a request as a WSGI application."""
+        method = environ["REQUEST_METHOD"]
+        path = unquote(environ.get("PATH_INFO", ""))
+        host = environ.get("HTTP_HOST") or f"{environ.get('SERVER_NAME')}:{environ.get('SERVER_PORT')}"
+
+        body = None
+        length = environ.get("CONTENT_LENGTH")
+        if length and int(length) > 0:
+            raw = environ["wsgi.input"].read(int(length))
+            try:
+                body = json.loads(raw.decode("utf-8"))
+            except ValueError:
+                body = None
+
+        params = {key: values[0] for key, values in parse_qs(environ.get("QUERY_STRING", "")).items()}
+        location = f"{environ.get('wsgi.url_scheme', 'http')}://{host}{self.prefix}"
+        request = _Request(method, path, params, body, location)
+        response = self.handle(request)
+
+        if isinstance(response.body, (dict, list)):
+            payload = json.dumps(response.body).encode("utf-8")
+            content_type = "application/json"
+        elif response.body is not None:
+            payload = str(response.body).encode("utf-8")
+            content_type = "text/plain; charset=utf-8"
+        else:
+            payload = b""
+            content_type = None
+
+        headers = [("Content-Length", str(len(payload)))]
+        if content_type:
+            headers.append(("Content-Type", content_type))
+        headers.extend((key, str(value)) for key, value in response.headers.items())
+        start_response(f"{response.status} {REASONS.get(response.status, 'Unknown')}", headers)
+
+        return [payload] if method != "HEAD" else [b""]
+
+    def handle(self, request):
+        """Route a request to its endpoint handler, applying the latency and the injected errors.
+
+        :param object request: The _Request to answer
+        :return object: The _Response
+        """
+        if not request.path.startswith(self.prefix):
+            return _error(404, -1, f"Unknown path {request.path}")
+        path = request.path[len(self.prefix):].rstrip("/")
+        request.path = path
+
+        self._sleep(self.latency)
+
+        with self.__lock:
+            key = f"{request.method} {path}"
+            self.__counts[key] = self.__counts.get(key, 0) + 1
+            fault = self._take_fault(request.method, path)
+            failed = fault is None and self.error_rate and self.__random.random() < self.error_rate
+
+        if fault is not None:
+            self._sleep(fault["delay"])
+            body = fault["body"] if fault["body"] is not None else {"code": -1, "description": "Injected fault"}
+            return _Response(fault["status"], body, fault["headers"])
+        if failed:
+            return _error(self.error_status, -1, "Injected random failure")
+
+        allowed = False
+        for method, pattern, handler, extra in self.__routes:
+            match = pattern.match(path)
+            if not match:
+                continue
+            allowed = True
+            if method != request.method:
+                continue
+            request.match = dict(extra)
+            request.match.update({key: value for key, value in match.groupdict().items() if value is not None})
+            return handler(request)
+
+        if allowed:
+            return _error(405, -1, f"Method {request.method} not allowed on {path}")
+        return _error(404, -1, f"Unknown path {path}")
+
+    def _sleep(self, latency):
+        """Wait for a number of seconds, or a random number of seconds in a (minimum, maximum) range."""
+        if isinstance(latency, (tuple, list)):
+            with self.__lock:
+                latency = self.__random.uniform(*latency)
+        if latency:
+            time.sleep(latency)
+
+    def _take_fault(self, method, path):
+        """Return the first fault matching a request, counting it down."""
+        for fault in self.__faults:
+            if fault["method"] not in (None, method) or not fault["path"].search(path):
+                continue
+            if fault["count"] is not None:
+                fault["count"] -= 1
+                if fault["count"] <= 0:
+                    self.__faults.remove(fault)
+            return fault
+
+        return None
+
+    def _new_id(self):
+        """Return a new object ID."""
+        self.__next_id += 1
+        return self.__next_id
+
+    def _new_cert(self, kind, cert_type, term, org_id, **fields):  # pylint: disable=too-many-arguments
+        """Store a new certificate and return it."""
+        with self.__lock:
+            cert_id = self._new_id()
+        today = date.today()
+        record = {
+            "id": cert_id, "orgId": org_id, "certType": {"id": cert_type["id"], "name": cert_type["name"]},
+            "term": term, "status": fields.pop("status", "Applied"), "serialNumber": f"{cert_id:032X}",
+            "requested": today.isoformat(), "expires": (today + timedelta(days=term)).isoformat(), "polls": 0,
+        }
+        if kind == "ssl":
+            record["sslId"] = cert_id
+            record.setdefault("commonName", f"host{cert_id}.example.com")
+        else:
+            record["orderNumber"] = cert_id
+            record["backendCertId"] = str(cert_id)
+            record.setdefault("email", f"user{cert_id}@example.com")
+        record.update(fields)
+
+        return self._store(kind, record)
+
+    def _store(self, kind, record):
+        """Store a new or changed object, replacing the one with the same ID, and return it."""
+        with self.__lock:
+            self.__data[kind][record["id"]] = record
+
+        return record
+
+    def _records(self, kind):
+        """Return a list of the stored objects of a kind, which is not changed by later requests."""
+        with self.__lock:
+            return list(self.__data[kind].values())
+
+    @staticmethod
+    def _public(record):
+        """Return an object without the fields only used by the simulator."""
+        return {key: value for key, value in record.items() if key != "polls"}
+
+    def _filtered(self, kind, params):
+        """Return the objects of a kind whose fields match all the filtering parameters."""
+        filters = {key: value for key, value in params.items() if key not in PAGING_PARAMS}
+        records = []
+        for record in self._records(kind):
+            if all(str(record.get(key)) == value for key, value in filters.items() if key in record):
+                records.append(self._public(record))
+
+        return records
+
+    def _page(self, records, params):
+        """Return a page of objects with the X-Total-Count header."""
+        try:
+            position = max(int(params.get("position", 0)), 0)
+            size = min(max(int(params.get("size", self.max_page_size)), 0), self.max_page_size)
+        except ValueError:
+            return _error(400, -1, "size and position must be numbers")
+
+        return _Response(200, records[position:position + size], {"X-Total-Count": len(records)})
+
+    def _find(self, kind, item_id):
+        """Return a stored object by ID, or None."""
+        try:
+            item_id = int(item_id)
+        except ValueError:
+            return None
+
+        with self.__lock:
+            return self.__data[kind].get(item_id)
+
+    def _find_cert(self, kind, by, key):
+        """Return a certificate by ID, order number or serial number, or None."""
+        if by == "serial":
+            return next((cert for cert in self._records(kind) if cert["serialNumber"] == key.upper()), None)
+
+        return self._find(kind, key)
+
+    # The generic handlers
+
+    def _list(self, request):
+        """List the objects of a kind, one page at a time."""
+        return self._page(self._filtered(request.match["kind"], request.params), request.params)
+
+    def _all(self, request):
+        """List all the objects of a kind."""
+        return _Response(200, self._filtered(request.match["kind"], request.params))
+
+    def _count(self, request):
+        """Count the objects of a kind."""
+        return _Response(200, {"count": len(self._filtered(request.match["kind"], request.params))})
+
+    def _get(self, request):
+        """Return an object."""
+        record = self._find(request.match["kind"], request.match["item_id"])
+        if record is None:
+            return _error(404, -1, f"{request.match['kind']} {request.match['item_id']} not found")
+
+        return _Response(200, self._public(record))
+
+    def _create(self, request):
+        """Create an object and point to it with the Location header."""
+        kind = request.match["kind"]
+        with self.__lock:
+            names = (domain["name"] for domain in self.__data[kind].values()) if kind == "domain" else ()
+            if request.body.get("name") in names:
+                return _error(400, -1, f"Domain {request.body.get('name')} already exists")
+
+            item_id = self.add(kind, request.body)
+        collection = {"acme": "acme/v2/account", "person": "person/v1"}.get(kind, f"{kind}/v1")
+
+        return _Response(201, None, {"Location": f"{request.location}/{collection}/{item_id}"})
+
+    def _update(self, request):
+        """Update the fields of an object."""
+        with self.__lock:
+            record = self._find(request.match["kind"], request.match["item_id"])
+            if record is None:
+                return _error(404, -1, f"{request.match['kind']} {request.match['item_id']} not found")
+            self._store(request.match["kind"], dict(record, **{
+                key: value for key, value in request.body.items() if key != "id"
+            }))
+
+        return _Response(200)
+
+    def _delete(self, request):
+        """Delete an object."""
+        with self.__lock:
+            record = self.__data[request.match["kind"]].pop(int(request.match["item_id"]), None)
+        if record is None:
+            return _error(404, -1, f"{request.match['kind']} {request.match['item_id']} not found")
+
+        return _Response(204)
+
+    # The certificate handlers
+
+    def _types(self, request):
+        """List the certificate types."""
+        return _Response(200, self.__types[request.match["kind"]])
+
+    def _custom_fields_list(self, request):
+        """List the custom fields."""
+        return _Response(200, self.__custom_fields[request.match["kind"]])
+
+    def _enroll(self, request):
+        """Enroll a certificate, which will be pending for *pending_polls* collections."""
+        kind = request.match["kind"]
+        body = request.body
+        cert_type = next((item for item in self.__types[kind] if item["id"] == body.get("certType")), None)
+        if cert_type is None:
+            return _error(400, -1, f"Unknown certificate type {body.get('certType')}")
+        if body.get("term") not in cert_type["terms"]:
+            return _error(400, -1, f"Invalid term {body.get('term')}")
+
+        fields = {"status": "Issued" if self.pending_polls <= 0 else "Applied"}
+        if kind == "smime" and body.get("email"):
+            fields["email"] = body["email"]
+        cert = self._new_cert(kind, cert_type, body["term"], body.get("orgId"), **fields)
+
+        if kind == "ssl":
+            return _Response(200, {"renewId": f"renew{cert['id']}", "sslId": cert["id"]})
+        return _Response(200, {"orderNumber": cert["orderNumber"], "backendCertId": cert["backendCertId"]})
+
+    def _collect(self, request):
+        """Return a certificate, or the pending or revoked error code."""
+        with self.__lock:
+            cert = self._find(request.match["kind"], request.match["cert_id"])
+            if cert is None:
+                return _error(404, -1, f"Certificate {request.match['cert_id']} not found")
+            if cert["status"] == "Revoked":
+                return _error(400, REVOKED_CODE, "Certificate has been revoked")
+
+            cert = dict(cert, polls=cert["polls"] + 1)
+            if cert["status"] != "Issued" and cert["polls"] > self.pending_polls:
+                cert["status"] = "Issued"
+            self._store(request.match["kind"], cert)
+        if cert["status"] != "Issued":
+            return _error(400, PENDING_CODE, "Being processed by Sectigo")
+
+        encoded = base64.b64encode(f"{cert['id']}:{cert['serialNumber']}".encode("ascii")).decode("ascii")
+        return _Response(200, f"-----BEGIN CERTIFICATE-----\n{encoded}\n-----END CERTIFICATE-----\n")
+
+    def _renew(self, request):
+        """Renew a certificate as a new certificate of the same type."""
+        kind = request.match["kind"]
+        cert = self._find_cert(kind, request.match["by"], request.match["key"])
+        if cert is None:
+            return _error(404, -1, f"Certificate {request.match['key']} not found")
+
+        cert_type = {"id": cert["certType"]["id"], "name": cert["certType"]["name"]}
+        fields = {"email": cert["email"]} if kind == "smime" else {"commonName": cert["commonName"]}
+        renewed = self._new_cert(kind, cert_type, cert["term"], cert["orgId"], **fields)
+
+        if kind == "ssl":
+            return _Response(200, {"renewId": f"renew{renewed['id']}"})
+        return _Response(200, {"orderNumber": renewed["orderNumber"], "backendCertId": renewed["backendCertId"]})
+
+    def _replace(self, request):
+        """Replace a certificate, making it pending again."""
+        with self.__lock:
+            cert = self._find(request.match["kind"], request.match["key"])
+            if cert is None:
+                return _error(404, -1, f"Certificate {request.match['key']} not found")
+            status = "Issued" if self.pending_polls <= 0 else "Applied"
+            self._store(request.match["kind"], dict(cert, status=status, polls=0))
+
+        return _Response(204)
+
+    def _revoke(self, request):
+        """Revoke a certificate."""
+        with self.__lock:
+            cert = self._find_cert(request.match["kind"], request.match["by"], request.match["key"])
+            if cert is None:
+                return _error(404, -1, f"Certificate {request.match['key']} not found")
+            self._store(request.match["kind"], dict(cert, status="Revoked"))
+
+        return _Response(204)
+
+    def _smime_by_email(self, request):
+        """List the S/MIME certificates of a person."""
+        return _Response(200, self._filtered("smime", {"email": request.match["email"]}))
+
+    def _smime_revoke_email(self, request):
+        """Revoke all the S/MIME certificates of a person."""
+        with self.__lock:
+            for cert in self._records("smime"):
+                if cert.get("email") == request.body.get("email"):
+                    self._store("smime", dict(cert, status="Revoked"))
+
+        return _Response(204)
+
+    # The domain and DCV handlers
+
+    def _domain_state(self, request):
+        """Activate or suspend a domain."""
+        with self.__lock:
+            domain = self._find("domain", request.match["item_id"])
+            if domain is None:
+                return _error(404, -1, f"Domain {request.match['item_id']} not found")
+            state = "ACTIVE" if request.match["state"] == "activate" else "SUSPENDED"
+            self._store("domain", dict(domain, state=state))
+
+        return _Response(200)
+
+    def _delegation(self, request):
+        """Add, remove, approve or reject the delegation of a domain to an organization."""
+        org_id = request.body.get("orgId")
+        action = request.match["action"]
+        with self.__lock:
+            domain = self._find("domain", request.match["item_id"])
+            if domain is None:
+                return _error(404, -1, f"Domain {request.match['item_id']} not found")
+
+            others = [item for item in domain["delegations"] if item["orgId"] != org_id]
+            if action == "add":
+                others.append({"orgId": org_id, "certTypes": request.body.get("certTypes", []), "status": "REQUESTED"})
+            elif action in ("approve", "reject"):
+                others.append({"orgId": org_id, "status": "ACTIVE" if action == "approve" else "REJECTED"})
+            self._store("domain", dict(domain, delegations=others))
+
+        return _Response(200)
+
+    def _dcv_domain(self, request):
+        """Return the domain named in a DCV request, or None."""
+        name = request.body.get("domain")
+        return next((domain for domain in self._records("domain") if domain["name"] == name), None)
+
+    def _dcv_list(self, request):
+        """List the DCV status of the domains."""
+        rows = [{
+            "domain": domain["name"], "dcvStatus": domain["dcvStatus"], "dcvOrderStatus": domain["dcvOrderStatus"],
+            "dcvMethod": domain.get("dcvMethod"), "expirationDate": domain.get("dcvExpirationDate"),
+        } for domain in self._records("domain")]
+        if request.params.get("domain"):
+            rows = [row for row in rows if request.params["domain"] in row["domain"]]
+        if request.params.get("dcvStatus"):
+            rows = [row for row in rows if row["dcvStatus"] == request.params["dcvStatus"]]
+
+        return self._page(rows, request.params)
+
+    def _dcv_status(self, request):
+        """Return the DCV status of a domain."""
+        domain = self._dcv_domain(request)
+        if domain is None:
+            return _error(400, -1, f"Domain {request.body.get('domain')} not found")
+
+        return _Response(200, {
+            "status": domain["dcvStatus"], "orderStatus": domain["dcvOrderStatus"],
+            "expirationDate": domain.get("dcvExpirationDate"),
+        })
+
+    def _dcv_start(self, request):
+        """Start the DCV of a domain, returning what must be published."""
+        method = request.match["method"]
+        with self.__lock:
+            domain = self._dcv_domain(request)
+            if domain is None:
+                return _error(400, -1, f"Domain {request.body.get('domain')} not found")
+            self._store("domain", dict(domain, dcvMethod=method.upper(), dcvOrderStatus="INITIATED"))
+
+        token = f"{domain['id']:032x}"
+        if method == "cname":
+            return _Response(200, {"host": f"_{token}.{domain['name']}.", "point": f"{token}.dcv.example.com."})
+        if method in ("http", "https"):
+            return _Response(200, {
+                "url": f"{method}://{domain['name']}/.well-known/pki-validation/{token}.txt",
+                "firstLine": token, "secondLine": "sectigo.com",
+            })
+        if method == "email":
+            return _Response(200, {"emails": [f"admin@{domain['name']}", f"hostmaster@{domain['name']}"]})
+
+        return _error(400, -1, f"Unknown DCV method {method}")
+
+    def _dcv_submit(self, request):
+        """Submit the DCV of a domain, which is always validated."""
+        expires = (date.today() + timedelta(days=365)).isoformat()
+        with self.__lock:
+            domain = self._dcv_domain(request)
+            if domain is None:
+                return _error(400, -1, f"Domain {request.body.get('domain')} not found")
+            if domain["dcvOrderStatus"] == "NOT_INITIATED":
+                return _error(400, -1, f"DCV of {domain['name']} was not started")
+            self._store("domain", dict(
+                domain, dcvStatus="VALIDATED", dcvOrderStatus="SUBMITTED", dcvExpirationDate=expires
+            ))
+
+        return _Response(200, {"status": "VALIDATED", "orderStatus": "SUBMITTED", "message": ""})
+
+    def _dcv_clear(self, request):
+        """Clear the DCV of a domain."""
+        with self.__lock:
+            domain = self._dcv_domain(request)
+            if domain is None:
+                return _error(400, -1, f"Domain {request.body.get('domain')} not found")
+            domain = dict(domain, dcvStatus="NOT_VALIDATED", dcvOrderStatus="NOT_INITIATED")
+            domain.pop("dcvExpirationDate", None)
+            self._store("domain", domain)
+
+        return _Response(200, {"status": "NOT_VALIDATED", "orderStatus": "NOT_INITIATED", "message": ""})
+
+    # The other handlers
+
+    def _acme_domains(self, request):
+        """List, add or remove the domains of an ACME account."""
+        requested = [item.get("name") for item in request.body.get("domains", [])]
+        with self.__lock:
+            account = self._find("acme", request.match["item_id"])
+            if account is None:
+                return _error(404, -1, f"ACME account {request.match['item_id']} not found")
+
+            names = account.get("domains", [])
+            if request.method == "POST":
+                self._store("acme", dict(account, domains=names + [name for name in requested if name not in names]))
+                return _Response(200, {"notAddedDomains": []})
+            if request.method == "DELETE":
+                missing = [name for name in requested if name not in names]
+                self._store("acme", dict(account, domains=[name for name in names if name not in requested]))
+                return _Response(200, {"notRemovedDomains": missing})
+
+        return self._page([{"name": name} for name in names], request.params)
+
+    def _person_by_email(self, request):
+        """Return the ID of a person."""
+        person = next(
+            (item for item in self._records("person") if item.get("email") == request.match["email"]), None
+        )
+        if person is None:
+            return _error(404, -1, f"Person {request.match['email']} not found")
+
+        return _Response(200, {"personId": person["id"]})
+
+    @staticmethod
+    def _admin_idp(request):  # pylint: disable=unused-argument
+        """List the identity providers."""
+        return _Response(200, [{"id": 1, "name": "Local"}])
+
+    def _report(self, request):
+        """Return a report of the SSL or S/MIME certificates, optionally requested within a date range."""
+        kind = {"ssl-certificates": "ssl", "client-certificates": "smime"}.get(request.match["name"])
+        rows = []
+        if kind is not None:
+            start, end = request.body.get("from"), request.body.get("to")
+            for cert in self._records(kind):
+                if (start and cert["requested"] < start[:10]) or (end and cert["requested"] > end[:10]):
+                    continue
+                rows.append(self._public(cert))
+
+        return _Response(200, {"statusCode": 0, "reports": rows})
+
+
+def _handler_class(app):
+    """Build a request handler class serving a WSGI application over HTTP/1.1 with keep-alive."""
+
+    class Handler(BaseHTTPRequestHandler):
+        """Translate each HTTP request into a WSGI call."""
+
+        protocol_version = "HTTP/1.1"
+        # The headers and the body are written separately, which Nagle's algorithm would delay by a round trip
+        disable_nagle_algorithm = True
+
+        def handle_one_request(self):
+            """Read one request and answer it with the application."""
+            self.raw_requestline = self.rfile.readline(65537)  # pylint: disable=attribute-defined-outside-init
+            if not self.raw_requestline:
+                self.close_connection = True  # pylint: disable=attribute-defined-outside-init
+                return
+            if not self.parse_request():
+                return
+
+            path, _, query = self.path.partition("?")
+            length = int(self.headers.get("Content-Length") or 0)
+            environ = {
+                "REQUEST_METHOD": self.command, "PATH_INFO": path, "QUERY_STRING": query,
+                "CONTENT_LENGTH": str(length), "CONTENT_TYPE": self.headers.get("Content-Type", ""),
+                "SERVER_NAME": self.server.server_address[0], "SERVER_PORT": str(self.server.server_address[1]),
+                "SERVER_PROTOCOL": self.request_version, "HTTP_HOST": self.headers.get("Host", ""),
+                "wsgi.input": io.BytesIO(self.rfile.read(length) if length else b""), "wsgi.errors": sys.stderr,
+                "wsgi.url_scheme": "http", "wsgi.version": (1, 0), "wsgi.multithread": True,
+                "wsgi.multiprocess": False, "wsgi.run_once": False,
+            }
+
+            def start_response(status, headers, exc_info=None):  # pylint: disable=unused-argument
+                code, _, reason = status.partition(" ")
+                self.send_response(int(code), reason)
+                for key, value in headers:
+                    self.send_header(key, value)
+                self.end_headers()
+
+            for chunk in app(environ, start_response):
+                self.wfile.write(chunk)
+            self.wfile.flush()
+
+        def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+            """Log the requests at the DEBUG level instead of printing them."""
+            LOGGER.debug("%s - %s", self.address_string(), format % args)
+
+    return Handler
@@ -6,6 +6,7 @@ import sys
 import fixtures
 
 from cert_manager.client import Client
+from cert_manager._cache import METADATA_CACHE
 from cert_manager import __version__
 
 
@@ -44,3 +45,7 @@ class ClientFixture(fixtures.Fixture):
         }
 
         self.addCleanup(delattr, self, "client")
+
+        # Every test mocks its own API responses, so nothing may be served from an earlier test
+        METADATA_CACHE.invalidate()
+        self.addCleanup(METADATA_CACHE.invalidate)
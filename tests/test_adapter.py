@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._adapter unit tests."""
+# Don't warn about things that happen as that is part of unit testing
+# pylint: disable=protected-access
+
+import socket
+
+import mock
+from testtools import TestCase
+
+from cert_manager._adapter import ConnectionStats, PoolAdapter
+from cert_manager._metrics import take_connection_times
+
+
+class TestConnectionStats(TestCase):
+    """Test the ConnectionStats class."""
+
+    def test_counters(self):
+        """Requests and connections should be counted and reuse derived from them."""
+        stats = ConnectionStats()
+        for _ in range(5):
+            stats.add_request()
+        stats.add_connection(secure=True)
+        stats.add_connection(secure=False)
+
+        self.assertEqual(stats.requests, 5)
+        self.assertEqual(stats.new_connections, 2)
+        self.assertEqual(stats.tls_handshakes, 1)
+        self.assertEqual(stats.reused, 3)
+        self.assertEqual(
+            stats.as_dict(), {"requests": 5, "new_connections": 2, "reused": 3, "tls_handshakes": 1}
+        )
+
+    def test_reset(self):
+        """All counters should be set back to zero."""
+        stats = ConnectionStats()
+        stats.add_request()
+        stats.add_connection(secure=True)
+        stats.reset()
+
+        self.assertEqual(stats.as_dict(), {"requests": 0, "new_connections": 0, "reused": 0, "tls_handshakes": 0})
+
+
+class TestPoolAdapter(TestCase):
+    """Test the PoolAdapter class."""
+
+    def test_pool_size(self):
+        """The pool parameters should be passed to the pool manager."""
+        adapter = PoolAdapter(pool_connections=3, pool_maxsize=25, pool_block=True)
+
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 25)
+        self.assertEqual(adapter._pool_block, True)
+
+        pool = adapter.poolmanager.connection_from_url("https://certs.example.com/api")
+        self.assertEqual(pool.pool.maxsize, 25)
+        self.assertEqual(pool.block, True)
+
+    def test_new_connections_counted(self):
+        """New connections should be counted, with HTTPS ones counted as TLS handshakes."""
+        stats = ConnectionStats()
+        adapter = PoolAdapter(stats=stats)
+
+        adapter.poolmanager.connection_from_url("https://certs.example.com/api")._new_conn()
+        adapter.poolmanager.connection_from_url("https://certs.example.com/api")._new_conn()
+        adapter.poolmanager.connection_from_url("http://certs.example.com/api")._new_conn()
+
+        self.assertEqual(stats.new_connections, 3)
+        self.assertEqual(stats.tls_handshakes, 2)
+
+    def test_tcp_keepalive(self):
+        """The SO_KEEPALIVE socket option should be set if tcp_keepalive is True."""
+        keepalive = (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+        adapter = PoolAdapter(tcp_keepalive=True)
+        conn = adapter.poolmanager.connection_from_url("https://certs.example.com/api")._new_conn()
+        self.assertIn(keepalive, conn.socket_options)
+
+        adapter = PoolAdapter()
+        conn = adapter.poolmanager.connection_from_url("https://certs.example.com/api")._new_conn()
+        self.assertNotIn(keepalive, conn.socket_options)
+
+    def test_connection_timed(self):
+        """Opening a connection should report the socket and TLS handshake times to the metrics."""
+        adapter = PoolAdapter()
+        pool = adapter.poolmanager.connection_from_url("https://certs.example.com/api")
+        conn_class = pool.ConnectionCls
+
+        with mock.patch("cert_manager._adapter.time.monotonic", side_effect=[10.0, 10.5, 11.0, 13.0]):
+            with mock.patch.object(conn_class.__bases__[0], "connect", autospec=True) as connect:
+                connect.side_effect = lambda conn: conn._new_conn()
+                with mock.patch.object(conn_class.__bases__[0], "_new_conn", autospec=True):
+                    take_connection_times()
+                    conn_class("certs.example.com").connect()
+
+        # connect started at 10, the socket was opened from 10.5 to 11, and connect ended at 13
+        self.assertEqual(take_connection_times(), (0.5, 2.5))
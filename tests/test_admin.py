@@ -71,12 +71,14 @@ class TestInit(TestAdmin):
 
         admin = Admin(client=self.client)
 
+        # Nothing should be fetched until the data is needed
+        self.assertEqual(len(responses.calls), 0)
+
         # Verify all the query information
+        self.assertEqual(admin.all(), self.valid_response)
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.api_url)
 
-        self.assertEqual(admin._Admin__admins, self.valid_response)
-
     @responses.activate
     def test_param(self):
         """The URL should change if api_version is passed as a parameter."""
@@ -89,12 +91,14 @@ class TestInit(TestAdmin):
 
         admin = Admin(client=self.client, api_version=version)
 
+        # Nothing should be fetched until the data is needed
+        self.assertEqual(len(responses.calls), 0)
+
         # Verify all the query information
+        self.assertEqual(admin.all(), self.valid_response)
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, api_url)
 
-        self.assertEqual(admin._Admin__admins, self.valid_response)
-
     def test_need_client(self):
         """The class should raise an exception without a client parameter."""
         self.assertRaises(TypeError, Admin)
@@ -105,7 +109,8 @@ class TestInit(TestAdmin):
         # Setup the mocked response
         responses.add(responses.GET, self.api_url, json=self.error_response, status=400)
 
-        self.assertRaises(HTTPError, Admin, client=self.client)
+        admin = Admin(client=self.client)
+        self.assertRaises(HTTPError, admin.all)
 
         # Verify all the query information
         self.assertEqual(len(responses.calls), 1)
@@ -139,6 +144,7 @@ class TestAll(TestAdmin):
         responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
 
         admin = Admin(client=self.client)
+        admin.all()
         data = admin.all(force=True)
 
         # Verify all the query information
@@ -158,8 +164,6 @@ class TestGet(TestAdmin):
     def test_need_admin_id(self):
         """The function should raise an exception without an admin_id parameter."""
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
         admin = Admin(client=self.client)
         self.assertRaises(TypeError, admin.get)
 
@@ -167,9 +171,6 @@ class TestGet(TestAdmin):
     def test_admin_id(self):
         """The function should return data about the specified Admin ID."""
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
-
         admin_id = 1234
         api_url = f"{self.api_url}/{str(admin_id)}"
 
@@ -179,17 +180,14 @@ class TestGet(TestAdmin):
         admin = Admin(client=self.client)
         data = admin.get(admin_id)
 
-        self.assertEqual(len(responses.calls), 2)
-        self.assertEqual(responses.calls[1].request.url, api_url)
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(responses.calls[0].request.url, api_url)
         self.assertEqual(data, self.valid_individual_response)
 
     @responses.activate
     def test_ne_admin_id(self):
         """The function should raise an HTTPError exception if the specified Admin ID does not exist."""
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
-
         admin_id = 2345
         api_url = f"{self.api_url}/{str(admin_id)}"
 
@@ -207,9 +205,6 @@ class TestGetIdps(TestAdmin):
     def test_get(self):
         """The function should return all IDPs."""
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
-
         api_url = f"{self.api_url}/idp"
 
         responses.add(responses.GET, api_url, json=self.valid_idp_response, status=200)
@@ -221,8 +216,8 @@ class TestGetIdps(TestAdmin):
         # There should only be one call the first time "all" is called.
         # Due to pagination, this is only guaranteed as long as the number of
         # entries returned is less than the page size
-        self.assertEqual(len(responses.calls), 2)
-        self.assertEqual(responses.calls[1].request.url, api_url)
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(responses.calls[0].request.url, api_url)
         self.assertEqual(data, self.valid_idp_response)
 
         responses.add(responses.GET, self.api_url, json=self.error_response, status=400)
@@ -231,9 +226,6 @@ class TestGetIdps(TestAdmin):
     def test_get_http_failure(self):
         """The function should raise an HTTPError exception if IDPs cannot be retrieved from the API."""
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
-
         api_url = f"{self.api_url}/idp"
 
         responses.add(responses.GET, api_url, json=self.error_response, status=400)
@@ -253,9 +245,6 @@ class TestCreate(TestAdmin):
         parameters.
         """
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
-
         admin = Admin(client=self.client)
         # Not going to check every permutation of missing parameters,
         # but verify that something is required
@@ -268,8 +257,6 @@ class TestCreate(TestAdmin):
         as well as add all parameters to the request body
         """
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
         # Setup the mocked response
         admin_id = 1234
         location = f"{self.api_url}/{str(admin_id)}"
@@ -287,7 +274,7 @@ class TestCreate(TestAdmin):
         response = admin.create(**post_data)
 
         self.assertEqual(response, {"id": admin_id})
-        self.assertEqual(responses.calls[1].request.body, json.dumps(post_data).encode("utf8"))
+        self.assertEqual(responses.calls[0].request.body, json.dumps(post_data).encode("utf8"))
 
     @responses.activate
     def test_create_success_optional_params(self):
@@ -296,8 +283,6 @@ class TestCreate(TestAdmin):
         as well add the non-required parameters to the request body
         """
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
         # Setup the mocked response
         admin_id = 1234
         location = f"{self.api_url}/{str(admin_id)}"
@@ -317,7 +302,7 @@ class TestCreate(TestAdmin):
         response = admin.create(**post_data)
 
         self.assertEqual(response, {"id": admin_id})
-        self.assertEqual(responses.calls[1].request.body, json.dumps(post_data).encode("utf8"))
+        self.assertEqual(responses.calls[0].request.body, json.dumps(post_data).encode("utf8"))
 
     @responses.activate
     def test_create_failure_http_error(self):
@@ -326,8 +311,6 @@ class TestCreate(TestAdmin):
         creation failed.
         """
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
         # Setup the mocked response
         responses.add(responses.POST, self.api_url, json=self.error_response,
                       status=400)
@@ -352,8 +335,6 @@ class TestCreate(TestAdmin):
         (unexpected HTTP status code).
         """
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
         # Setup the mocked response
         responses.add(responses.POST, self.api_url, json=self.error_response,
                       status=200)
@@ -378,8 +359,6 @@ class TestCreate(TestAdmin):
         (no Location header in response).
         """
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
         # Setup the mocked response
         responses.add(responses.POST, self.api_url, status=201)
 
@@ -403,8 +382,6 @@ class TestCreate(TestAdmin):
         (Admin ID not found in response).
         """
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
         # Setup the mocked response
         responses.add(responses.POST, self.api_url, headers={"Location": "not a url"}, status=201)
 
@@ -431,9 +408,6 @@ class TestDelete(TestAdmin):
         parameters.
         """
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
-
         admin = Admin(client=self.client)
         # missing admin_id
         self.assertRaises(TypeError, admin.delete)
@@ -442,9 +416,6 @@ class TestDelete(TestAdmin):
     def test_delete_success(self):
         """The function should return True if the deletion succeeded."""
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
-
         admin_id = 1234
         api_url = f"{self.api_url}/{str(admin_id)}"
 
@@ -463,9 +434,6 @@ class TestDelete(TestAdmin):
         failed.
         """
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
-
         admin_id = 1234
         api_url = f"{self.api_url}/{str(admin_id)}"
 
@@ -487,9 +455,6 @@ class TestUpdate(TestAdmin):
         parameters.
         """
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
-
         admin = Admin(client=self.client)
         # missing admin_id
         self.assertRaises(TypeError, admin.update)
@@ -498,9 +463,6 @@ class TestUpdate(TestAdmin):
     def test_update_success(self):
         """The function should return True if the update succeeded."""
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
-
         admin_id = 1234
         api_url = f"{self.api_url}/{str(admin_id)}"
 
@@ -516,9 +478,6 @@ class TestUpdate(TestAdmin):
     def test_update_body_success(self):
         """Additional **kwargs should be added to request body"""
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
-
         admin_id = 1234
         api_url = f"{self.api_url}/{str(admin_id)}"
 
@@ -534,7 +493,7 @@ class TestUpdate(TestAdmin):
         response = admin.update(admin_id, **post_data)
 
         self.assertEqual(True, response)
-        self.assertEqual(responses.calls[1].request.body, json.dumps(post_data).encode("utf8"))
+        self.assertEqual(responses.calls[0].request.body, json.dumps(post_data).encode("utf8"))
 
     @responses.activate
     def test_update_failure_http_error(self):
@@ -543,9 +502,6 @@ class TestUpdate(TestAdmin):
         creation failed.
         """
 
-        # Setup the mocked response when class is initialized
-        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
-
         admin_id = 1234
         api_url = f"{self.api_url}/{str(admin_id)}"
 
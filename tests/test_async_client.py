@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager.async_client.AsyncClient unit tests."""
+# Don't warn about things that happen as that is part of unit testing
+# pylint: disable=protected-access
+# pylint: disable=no-member
+
+import asyncio
+
+from testtools import TestCase
+
+from requests.exceptions import HTTPError
+import responses
+
+from cert_manager.async_client import AsyncClient
+from cert_manager.client import Client
+from cert_manager.ssl import SSL
+
+from .lib.testbase import ClientFixture
+
+
+class TestAsyncClient(TestCase):  # pylint: disable=too-few-public-methods
+    """Serve as a Base class for all tests of the AsyncClient class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        # Call the inherited setUp method
+        super().setUp()
+
+        # Use the Client fixture for the default values
+        self.cfixt = self.useFixture(ClientFixture())
+        self.aclient = AsyncClient(
+            base_url=self.cfixt.base_url, login_uri=self.cfixt.login_uri, username=self.cfixt.username,
+            password=self.cfixt.password, max_workers=4,
+        )
+        self.addCleanup(self.aclient.close)
+
+        # An example URL to use in testing
+        self.test_url = f"{self.cfixt.base_url}/test/url"
+
+
+class TestInit(TestAsyncClient):
+    """Test the class initializer."""
+
+    def test_defaults(self):
+        """The internal Client should be built with the same parameters."""
+        client = self.aclient.client
+
+        self.assertTrue(isinstance(client, Client))
+        self.assertEqual(self.aclient.max_workers, 4)
+        self.assertEqual(self.aclient.session.get_adapter(self.cfixt.base_url)._pool_maxsize, 4)
+        self.assertEqual(self.aclient.base_url, self.cfixt.base_url)
+        self.assertEqual(self.aclient.user_agent, self.cfixt.user_agent)
+
+        headers = self.cfixt.headers.copy()
+        headers["password"] = self.cfixt.password
+        self.assertEqual(self.aclient.headers, headers)
+        for head, headdata in headers.items():
+            self.assertEqual(self.aclient.session.headers[head], headdata)
+
+    def test_cert_auth(self):
+        """Certificate authentication parameters should be passed to the internal Client."""
+        aclient = AsyncClient(
+            base_url=self.cfixt.base_url, login_uri=self.cfixt.login_uri, username=self.cfixt.username,
+            cert_auth=True, user_crt_file=self.cfixt.user_crt_file, user_key_file=self.cfixt.user_key_file,
+        )
+        self.addCleanup(aclient.close)
+
+        self.assertEqual(aclient.session.cert, (self.cfixt.user_crt_file, self.cfixt.user_key_file))
+        self.assertFalse("password" in aclient.session.headers)
+
+    def test_need_password(self):
+        """Class should raise an exception without a password."""
+        self.assertRaises(KeyError, AsyncClient, login_uri=self.cfixt.login_uri, username=self.cfixt.username)
+
+
+class TestHeaders(TestAsyncClient):
+    """Test the add_headers and remove_headers methods."""
+
+    def test_add_remove(self):
+        """Headers should be added to and removed from the internal Client."""
+        self.aclient.add_headers({"Connection": "close"})
+        self.assertEqual(self.aclient.session.headers["Connection"], "close")
+
+        self.aclient.remove_headers(["Connection"])
+        self.assertFalse("Connection" in self.aclient.session.headers)
+
+
+class TestVerbs(TestAsyncClient):
+    """Test the HTTP verb coroutines."""
+
+    @responses.activate
+    def test_get(self):
+        """It should return data correctly if a 200-level status code is returned with data."""
+        json_data = {"some": "data"}
+        responses.add(responses.GET, self.test_url, json=json_data, status=200)
+
+        resp = asyncio.run(self.aclient.get(self.test_url))
+
+        self.assertEqual(resp.json(), json_data)
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(responses.calls[0].request.url, self.test_url)
+
+    @responses.activate
+    def test_post_put_delete_head(self):
+        """All verbs should be sent to the API."""
+        responses.add(responses.POST, self.test_url, json={"post": 1}, status=200)
+        responses.add(responses.PUT, self.test_url, json={"put": 1}, status=200)
+        responses.add(responses.DELETE, self.test_url, status=204)
+        responses.add(responses.HEAD, self.test_url, status=200, headers={"X-Total-Count": "3"})
+
+        async def run():
+            return await asyncio.gather(
+                self.aclient.post(self.test_url, data={"a": 1}),
+                self.aclient.put(self.test_url, data={"b": 2}),
+                self.aclient.delete(self.test_url),
+                self.aclient.head(self.test_url),
+            )
+
+        post, put, delete, head = asyncio.run(run())
+
+        self.assertEqual(post.json(), {"post": 1})
+        self.assertEqual(put.json(), {"put": 1})
+        self.assertEqual(delete.status_code, 204)
+        self.assertEqual(head.headers["X-Total-Count"], "3")
+        self.assertEqual(len(responses.calls), 4)
+
+    @responses.activate
+    def test_failure(self):
+        """It should raise an HTTPError exception with the decoded reason if an error status code is returned."""
+        json_data = {"code": -183, "description": "some error"}
+        responses.add(responses.GET, self.test_url, json=json_data, status=400)
+
+        exc = self.assertRaises(HTTPError, asyncio.run, self.aclient.get(self.test_url))
+        self.assertIn("-183, some error", exc.response.reason)
+
+
+class TestEndpoint(TestAsyncClient):
+    """Test driving endpoint objects through the AsyncClient."""
+
+    @responses.activate
+    def test_concurrent(self):
+        """Endpoint methods should be awaitable and run concurrently."""
+        api_url = f"{self.cfixt.base_url}/ssl/v1"
+        for cert_id in range(10):
+            responses.add(responses.GET, f"{api_url}/{cert_id}", json={"sslId": cert_id}, status=200)
+
+        ssl = self.aclient.endpoint(SSL(client=self.aclient.client))
+
+        async def run():
+            return await asyncio.gather(*[ssl.get(cert_id) for cert_id in range(10)])
+
+        results = asyncio.run(run())
+
+        self.assertEqual(results, [{"sslId": cert_id} for cert_id in range(10)])
+        self.assertEqual(len(responses.calls), 10)
+
+    @responses.activate
+    def test_paginated(self):
+        """Generators returned by paginated methods should be exhausted on the worker threads."""
+        api_url = f"{self.cfixt.base_url}/ssl/v1"
+        responses.add(responses.GET, api_url, json=[{"id": 1}, {"id": 2}], status=200)
+
+        ssl = SSL(client=self.aclient.client)
+        result = asyncio.run(self.aclient.call(ssl.list))
+
+        self.assertEqual(result, [{"id": 1}, {"id": 2}])
+
+    def test_attributes(self):
+        """Non-callable attributes should be passed through unchanged."""
+        ssl = SSL(client=self.aclient.client)
+
+        self.assertEqual(self.aclient.endpoint(ssl).api_url, ssl.api_url)
+
+    def test_context_manager(self):
+        """The AsyncClient should be usable as an asynchronous context manager."""
+        aclient = AsyncClient(login_uri=self.cfixt.login_uri, username=self.cfixt.username,
+                              password=self.cfixt.password)
+
+        async def run():
+            async with aclient as ctx:
+                return ctx
+
+        self.assertIs(asyncio.run(run()), aclient)
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager.bulk_validation.BulkValidationHelper unit tests."""
+# responses is too tricky for pylint, so ignore the false-positive errors generated.
+# pylint: disable=no-member
+
+import json
+
+from fixtures import TempDir
+import responses
+from testtools import TestCase
+
+from cert_manager.bulk_validation import BulkValidationHelper, DCVResult, DCVStateStore
+from cert_manager.resolver import ConcurrentResolver, StubResolver
+
+from .lib.testbase import ClientFixture
+
+
+class TestBulkValidation(TestCase):
+    """Act as a superclass for the bulk validation tests."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        super().setUp()
+
+        self.cfixt = self.useFixture(ClientFixture())
+        self.client = self.cfixt.client
+        self.api_url = f"{self.cfixt.base_url}/dcv/v2/validation"
+        # Only the CNAME records of these hosts are visible
+        self.resolver = StubResolver({"_a.example.com": "a.dcv.example", "_a.example.org": "A.DCV.EXAMPLE."})
+        self.helper = BulkValidationHelper(self.client, max_workers=4, resolver=self.resolver)
+
+        self.domains = ["example.com", "bad.com", "sub.example.org", "example.net", "example.org"]
+
+    @staticmethod
+    def start_callback(request):
+        """Return a CNAME challenge, failing for bad.com."""
+        domain = json.loads(request.body)["domain"]
+        if domain == "bad.com":
+            return (400, {}, json.dumps({"code": -1, "description": "bad domain"}))
+
+        return (200, {}, json.dumps({"host": f"_a.{domain}", "point": "a.dcv.example"}))
+
+    @staticmethod
+    def submit_callback(request):
+        """Accept the submission, failing for example.org."""
+        domain = json.loads(request.body)["domain"]
+        if domain == "example.org":
+            return (500, {}, json.dumps({"code": -1}))
+
+        return (200, {}, json.dumps({"status": "SUBMITTED"}))
+
+    def mock_api(self):
+        """Set up the mocked API responses."""
+        responses.add(responses.GET, self.api_url, json=[{"domain": domain} for domain in self.domains], status=200)
+        responses.add_callback(responses.POST, f"{self.api_url}/start/domain/cname", callback=self.start_callback)
+        responses.add_callback(responses.POST, f"{self.api_url}/submit/domain/cname", callback=self.submit_callback)
+
+
+class TestBulkValidationHelper(TestBulkValidation):
+    """Test the BulkValidationHelper class."""
+
+    @responses.activate
+    def test_start_all(self):
+        """It should start every second level domain, recording failures without stopping."""
+        self.mock_api()
+
+        started = self.helper.start_all()
+
+        self.assertEqual([dcv["domain"] for dcv in started], ["example.com", "example.net", "example.org"])
+        self.assertEqual(started[0], {
+            "domain": "example.com", "method": "cname", "host": "_a.example.com", "point": "a.dcv.example",
+        })
+
+        results = self.helper.results
+        self.assertEqual(results["bad.com"].status, DCVResult.START_FAILED)
+        self.assertFalse(results["bad.com"].ok)
+        self.assertIsNotNone(results["bad.com"].error)
+        self.assertNotIn("sub.example.org", results)
+
+        # One find request, then a start request per second level domain
+        self.assertEqual(len(responses.calls), 5)
+
+    @responses.activate
+    def test_start_all_filter(self):
+        """It should pass the search filter and include sub-domains when asked to."""
+        self.mock_api()
+
+        started = self.helper.start_all(only_secondlevel=False, dcv_status="EXPIRED")
+
+        self.assertEqual(len(started), 4)
+        self.assertIn("dcvStatus=EXPIRED", responses.calls[0].request.url)
+
+    @responses.activate
+    def test_submit_started(self):
+        """It should only submit the domains whose CNAME record is visible."""
+        self.mock_api()
+        self.helper.start_all()
+
+        submitted = self.helper.submit_started()
+
+        self.assertEqual(submitted, {"example.com"})
+
+        results = self.helper.results
+        self.assertEqual(results["example.com"].status, DCVResult.SUBMITTED)
+        self.assertEqual(results["example.com"].response, {"status": "SUBMITTED"})
+        self.assertEqual(results["example.net"].status, DCVResult.NOT_VISIBLE)
+        self.assertEqual(results["example.org"].status, DCVResult.SUBMIT_FAILED)
+
+        self.assertEqual(sorted(self.resolver.queries), ["_a.example.com", "_a.example.net", "_a.example.org"])
+
+        # The domains not submitted are kept for a later attempt
+        self.resolver.add("_a.example.net", "a.dcv.example.")
+        self.assertEqual(self.helper.submit_started(), {"example.net"})
+
+    def test_submit_lookup_error(self):
+        """A failed DNS lookup should count as a record which is not visible."""
+        dcvs = [{"domain": "example.com", "method": "cname", "host": "_a.example.com", "point": "a.dcv.example"}]
+
+        self.resolver.add("_a.example.com", OSError("timeout"))
+
+        self.assertEqual(self.helper.submit_started_cname(dcvs), [])
+        result = self.helper.results["example.com"]
+        self.assertEqual(result.status, DCVResult.NOT_VISIBLE)
+        self.assertTrue(isinstance(result.error, OSError))
+
+    def test_submit_wrong_method(self):
+        """It should refuse to submit anything if a DCV does not use the CNAME method."""
+        dcvs = [{"domain": "example.com", "method": "http"}]
+
+        self.assertRaises(ValueError, self.helper.submit_started_cname, dcvs)
+
+    @responses.activate
+    def test_start_domains(self):
+        """It should yield a result for every domain in order."""
+        self.mock_api()
+
+        results = list(self.helper.start_domains(["example.com", "bad.com", "example.net"]))
+
+        self.assertEqual([domain for domain, _ in results], ["example.com", "bad.com", "example.net"])
+        self.assertEqual([result.ok for _, result in results], [True, False, True])
+
+    def test_default_resolver(self):
+        """It should use a ConcurrentResolver by default."""
+        helper = BulkValidationHelper(self.client)
+
+        self.assertTrue(isinstance(helper.resolver, ConcurrentResolver))
+
+
+class TestDCVStateStore(TestBulkValidation):
+    """Test resuming DCV with a DCVStateStore."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        super().setUp()
+
+        self.path = self.useFixture(TempDir()).join("dcv.db")
+
+    def helper_with_store(self):
+        """Build a helper with a store at *self.path*, closed at the end of the test."""
+        store = DCVStateStore(self.path)
+        self.addCleanup(store.close)
+
+        return BulkValidationHelper(self.client, max_workers=4, resolver=self.resolver, store=store)
+
+    @responses.activate
+    def test_resume(self):
+        """A new helper should submit the DCV started by an earlier one without starting it again."""
+        self.mock_api()
+        self.helper_with_store().start_all()
+        calls = len(responses.calls)
+
+        helper = self.helper_with_store()
+        self.assertEqual(helper.results["example.com"].challenge, {"host": "_a.example.com", "point": "a.dcv.example"})
+        self.assertEqual(helper.results["bad.com"].status, DCVResult.START_FAILED)
+
+        self.assertEqual(helper.submit_started(), {"example.com"})
+        # Only the submissions were sent: example.com, and example.org which fails
+        self.assertEqual(len(responses.calls), calls + 2)
+
+        # The submitted domain is no longer pending in the next run
+        helper = self.helper_with_store()
+        result = helper.results["example.com"]
+        self.assertEqual(result.status, DCVResult.SUBMITTED)
+        self.assertIsNotNone(result.started_at)
+        self.assertIsNotNone(result.submitted_at)
+        self.assertEqual(helper.results["example.org"].status, DCVResult.SUBMIT_FAILED)
+        self.assertEqual(helper.results["example.org"].error[:3], "500")
+        self.assertEqual(
+            sorted(result.domain for result in DCVStateStore(self.path).pending()), ["example.net", "example.org"]
+        )
+
+    @responses.activate
+    def test_start_all_skips_pending(self):
+        """start_all should not start again the DCV resumed from the store."""
+        self.mock_api()
+        self.helper_with_store().start_all()
+        calls = len(responses.calls)
+
+        started = self.helper_with_store().start_all()
+
+        self.assertEqual([dcv["domain"] for dcv in started], ["example.com", "example.net", "example.org"])
+        # The find request, then only bad.com is started again
+        self.assertEqual(len(responses.calls), calls + 2)
+
+    def test_path(self):
+        """It should open a store from a path."""
+        helper = BulkValidationHelper(self.client, resolver=self.resolver, store=self.path)
+        self.addCleanup(helper.store.close)
+
+        self.assertTrue(isinstance(helper.store, DCVStateStore))
+        self.assertEqual(helper.results, {})
+
+    def test_store(self):
+        """It should save, replace, load and remove the state of domains."""
+        with DCVStateStore(":memory:") as store:
+            result = DCVResult("example.com", "cname")
+            result.status = DCVResult.STARTED
+            result.challenge = {"host": "_a.example.com", "point": "a.dcv.example"}
+            store.save(result)
+            store.save(DCVResult("example.net", "cname"))
+
+            result.status = DCVResult.SUBMIT_FAILED
+            result.error = ValueError("nope")
+            store.save(result)
+
+            loaded = store.load()
+            self.assertEqual([r.domain for r in loaded], ["example.com", "example.net"])
+            self.assertEqual(loaded[0].status, DCVResult.SUBMIT_FAILED)
+            self.assertEqual(loaded[0].error, "nope")
+            self.assertEqual(loaded[0].challenge, result.challenge)
+            self.assertEqual([r.domain for r in store.pending()], ["example.com"])
+
+            store.remove("example.com")
+            self.assertEqual([r.domain for r in store.load()], ["example.net"])
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._cache.TTLCache unit tests."""
+
+import threading
+import time
+
+import mock
+from testtools import TestCase
+
+from cert_manager._cache import TTLCache
+
+
+class TestTTLCache(TestCase):
+    """Test the TTLCache class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        super().setUp()
+
+        self.cache = TTLCache(ttl=10)
+        self.now = 1000.0
+
+        patcher = mock.patch("cert_manager._cache.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_hit(self):
+        """It should only call the fetch function once while the value is fresh."""
+        fetch = mock.Mock(return_value="value")
+
+        self.assertEqual(self.cache.get(("a",), fetch), "value")
+        self.now += 9
+        self.assertEqual(self.cache.get(("a",), fetch), "value")
+        self.assertEqual(fetch.call_count, 1)
+
+    def test_expired(self):
+        """It should call the fetch function again once the value expired."""
+        fetch = mock.Mock(side_effect=["old", "new"])
+
+        self.assertEqual(self.cache.get(("a",), fetch), "old")
+        self.now += 10
+        self.assertEqual(self.cache.get(("a",), fetch), "new")
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_ttl_override(self):
+        """It should use the TTL passed to get instead of the default."""
+        fetch = mock.Mock(side_effect=["old", "new"])
+
+        self.cache.get(("a",), fetch, ttl=1)
+        self.now += 1
+        self.assertEqual(self.cache.get(("a",), fetch), "new")
+
+    def test_exception(self):
+        """It should raise the exception from the fetch function and not cache anything."""
+        fetch = mock.Mock(side_effect=[ValueError("boom"), "value"])
+
+        self.assertRaises(ValueError, self.cache.get, ("a",), fetch)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual(self.cache.get(("a",), fetch), "value")
+
+    def test_invalidate(self):
+        """It should remove only the keys starting with the prefix, or all keys with no prefix."""
+        self.cache.get(("a", 1), lambda: 1)
+        self.cache.get(("a", 2), lambda: 2)
+        self.cache.get(("b", 1), lambda: 3)
+
+        self.cache.invalidate(("a",))
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.get(("b", 1), lambda: 4), 3)
+
+        self.cache.invalidate()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_discard(self):
+        """It should remove only the exact key, and ignore missing keys."""
+        self.cache.get(("a",), lambda: 1)
+        self.cache.get(("a", 1), lambda: 2)
+
+        self.cache.discard(("a",))
+        self.cache.discard(("b",))
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.get(("a", 1), lambda: 3), 2)
+
+    def test_evict_expired(self):
+        """It should remove the expired values only."""
+        self.cache.get(("a",), lambda: 1, ttl=1)
+        self.cache.get(("b",), lambda: 2)
+        self.now += 5
+
+        self.cache.evict_expired()
+        self.assertEqual(len(self.cache), 1)
+
+    def test_sweep(self):
+        """Storing a value should drop the expired values of other keys, at most once per ttl."""
+        self.cache.get(("a",), lambda: 1, ttl=1)
+        self.now += 5
+        self.cache.get(("b",), lambda: 2)
+        self.assertEqual(len(self.cache), 2)
+
+        self.now += 6
+        self.cache.get(("c",), lambda: 3)
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual(self.cache.get(("b",), lambda: 4), 2)
+
+    def test_single_flight(self):
+        """Concurrent callers of a missing key should share one fetch."""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "value"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.cache.get(("a",), fetch))) for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["value"] * 5)
@@ -157,6 +157,17 @@ class TestTypes(TestCertificates):
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.test_url)
 
+    @responses.activate
+    def test_copies(self):
+        """Changing the returned types should not change what the next callers get."""
+        responses.add(responses.GET, self.test_url, json=self.types_data, status=200)
+
+        self.certobj.types["InCommon ECC"]["terms"].append(1095)
+        del self.certobj.types["IGTF Server Cert"]
+
+        self.assertEqual(self.certobj.types, self.types)
+        self.assertEqual(len(responses.calls), 1)
+
     @responses.activate
     def test_failure(self):
         """It should raise an HTTPError exception if an error status code is returned."""
@@ -170,6 +181,56 @@ class TestTypes(TestCertificates):
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.test_url)
 
+    @responses.activate
+    def test_shared(self):
+        """Other objects for the same account, endpoint and version should use the cached copy."""
+        responses.add(responses.GET, self.test_url, json=self.types_data, status=200)
+
+        other = Certificates(client=self.client, endpoint=self.ep_path, api_version=self.api_version)
+        resp = self.certobj.types
+        resp2 = other.types
+
+        self.assertEqual(resp, self.types)
+        self.assertEqual(resp2, self.types)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_not_shared(self):
+        """Objects for another API version should not use the cached copy."""
+        responses.add(responses.GET, self.test_url, json=self.types_data, status=200)
+        responses.add(responses.GET, f"{self.cfixt.base_url}{self.ep_path}/v2/types", json=[], status=200)
+
+        other = Certificates(client=self.client, endpoint=self.ep_path, api_version="v2")
+
+        self.assertEqual(self.certobj.types, self.types)
+        self.assertEqual(other.types, {})
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_invalidate(self):
+        """It should call the API again after invalidate_cache is called."""
+        responses.add(responses.GET, self.test_url, json=self.types_data, status=200)
+
+        resp = self.certobj.types
+        self.certobj.invalidate_cache()
+        resp2 = self.certobj.types
+
+        self.assertEqual(resp, self.types)
+        self.assertEqual(resp2, self.types)
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_failure_not_cached(self):
+        """A failed call should not be cached."""
+        responses.add(responses.GET, self.test_url, json={"description": "some error"}, status=404)
+        responses.add(responses.GET, self.test_url, json=self.types_data, status=200)
+
+        self.assertRaises(HTTPError, getattr, self.certobj, "types")
+        resp = self.certobj.types
+
+        self.assertEqual(resp, self.types)
+        self.assertEqual(len(responses.calls), 2)
+
 
 class TestCustomFields(TestCertificates):
     """Test the custom_fields properties."""
@@ -212,6 +273,18 @@ class TestCustomFields(TestCertificates):
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.test_url)
 
+    @responses.activate
+    def test_copies(self):
+        """Changing the returned custom fields should not change what the next callers or the validator get."""
+        responses.add(responses.GET, self.test_url, json=[{"id": 57, "name": "testName", "mandatory": True}])
+
+        self.certobj.custom_fields[0]["mandatory"] = False
+        self.certobj.custom_fields.append({"id": 58, "name": "other", "mandatory": True})
+
+        self.assertEqual(self.certobj.custom_fields, [{"id": 57, "name": "testName", "mandatory": True}])
+        self.assertEqual(self.certobj.custom_fields_validator.mandatory, ["testName"])
+        self.assertEqual(len(responses.calls), 1)
+
     @responses.activate
     def test_failure(self):
         """It should raise an HTTPError exception if an error status code is returned."""
@@ -226,6 +299,54 @@ class TestCustomFields(TestCertificates):
         self.assertEqual(responses.calls[0].request.url, self.test_url)
 
 
+class TestCustomFieldsValidator(TestCertificates):
+    """Test the custom_fields_validator property."""
+
+    def setUp(self):
+        """Initialize the class."""
+        super().setUp()
+
+        self.test_url = f"{self.api_url}/customFields"
+        self.cf_data = [{"id": 57, "name": "testName", "mandatory": True}]
+
+    @responses.activate
+    def test_shared(self):
+        """The validator should be built once and shared by objects using the same account."""
+        responses.add(responses.GET, self.test_url, json=self.cf_data, status=200)
+
+        validator = self.certobj.custom_fields_validator
+        other = Certificates(client=self.client, endpoint=self.ep_path)
+
+        self.assertIs(other.custom_fields_validator, validator)
+        self.assertEqual(validator.fields, self.cf_data)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_rebuilt(self):
+        """The validator should be rebuilt when the custom fields are retrieved again."""
+        responses.add(responses.GET, self.test_url, json=self.cf_data, status=200)
+        responses.add(responses.GET, self.test_url, json=[{"id": 58, "name": "other", "mandatory": True}], status=200)
+
+        validator = self.certobj.custom_fields_validator
+        self.certobj.invalidate_cache()
+        rebuilt = self.certobj.custom_fields_validator
+
+        self.assertIsNot(rebuilt, validator)
+        self.assertEqual(rebuilt.mandatory, ["other"])
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_same_entry(self):
+        """The validator and the custom fields should come from the same cache entry."""
+        responses.add(responses.GET, self.test_url, json=self.cf_data, status=200)
+
+        validator = self.certobj.custom_fields_validator
+
+        self.assertEqual(len(self.certobj.cache), 1)
+        self.assertEqual(self.certobj.custom_fields, validator.fields)
+        self.assertEqual(len(responses.calls), 1)
+
+
 class TestCollect(TestCertificates):
     """Test the collect method."""
 
@@ -293,6 +414,48 @@ class TestCollect(TestCertificates):
         self.assertRaises(Exception, self.certobj.collect, cert_id=self.test_id, cert_format="x509OC")
 
 
+class TestCollectMany(TestCertificates):
+    """Test the collect_many method."""
+
+    def setUp(self):
+        """Initialize the class."""
+        super().setUp()
+
+        self.test_type = "x509CO"
+        self.test_cert = TestCollectMany.fake_cert()
+
+    def url(self, cert_id):
+        """Return the collect URL of a certificate."""
+        return f"{self.api_url}/collect/{cert_id}/{self.test_type}"
+
+    @responses.activate
+    def test_success(self):
+        """It should yield every certificate with its ID."""
+        cert_ids = list(range(20))
+        for cert_id in cert_ids:
+            responses.add(responses.GET, self.url(cert_id), body=f"{cert_id}\n{self.test_cert}", status=200)
+
+        results = dict(self.certobj.collect_many(cert_ids, self.test_type, max_workers=4))
+
+        self.assertEqual(results, {cert_id: f"{cert_id}\n{self.test_cert}" for cert_id in cert_ids})
+        self.assertEqual(len(responses.calls), len(cert_ids))
+
+    @responses.activate
+    def test_pending(self):
+        """Pending certificates should be yielded with a Pending exception without stopping the others."""
+        responses.add(responses.GET, self.url(1), body=self.test_cert, status=200)
+        responses.add(responses.GET, self.url(2), body="", status=404)
+
+        results = dict(self.certobj.collect_many([1, 2], self.test_type))
+
+        self.assertEqual(results[1], self.test_cert)
+        self.assertTrue(isinstance(results[2], Pending))
+
+    def test_bad_format(self):
+        """It should raise a ValueError before sending any request if the format is invalid."""
+        self.assertRaises(ValueError, self.certobj.collect_many, [1, 2], "notaformat")
+
+
 class TestEnroll(TestCertificates):
     """Test the enroll method."""
     # pylint: disable=too-many-instance-attributes
@@ -599,6 +762,92 @@ class TestEnroll(TestCertificates):
         self.assertEqual(responses.calls[1].request.url, self.test_customfields_url)
 
 
+class TestEnrollMany(TestCertificates):
+    """Test the enroll_many method."""
+
+    def setUp(self):
+        """Initialize the class."""
+        super().setUp()
+
+        self.test_url = f"{self.api_url}/enroll"
+        self.test_types_url = f"{self.api_url}/types"
+        self.test_customfields_url = f"{self.api_url}/customFields"
+        self.types_data = [
+            {'id': 224, 'name': 'InCommon SSL (SHA-2)', 'terms': [365, 730]},
+        ]
+        self.cf_data = [
+            {"id": 57, "name": "testName", "mandatory": True},
+        ]
+
+    def request(self, org_id, **kwargs):
+        """Build the parameters of one valid enrollment."""
+        params = {
+            "cert_type_name": "InCommon SSL (SHA-2)", "csr": TestEnroll.fake_csr(), "term": 365, "org_id": org_id,
+            "custom_fields": [{"name": "testName", "value": "testValue"}],
+        }
+        params.update(kwargs)
+
+        return params
+
+    @staticmethod
+    def enroll_callback(request):
+        """Return the organization ID as the certificate ID, failing for organization 13."""
+        org_id = json.loads(request.body)["orgId"]
+        if org_id == 13:
+            return (500, {}, json.dumps({"code": -1}))
+
+        return (200, {}, json.dumps({"renewId": f"renew{org_id}", "sslId": org_id}))
+
+    @responses.activate
+    def test_success(self):
+        """It should return the results in the order of the requests, fetching the metadata only once."""
+        responses.add(responses.GET, self.test_types_url, json=self.types_data, status=200)
+        responses.add(responses.GET, self.test_customfields_url, json=self.cf_data, status=200)
+        responses.add_callback(responses.POST, self.test_url, callback=self.enroll_callback)
+
+        org_ids = list(range(20, 40))
+        results = self.certobj.enroll_many([self.request(org_id) for org_id in org_ids], max_workers=4)
+
+        self.assertEqual([result["sslId"] for result in results], org_ids)
+        self.assertEqual(len(responses.calls), len(org_ids) + 2)
+        self.assertEqual(responses.calls[0].request.url, self.test_types_url)
+        self.assertEqual(responses.calls[1].request.url, self.test_customfields_url)
+
+    @responses.activate
+    def test_failures(self):
+        """Invalid requests should not be submitted, and failures should not stop the other requests."""
+        responses.add(responses.GET, self.test_types_url, json=self.types_data, status=200)
+        responses.add(responses.GET, self.test_customfields_url, json=self.cf_data, status=200)
+        responses.add_callback(responses.POST, self.test_url, callback=self.enroll_callback)
+
+        results = self.certobj.enroll_many([
+            self.request(1),
+            self.request(2, term=42),
+            self.request(3, custom_fields=[]),
+            self.request(13),
+            self.request(4, cert_type_name="Nope"),
+            self.request(5),
+        ])
+
+        self.assertEqual(results[0]["sslId"], 1)
+        self.assertTrue(isinstance(results[1], ValueError))
+        self.assertTrue(isinstance(results[2], Exception))
+        self.assertTrue(isinstance(results[3], HTTPError))
+        self.assertTrue(isinstance(results[4], ValueError))
+        self.assertEqual(results[5]["sslId"], 5)
+        # Only the three valid requests were submitted
+        self.assertEqual(len(responses.calls), 5)
+
+    @responses.activate
+    def test_empty(self):
+        """It should return an empty list without submitting anything."""
+        responses.add(responses.GET, self.test_types_url, json=self.types_data, status=200)
+        responses.add(responses.GET, self.test_customfields_url, json=self.cf_data, status=200)
+
+        self.assertEqual(self.certobj.enroll_many([]), [])
+        self.assertEqual(len(responses.calls), 2)
+
+
 class TestRevoke(TestCertificates):
     """Test the revoke method."""
 
@@ -8,14 +8,18 @@
 # https://stackoverflow.com/questions/9323749/python-check-if-one-dictionary-is-a-subset-of-another-larger-dictionary
 #
 
+import http.server
 import sys
+import threading
 
 import mock
 from testtools import TestCase
 
-from requests.exceptions import HTTPError
+from requests.exceptions import ConnectionError as RequestsConnectionError, HTTPError
 import responses
 
+from cert_manager._ratelimit import RateLimiter
+from cert_manager._retry import RetryPolicy
 from cert_manager.client import Client
 
 from .lib.testbase import ClientFixture
@@ -177,6 +181,54 @@ class TestInit(TestClient):
         )
 
 
+class TestPool(TestClient):
+    """Test the connection pool options."""
+
+    def test_defaults(self):
+        """The requests default pool sizes should be used if no options are passed."""
+        adapter = self.client.session.get_adapter(self.cfixt.base_url)
+
+        self.assertEqual(adapter._pool_connections, 10)
+        self.assertEqual(adapter._pool_maxsize, 10)
+        self.assertEqual(adapter._pool_block, False)
+        self.assertNotEqual(self.client.session.headers.get("Connection"), "close")
+
+    def test_params(self):
+        """The pool options should be passed to the adapter of both schemes."""
+        client = Client(
+            login_uri=self.cfixt.login_uri, username=self.cfixt.username, password=self.cfixt.password,
+            pool_connections=2, pool_maxsize=50, pool_block=True, tcp_keepalive=True,
+        )
+
+        for url in ("https://cert-manager.com/api", "http://cert-manager.com/api"):
+            adapter = client.session.get_adapter(url)
+            self.assertEqual(adapter._pool_connections, 2)
+            self.assertEqual(adapter._pool_maxsize, 50)
+            self.assertEqual(adapter._pool_block, True)
+            self.assertEqual(adapter.tcp_keepalive, True)
+            self.assertIs(adapter.stats, client.connection_stats)
+
+    def test_no_keep_alive(self):
+        """A "Connection: close" header should be sent if keep_alive is False."""
+        client = Client(
+            login_uri=self.cfixt.login_uri, username=self.cfixt.username, password=self.cfixt.password,
+            keep_alive=False,
+        )
+
+        self.assertEqual(client.session.headers["Connection"], "close")
+
+    @responses.activate
+    def test_requests_counted(self):
+        """Every request should be counted in the connection stats."""
+        test_url = f"{self.cfixt.base_url}/test/url"
+        responses.add(responses.GET, test_url, json={}, status=200)
+
+        self.client.get(test_url)
+        self.client.get(test_url)
+
+        self.assertEqual(self.client.connection_stats.requests, 2)
+
+
 class TestProperties(TestClient):
     """Test the property methods in the class."""
 
@@ -548,3 +600,275 @@ class TestDelete(TestClient):
         # Still make sure it actually did a query and received a result
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.test_url)
+
+
+class TestRetry(TestClient):
+    """Test retrying requests with a RetryPolicy."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        # Call the inherited setUp method
+        super().setUp()
+
+        self.test_url = f"{self.cfixt.base_url}/test/url"
+        self.policy = RetryPolicy(max_attempts=3, backoff_factor=1, jitter=False)
+        self.client = Client(
+            base_url=self.cfixt.base_url, login_uri=self.cfixt.login_uri, username=self.cfixt.username,
+            password=self.cfixt.password, retry=self.policy,
+        )
+
+        # Don't actually wait between attempts
+        self.sleep = mock.patch("cert_manager.client.time.sleep").start()
+
+    @responses.activate
+    def test_no_policy(self):
+        """Requests should not be retried if no policy is set."""
+        responses.add(responses.GET, self.test_url, status=503)
+        responses.add(responses.GET, self.test_url, json={}, status=200)
+
+        self.assertRaises(HTTPError, self.cfixt.client.get, self.test_url)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_get(self):
+        """A GET should be retried until it succeeds."""
+        responses.add(responses.GET, self.test_url, status=503)
+        responses.add(responses.GET, self.test_url, status=429)
+        responses.add(responses.GET, self.test_url, json={"some": "data"}, status=200)
+
+        resp = self.client.get(self.test_url)
+
+        self.assertEqual(resp.json(), {"some": "data"})
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual([call.args[0] for call in self.sleep.call_args_list], [1, 2])
+
+    @responses.activate
+    def test_exhausted(self):
+        """The last error should be raised once max_attempts is reached."""
+        for _ in range(3):
+            responses.add(responses.PUT, self.test_url, status=502)
+
+        self.assertRaises(HTTPError, self.client.put, self.test_url, data={})
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_not_transient(self):
+        """Errors which are not transient should not be retried."""
+        responses.add(responses.DELETE, self.test_url, status=404)
+
+        self.assertRaises(HTTPError, self.client.delete, self.test_url)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_retry_after(self):
+        """The Retry-After header should be honoured."""
+        responses.add(responses.HEAD, self.test_url, status=429, headers={"Retry-After": "7"})
+        responses.add(responses.HEAD, self.test_url, status=200)
+
+        self.client.head(self.test_url)
+
+        self.assertEqual(len(responses.calls), 2)
+        self.sleep.assert_called_once_with(7.0)
+
+    @responses.activate
+    def test_connection_error(self):
+        """Connection errors should be retried for idempotent methods."""
+        responses.add(responses.GET, self.test_url, body=RequestsConnectionError("connection reset"))
+        responses.add(responses.GET, self.test_url, json={}, status=200)
+
+        self.client.get(self.test_url)
+
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_post_not_retried(self):
+        """A POST should not be retried by default."""
+        responses.add(responses.POST, self.test_url, status=503)
+        responses.add(responses.POST, self.test_url, json={}, status=200)
+
+        self.assertRaises(HTTPError, self.client.post, self.test_url, data={})
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_post_opt_in(self):
+        """A POST should be retried if retry is True."""
+        responses.add(responses.POST, self.test_url, status=503)
+        responses.add(responses.POST, self.test_url, json={"ok": True}, status=200)
+
+        resp = self.client.post(self.test_url, data={}, retry=True)
+
+        self.assertEqual(resp.json(), {"ok": True})
+        self.assertEqual(len(responses.calls), 2)
+
+
+class TestRateLimit(TestClient):
+    """Test rate limiting requests with a RateLimiter."""
+
+    @responses.activate
+    def test_acquire(self):
+        """Every request should wait on the rate limiter with its path relative to the base URL."""
+        test_url = f"{self.cfixt.base_url}/ssl/v1/types"
+        responses.add(responses.GET, test_url, json={}, status=200)
+        responses.add(responses.POST, test_url, json={}, status=200)
+
+        limiter = RateLimiter(prefixes={"/ssl": 1000})
+        client = Client(
+            base_url=self.cfixt.base_url, login_uri=self.cfixt.login_uri, username=self.cfixt.username,
+            password=self.cfixt.password, rate_limit=limiter,
+        )
+        self.assertIs(client.rate_limit, limiter)
+
+        with mock.patch.object(limiter, "acquire", wraps=limiter.acquire) as acquire:
+            client.get(test_url)
+            client.post(test_url, data={})
+
+        acquire.assert_has_calls([mock.call("/ssl/v1/types"), mock.call("/ssl/v1/types")])
+        self.assertEqual(limiter.stats()["prefixes"]["/ssl"]["acquired"], 2)
+
+    @responses.activate
+    def test_retries_limited(self):
+        """Every retried attempt should wait on the rate limiter as well."""
+        test_url = f"{self.cfixt.base_url}/dcv/v2/validation"
+        responses.add(responses.GET, test_url, status=503)
+        responses.add(responses.GET, test_url, json={}, status=200)
+
+        limiter = RateLimiter(rate=1000)
+        client = Client(
+            base_url=self.cfixt.base_url, login_uri=self.cfixt.login_uri, username=self.cfixt.username,
+            password=self.cfixt.password, rate_limit=limiter, retry=RetryPolicy(jitter=False, backoff_factor=0),
+        )
+        client.get(test_url)
+
+        self.assertEqual(limiter.stats()["global"]["acquired"], 2)
+
+
+class TestMetrics(TestClient):
+    """Test the per-request metrics callbacks."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        super().setUp()
+
+        self.collected = []
+        self.client.add_metrics_callback(self.collected.append)
+
+    @responses.activate
+    def test_success(self):
+        """A callback should receive the measurements of every request."""
+        test_url = f"{self.cfixt.base_url}/ssl/v1/collect/1234/x509CO"
+        responses.add(responses.POST, test_url, body="certificate", status=200)
+
+        self.client.post(test_url, data={"a": 1})
+
+        self.assertEqual(len(self.collected), 1)
+        metrics = self.collected[0]
+        self.assertEqual(metrics.method, "POST")
+        self.assertEqual(metrics.url, test_url)
+        self.assertEqual(metrics.endpoint, "/ssl/v1/collect/{id}/{format}")
+        self.assertEqual(metrics.status, 200)
+        self.assertEqual(metrics.bytes_out, len('{"a": 1}'))
+        self.assertEqual(metrics.bytes_in, len("certificate"))
+        self.assertEqual(metrics.retries, 0)
+        self.assertIsNone(metrics.error)
+        self.assertTrue(metrics.total >= metrics.server >= 0)
+        self.assertEqual(metrics.as_dict()["endpoint"], "/ssl/v1/collect/{id}/{format}")
+
+    @responses.activate
+    def test_retries(self):
+        """Retried attempts should be counted in the same measurement."""
+        test_url = f"{self.cfixt.base_url}/ssl/v1/types"
+        responses.add(responses.GET, test_url, status=503)
+        responses.add(responses.GET, test_url, json={}, status=200)
+
+        client = Client(
+            base_url=self.cfixt.base_url, login_uri=self.cfixt.login_uri, username=self.cfixt.username,
+            password=self.cfixt.password, retry=RetryPolicy(jitter=False, backoff_factor=0),
+            metrics=[self.collected.append],
+        )
+        client.get(test_url)
+
+        self.assertEqual(len(self.collected), 1)
+        self.assertEqual(self.collected[0].retries, 1)
+        self.assertEqual(self.collected[0].status, 200)
+
+    @responses.activate
+    def test_error(self):
+        """Failed requests should be reported, with the error if no response was received."""
+        test_url = f"{self.cfixt.base_url}/ssl/v1/types"
+        responses.add(responses.GET, test_url, status=404)
+        responses.add(responses.GET, test_url, body=RequestsConnectionError("refused"))
+
+        self.assertRaises(HTTPError, self.client.get, test_url)
+        self.assertRaises(RequestsConnectionError, self.client.get, test_url)
+
+        self.assertEqual(self.collected[0].status, 404)
+        self.assertIsNone(self.collected[0].error)
+        self.assertIsNone(self.collected[1].status)
+        self.assertTrue(isinstance(self.collected[1].error, RequestsConnectionError))
+
+    @responses.activate
+    def test_callback_failure(self):
+        """A failing callback should not fail the request or stop the other callbacks."""
+        test_url = f"{self.cfixt.base_url}/ssl/v1/types"
+        responses.add(responses.GET, test_url, json={}, status=200)
+
+        failing = mock.Mock(side_effect=ValueError("broken"))
+        client = Client(
+            base_url=self.cfixt.base_url, login_uri=self.cfixt.login_uri, username=self.cfixt.username,
+            password=self.cfixt.password, metrics=[failing, self.collected.append],
+        )
+        client.get(test_url)
+
+        failing.assert_called_once()
+        self.assertEqual(len(self.collected), 1)
+
+    @responses.activate
+    def test_remove(self):
+        """Removed callbacks should no longer be called."""
+        test_url = f"{self.cfixt.base_url}/ssl/v1/types"
+        responses.add(responses.GET, test_url, json={}, status=200)
+
+        self.client.remove_metrics_callback(self.collected.append)
+        self.client.remove_metrics_callback(self.collected.append)
+        self.client.get(test_url)
+
+        self.assertEqual(self.client.metrics_callbacks, ())
+        self.assertEqual(self.collected, [])
+
+    def test_connection_time(self):
+        """The time spent connecting should be measured for new connections only."""
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/api"
+        client = Client(
+            base_url=base_url, login_uri=self.cfixt.login_uri, username=self.cfixt.username,
+            password=self.cfixt.password, metrics=[self.collected.append],
+        )
+        client.get(f"{base_url}/ssl/v1/types")
+        client.get(f"{base_url}/ssl/v1/types")
+
+        self.assertTrue(self.collected[0].connect > 0)
+        self.assertEqual(self.collected[1].connect, 0)
+        self.assertEqual(self.collected[0].tls, 0)
+        self.assertEqual(self.collected[0].bytes_in, 2)
+
+
+class _OkHandler(http.server.BaseHTTPRequestHandler):
+    """Answer every GET with an empty JSON object over a kept-alive connection."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Send the response."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Do not log requests."""
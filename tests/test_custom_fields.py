@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._custom_fields.CustomFieldsValidator unit tests."""
+
+from testtools import TestCase
+
+from cert_manager._custom_fields import CustomFieldsValidator
+from cert_manager._helpers import CustomFieldsError
+
+
+class TestCustomFieldsValidator(TestCase):
+    """Test the CustomFieldsValidator class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        super().setUp()
+
+        self.fields = [
+            {"id": 57, "name": "testName", "mandatory": True},
+            {"id": 58, "name": "testName2", "mandatory": False},
+            {"id": 59, "name": "testName3", "mandatory": True},
+        ]
+        self.validator = CustomFieldsValidator(self.fields)
+
+    def values(self, *names):
+        """Build a list of custom field values with the given names."""
+        return [{"name": name, "value": "testValue"} for name in names]
+
+    def test_properties(self):
+        """It should expose the defined fields and the mandatory field names."""
+        self.assertEqual(self.validator.fields, self.fields)
+        self.assertEqual(self.validator.mandatory, ["testName", "testName3"])
+
+    def test_valid(self):
+        """It should accept the mandatory fields in any order, with optional fields."""
+        self.validator.validate(self.values("testName3", "testName"))
+        self.validator.validate(self.values("testName", "testName2", "testName3"))
+
+    def test_not_dict(self):
+        """It should reject values which are not dictionaries."""
+        error = self.assertRaises(CustomFieldsError, self.validator.validate, ["testName"])
+        self.assertIn("must be dictionaries", str(error))
+
+    def test_missing_keys(self):
+        """It should reject dictionaries without a name and a value."""
+        error = self.assertRaises(CustomFieldsError, self.validator.validate, [{"name": "testName"}])
+        self.assertIn("'name' key and 'value' key", str(error))
+
+    def test_undefined(self):
+        """It should reject fields which are not defined."""
+        error = self.assertRaises(CustomFieldsError, self.validator.validate, self.values("testName", "nope"))
+        self.assertIn("Custom field nope not defined", str(error))
+
+    def test_missing_mandatory(self):
+        """It should reject values missing a mandatory field."""
+        error = self.assertRaises(CustomFieldsError, self.validator.validate, self.values("testName", "testName2"))
+        self.assertEqual(str(error), "Missing mandatory custom field testName3")
+
+    def test_duplicate_mandatory(self):
+        """It should reject values giving a mandatory field twice."""
+        error = self.assertRaises(
+            CustomFieldsError, self.validator.validate, self.values("testName", "testName3", "testName")
+        )
+        self.assertEqual(str(error), "Too many custom field objects with name testName")
+
+    def test_remembered(self):
+        """The outcome for a list of names should be reused, raising a new exception each time."""
+        first = self.assertRaises(CustomFieldsError, self.validator.validate, self.values("testName"))
+        second = self.assertRaises(CustomFieldsError, self.validator.validate, self.values("testName"))
+        self.assertIsNot(first, second)
+        self.assertEqual(str(first), str(second))
+
+        # Malformed values are never remembered
+        self.assertRaises(CustomFieldsError, self.validator.validate, [{"name": "testName"}])
+        self.assertRaises(CustomFieldsError, self.validator.validate, [{"name": "testName"}])
+
+    def test_unhashable_name(self):
+        """It should still check values whose names cannot be used as keys."""
+        self.assertRaises(CustomFieldsError, self.validator.validate, [{"name": ["testName"], "value": "x"}])
+
+    def test_validate_many(self):
+        """It should return None or the error for each list, in order."""
+        errors = self.validator.validate_many([
+            self.values("testName", "testName3"), self.values("testName"), [], self.values("testName3", "testName"),
+        ])
+
+        self.assertEqual(errors[0], None)
+        self.assertTrue(isinstance(errors[1], CustomFieldsError))
+        self.assertTrue(isinstance(errors[2], CustomFieldsError))
+        self.assertEqual(errors[3], None)
+
+    def test_no_mandatory(self):
+        """Without mandatory fields, an empty list should be valid."""
+        validator = CustomFieldsValidator([{"id": 1, "name": "a", "mandatory": False}])
+        self.assertEqual(validator.validate_many([[], self.values("a")]), [None, None])
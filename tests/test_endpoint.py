@@ -4,6 +4,9 @@
 # pylint: disable=protected-access
 # pylint: disable=invalid-name
 
+import asyncio
+import threading
+
 from testtools import TestCase
 
 from cert_manager._endpoint import Endpoint
@@ -73,6 +76,73 @@ class TestProperties(TestEndpoint):
         self.assertEqual(end.api_url, self.api_url)
 
 
+class TestOverrideApiUrl(TestEndpoint):
+    """Test the _override_api_url method."""
+
+    def test_override(self):
+        """The URL should be overridden inside the block only."""
+        end = Endpoint(client=self.client, endpoint=self.ep_path)
+        other = Endpoint(client=self.client, endpoint=self.ep_path)
+
+        with end._override_api_url("https://other.example.com/api/test/v2"):
+            self.assertEqual(end.api_url, "https://other.example.com/api/test/v2")
+            self.assertEqual(end._url("/types"), "https://other.example.com/api/test/v2/types")
+            self.assertEqual(other.api_url, self.api_url)
+
+        self.assertEqual(end.api_url, self.api_url)
+
+    def test_exception(self):
+        """The URL should be restored when the block raises."""
+        end = Endpoint(client=self.client, endpoint=self.ep_path)
+
+        def fail():
+            with end._override_api_url("https://other.example.com/api/test/v2"):
+                raise ValueError("boom")
+
+        self.assertRaises(ValueError, fail)
+        self.assertEqual(end.api_url, self.api_url)
+
+    def test_threads(self):
+        """An override in one thread should not be seen by another thread using the same object."""
+        end = Endpoint(client=self.client, endpoint=self.ep_path)
+        overridden = threading.Event()
+        checked = threading.Event()
+        seen = []
+
+        def override():
+            with end._override_api_url("https://other.example.com/api/test/v2"):
+                overridden.set()
+                checked.wait(5)
+                seen.append(end.api_url)
+
+        thread = threading.Thread(target=override)
+        thread.start()
+        overridden.wait(5)
+        seen.append(end.api_url)
+        checked.set()
+        thread.join()
+
+        self.assertEqual(seen, [self.api_url, "https://other.example.com/api/test/v2"])
+
+    def test_tasks(self):
+        """An override in one asyncio task should not be seen by another task using the same object."""
+        end = Endpoint(client=self.client, endpoint=self.ep_path)
+
+        async def override(api_url):
+            with end._override_api_url(api_url):
+                await asyncio.sleep(0)
+                return end.api_url
+
+        async def run():
+            return await asyncio.gather(override("https://a.example.com/v1"), override("https://b.example.com/v2"))
+
+        loop = asyncio.new_event_loop()
+        try:
+            self.assertEqual(loop.run_until_complete(run()), ["https://a.example.com/v1", "https://b.example.com/v2"])
+        finally:
+            loop.close()
+
+
 class TestCreateApiUrl(TestEndpoint):
     """Test the create_api_url static function."""
 
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager.expiry.ExpiryIndex unit tests."""
+
+from datetime import date
+
+import mock
+from testtools import TestCase
+
+from cert_manager.expiry import ExpiryIndex
+
+
+class TestExpiryIndex(TestCase):
+    """Serve as a Base class for all tests of the ExpiryIndex class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        super().setUp()
+
+        self.certs = [
+            {"sslId": 1, "orgId": 10, "expires": "2024-03-20"},
+            {"sslId": 2, "orgId": 20, "expires": "2024-03-05"},
+            {"sslId": 3, "orgId": 10, "expires": "2024-04-30"},
+            {"id": 4, "orgId": 20, "expires": "2024-03-20T12:00:00.000+02:00"},
+            {"sslId": 5, "orgId": 10, "expires": "2024-03-25", "status": "Revoked"},
+            {"sslId": 6, "orgId": 10},
+            {"commonName": "no id", "expires": "2024-03-20"},
+        ]
+        self.index = ExpiryIndex(self.certs)
+
+
+class TestBuild(TestExpiryIndex):
+    """Test building the index."""
+
+    def test_skipped(self):
+        """Certificates without an ID or an expiry date should not be indexed."""
+        index = ExpiryIndex()
+
+        self.assertEqual(index.update(self.certs), 2)
+        self.assertEqual(len(index), 5)
+        self.assertIsNone(index.get(6))
+        self.assertEqual(index.get(4), self.certs[3])
+        self.assertEqual(sorted(index.org_ids), [10, 20])
+
+    def test_replace(self):
+        """Adding a certificate with an indexed ID should replace it."""
+        self.index.add({"sslId": 2, "orgId": 10, "expires": "2024-05-01"})
+
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual([c["expires"] for c in self.index.expiring(org_id=20)], ["2024-03-20T12:00:00.000+02:00"])
+        self.assertEqual(self.index.expiring("2024-05-01")[0]["sslId"], 2)
+
+    def test_update_replace(self):
+        """Updating with indexed IDs, or the same ID twice, should keep only the last certificate of each ID."""
+        skipped = self.index.update([
+            {"sslId": 1, "orgId": 20, "expires": "2024-06-01"},
+            {"sslId": 7, "orgId": 30, "expires": "2024-03-01"},
+            {"sslId": 7, "orgId": 30, "expires": "2024-07-01"},
+        ])
+
+        self.assertEqual(skipped, 0)
+        self.assertEqual(len(self.index), 6)
+        self.assertEqual([c.get("sslId", c.get("id")) for c in self.index.expiring()], [2, 4, 5, 3, 1, 7])
+        self.assertEqual([c.get("sslId", c.get("id")) for c in self.index.expiring(org_id=20)], [2, 4, 1])
+        self.assertEqual([c["sslId"] for c in self.index.expiring(org_id=10)], [5, 3])
+        self.assertEqual(self.index.get(7)["expires"], "2024-07-01")
+
+        self.index.remove(1)
+        self.index.remove(7)
+        self.assertEqual(sorted(self.index.org_ids), [10, 20])
+
+    def test_remove(self):
+        """Removing a certificate should drop it from every query, and ignore unknown IDs."""
+        self.index.remove(2)
+        self.index.remove(4)
+        self.index.remove(999)
+
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.org_ids, [10])
+        self.assertEqual(self.index.expiring(org_id=20), [])
+
+    def test_from_inventory(self):
+        """The index should be built from the records of an Inventory."""
+        inventory = mock.Mock()
+        inventory.all.return_value = self.certs[:2]
+
+        index = ExpiryIndex.from_inventory(inventory)
+
+        inventory.all.assert_called_once_with("ssl")
+        self.assertEqual(len(index), 2)
+
+
+class TestExpiring(TestExpiryIndex):
+    """Test the .expiring method."""
+
+    def test_range(self):
+        """The function should return the certificates in the range, both days included, sorted by expiry."""
+        data = self.index.expiring("2024-03-05", date(2024, 3, 20))
+
+        self.assertEqual([c.get("sslId", c.get("id")) for c in data], [2, 1, 4])
+
+    def test_open_ranges(self):
+        """The function should handle ranges without a start or an end."""
+        self.assertEqual([c["sslId"] for c in self.index.expiring(end="2024-03-05")], [2])
+        self.assertEqual([c["sslId"] for c in self.index.expiring(start="2024-04-01")], [3])
+        self.assertEqual(len(self.index.expiring()), 5)
+
+    def test_org(self):
+        """The function should only return the certificates of the organization."""
+        data = self.index.expiring("2024-03-01", "2024-03-31", org_id=10)
+
+        self.assertEqual([c["sslId"] for c in data], [1, 5])
+        self.assertEqual(self.index.expiring(org_id=99), [])
+
+    def test_invalid_dates(self):
+        """The function should raise a ValueError for a start or an end which is not a date."""
+        self.assertRaisesRegex(ValueError, "Invalid start date: 'soon'", self.index.expiring, "soon")
+        self.assertRaisesRegex(ValueError, "Invalid end date: ''", self.index.expiring, end="")
+
+
+class TestRenewalPlan(TestExpiryIndex):
+    """Test the .renewal_plan method."""
+
+    def test_plan(self):
+        """The function should yield the IDs expiring in the window, skipping revoked and expired certificates."""
+        plan = list(self.index.renewal_plan(window_days=30, today="2024-03-10"))
+
+        self.assertEqual(plan, [1, 4])
+
+    def test_include_expired(self):
+        """The function should also yield expired certificates if asked for."""
+        plan = list(self.index.renewal_plan(window_days=30, today="2024-03-10", include_expired=True))
+
+        self.assertEqual(plan, [2, 1, 4])
+
+    def test_org(self):
+        """The function should only yield the certificates of the organization."""
+        plan = list(self.index.renewal_plan(window_days=60, org_id=10, today=date(2024, 3, 10)))
+
+        self.assertEqual(plan, [1, 3])
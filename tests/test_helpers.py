@@ -6,6 +6,8 @@
 import json
 import logging
 import sys
+import threading
+import time
 import types
 
 import mock
@@ -14,7 +16,7 @@ from testtools import TestCase
 import requests
 import responses
 
-from cert_manager._helpers import paginate, traffic_log
+from cert_manager._helpers import paginate, run_concurrently, traffic_log
 
 
 class TestPaginate(TestCase):
@@ -91,6 +93,132 @@ class TestPaginate(TestCase):
         self.assertEqual(self.num_calls, len(self.test_data) + 1)
 
 
+class TestPaginatePrefetch(TestCase):
+    """Tests for the read-ahead mode of the cert_manager._helpers.paginate wrapper function."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        # Call the inherited setUp method
+        super().setUp()
+
+        self.test_data = [{"id": num} for num in range(10)]
+        self.positions = []
+        self.lock = threading.Lock()
+
+    @paginate
+    def fake_paging(self, size=None, position=None):
+        """Provide a thread-safe paging function which slices the test data by position."""
+        with self.lock:
+            self.positions.append(position)
+
+        return self.test_data[position:position + size]
+
+    def count(self):
+        """Provide a count method like the one on the SSL endpoint."""
+        return len(self.test_data)
+
+    def test_in_order(self):
+        """Results should be yielded in order when pages are fetched ahead."""
+        data = list(self.fake_paging(size=3, prefetch=4))
+
+        self.assertEqual(data, self.test_data)
+        # All pages up to the short one should have been requested
+        for position in (0, 3, 6, 9):
+            self.assertIn(position, self.positions)
+
+    def test_stops_on_short_page(self):
+        """No pages should be requested past the read-ahead window of the short last page."""
+        data = list(self.fake_paging(size=3, prefetch=2))
+
+        self.assertEqual(data, self.test_data)
+        # At most one page (prefetch - 1) may have been requested after the short page at position 9
+        self.assertEqual(sorted(self.positions)[:4], [0, 3, 6, 9])
+        self.assertTrue(set(self.positions) <= {0, 3, 6, 9, 12})
+
+    def test_exact_multiple(self):
+        """An empty last page should end the paging when the results are an exact multiple of the page size."""
+        data = list(self.fake_paging(size=5, prefetch=3))
+
+        self.assertEqual(data, self.test_data)
+
+    def test_total(self):
+        """No pages past the total should be requested."""
+        data = list(self.fake_paging(size=5, prefetch=3, total=len(self.test_data)))
+
+        self.assertEqual(data, self.test_data)
+        self.assertEqual(sorted(self.positions), [0, 5])
+
+    def test_total_from_count(self):
+        """The total should be retrieved from the count method if total is True."""
+        data = list(self.fake_paging(size=5, prefetch=3, total=True))
+
+        self.assertEqual(data, self.test_data)
+        self.assertEqual(sorted(self.positions), [0, 5])
+
+    def test_total_without_prefetch(self):
+        """The total should also limit the number of requests without read-ahead."""
+        data = list(self.fake_paging(size=5, total=True))
+
+        self.assertEqual(data, self.test_data)
+        self.assertEqual(self.positions, [0, 5])
+
+    def test_exception(self):
+        """An exception raised while fetching a page should be raised to the caller."""
+        def broken(**kwargs):  # pylint: disable=unused-argument
+            raise ValueError("broken page")
+
+        self.assertRaises(ValueError, list, paginate(broken)(prefetch=2))
+
+
+class TestRunConcurrently(TestCase):
+    """Tests for the cert_manager._helpers.run_concurrently function."""
+
+    def test_results(self):
+        """Every item should be yielded with its result."""
+        results = dict(run_concurrently(lambda num: num * 2, range(50), max_workers=4))
+
+        self.assertEqual(results, {num: num * 2 for num in range(50)})
+
+    def test_ordered(self):
+        """Results should be yielded in input order if ordered is True."""
+        def slow_first(num):
+            if num == 0:
+                time.sleep(0.05)
+            return num
+
+        results = list(run_concurrently(slow_first, range(10), max_workers=4, ordered=True))
+
+        self.assertEqual(results, [(num, num) for num in range(10)])
+
+    def test_exceptions(self):
+        """Exceptions should be yielded as results without stopping the other calls."""
+        def fail_odd(num):
+            if num % 2:
+                raise ValueError(num)
+            return num
+
+        results = dict(run_concurrently(fail_odd, range(6), max_workers=2))
+
+        self.assertEqual([results[num] for num in (0, 2, 4)], [0, 2, 4])
+        for num in (1, 3, 5):
+            self.assertTrue(isinstance(results[num], ValueError))
+
+    def test_bounded(self):
+        """Items should be taken from the input lazily."""
+        taken = []
+
+        def items():
+            for num in range(100):
+                taken.append(num)
+                yield num
+
+        results = run_concurrently(lambda num: num, items(), max_workers=2)
+        next(results)
+        results.close()
+
+        self.assertTrue(len(taken) <= 8)
+
+
 class TestTrafficLog(TestCase):
     """Tests for the cert_manager._helpers.traffic_log wrapper function."""
 
@@ -219,3 +347,78 @@ class TestTrafficLog(TestCase):
 
         # Make sure the proper exception is raised
         self.assertRaisesRegex(Exception, err_msg, self.bad_param_function, url=self.test_url)
+
+    @staticmethod
+    def response(body, content_type):
+        """Build a response with the given body and content type."""
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.headers["Content-Type"] = content_type
+        resp._content = body  # pylint: disable=protected-access
+
+        return resp
+
+    def test_disabled(self):
+        """Nothing should be logged or computed if the logger is not at the DEBUG level."""
+        logger = mock.Mock(spec=logging.Logger)
+        logger.isEnabledFor.return_value = False
+        resp = mock.Mock()
+
+        @traffic_log(traffic_logger=logger)
+        def request(_self, url=None):  # pylint: disable=unused-argument
+            """Return the response."""
+            return resp
+
+        self.assertIs(request(None, url=self.test_url), resp)
+        logger.isEnabledFor.assert_called_once_with(logging.DEBUG)
+        logger.debug.assert_not_called()
+        # The response was never inspected
+        self.assertEqual(resp.mock_calls, [])
+
+    def test_name_resolved_once(self):
+        """The function name should be worked out when decorating, not on every call."""
+        @traffic_log(traffic_logger=self.mock_logger)
+        def _get_thing_(_self, url=None):  # pylint: disable=unused-argument
+            """Return a response."""
+            return self.response(b"{}", "application/json")
+
+        with mock.patch("cert_manager._helpers.re.search") as search:
+            _get_thing_(None, url=self.test_url)
+
+        search.assert_not_called()
+        self.mock_logger.debug.assert_any_call(f"Performing a GET_THING on url: {self.test_url}")
+
+    def test_large_body(self):
+        """A body larger than TRAFFIC_LOG_MAX_BODY should be summarized."""
+        body = b"x" * 70000
+
+        @traffic_log(traffic_logger=self.mock_logger)
+        def request(_self, url=None):  # pylint: disable=unused-argument
+            """Return a large response."""
+            return self.response(body, "text/plain")
+
+        request(None, url=self.test_url)
+        self.mock_logger.debug.assert_any_call("Text result: <70000 bytes>")
+
+    def test_binary_body(self):
+        """A binary body should be summarized."""
+        @traffic_log(traffic_logger=self.mock_logger)
+        def request(_self, url=None):  # pylint: disable=unused-argument
+            """Return a binary response."""
+            return self.response(b"\x30\x82\x01", "application/pkcs7-mime")
+
+        request(None, url=self.test_url)
+        self.mock_logger.debug.assert_any_call("Text result: <3 bytes of application/pkcs7-mime>")
+
+    def test_streamed_body(self):
+        """A streamed body should never be read."""
+        resp = mock.Mock(status_code=200, headers={})
+
+        @traffic_log(traffic_logger=self.mock_logger)
+        def request(_self, url=None, stream=False):  # pylint: disable=unused-argument
+            """Return a streamed response."""
+            return resp
+
+        request(None, url=self.test_url, stream=True)
+        self.mock_logger.debug.assert_any_call("Text result: <streamed>")
+        self.assertNotIn("content", [call[0] for call in resp.mock_calls])
@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager.inventory.Inventory unit tests."""
+
+from datetime import date
+
+import mock
+from fixtures import TempDir
+from testtools import TestCase
+
+from cert_manager.inventory import Inventory
+
+
+class TestInventory(TestCase):
+    """Serve as a Base class for all tests of the Inventory class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        super().setUp()
+
+        self.today = date(2024, 3, 10)
+        patcher = mock.patch("cert_manager.inventory._today", side_effect=lambda: self.today)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.ssl = mock.Mock()
+        self.ssl.list.side_effect = lambda **kwargs: iter([
+            {"sslId": 1, "commonName": "a.example.com"},
+            {"sslId": 2, "commonName": "b.example.com"},
+        ])
+        self.report = mock.Mock()
+        self.report.get_windowed.return_value = iter([])
+
+        self.inventory = Inventory(":memory:", self.report, ssl=self.ssl)
+        self.addCleanup(self.inventory.close)
+
+
+class TestSync(TestInventory):
+    """Test the .sync method."""
+
+    def test_first_sync(self):
+        """The first sync should list all certificates."""
+        result = self.inventory.sync()
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0]["mode"], "full")
+        self.assertEqual(result[0]["updated"], 2)
+        self.assertEqual(self.inventory.count("ssl"), 2)
+        self.assertEqual(self.inventory.get("ssl", 1), {"sslId": 1, "commonName": "a.example.com"})
+        self.assertEqual(self.inventory.last_sync("ssl"), "2024-03-10")
+        self.report.get_windowed.assert_not_called()
+
+    def test_incremental(self):
+        """A later sync should only merge the report rows changed since the last sync."""
+        self.inventory.sync()
+        self.today = date(2024, 3, 12)
+        self.report.get_windowed.side_effect = lambda report_name, start, end, **kwargs: iter(
+            [{"id": 2, "status": "Revoked"}, {"id": 3, "commonName": "c.example.com"}]
+            if kwargs["certificateDateAttribute"] == 2 else []
+        )
+
+        result = self.inventory.sync("ssl")
+
+        self.assertEqual(result[0]["mode"], "incremental")
+        self.assertEqual(result[0]["updated"], 2)
+        self.assertEqual(self.ssl.list.call_count, 1)
+        self.assertEqual(self.inventory.count("ssl"), 3)
+        self.assertEqual(
+            self.inventory.get("ssl", 2), {"sslId": 2, "commonName": "b.example.com", "status": "Revoked"}
+        )
+        self.assertEqual(self.inventory.get("ssl", 3), {"sslId": 3, "commonName": "c.example.com"})
+        self.assertEqual(self.inventory.last_sync("ssl"), "2024-03-12")
+
+        attributes = []
+        for call in self.report.get_windowed.call_args_list:
+            self.assertEqual(call[0], ("ssl-certificates", date(2024, 3, 9), date(2024, 3, 12)))
+            attributes.append(call[1]["certificateDateAttribute"])
+        self.assertEqual(attributes, [2, 3, 4, 5])
+
+    def test_full_then_incremental(self):
+        """Records from full and incremental syncs should share the schema of the list results."""
+        self.inventory.sync()
+        self.today = date(2024, 3, 12)
+        self.report.get_windowed.side_effect = lambda report_name, start, end, **kwargs: iter(
+            [{"id": 3, "commonName": "c.example.com", "status": "Issued"}]
+            if kwargs["certificateDateAttribute"] == 5 else []
+        )
+        self.inventory.sync()
+        self.ssl.list.side_effect = lambda **kwargs: iter([
+            {"sslId": 1, "commonName": "a.example.com"},
+            {"sslId": 3, "commonName": "c.example.com", "status": "Issued"},
+        ])
+        self.today = date(2024, 3, 17)
+
+        result = self.inventory.sync()
+
+        self.assertEqual(result[0]["mode"], "full")
+        self.assertEqual(result[0]["removed"], 1)
+        records = self.inventory.all("ssl")
+        self.assertEqual([record["sslId"] for record in records], [1, 3])
+        self.assertFalse(any("id" in record for record in records))
+
+    def test_full_sync_due(self):
+        """A full sync should be done again after full_sync_days, removing certificates no longer listed."""
+        self.inventory.sync()
+        self.ssl.list.side_effect = lambda **kwargs: iter([{"sslId": 1, "commonName": "a.example.com"}])
+        self.today = date(2024, 3, 17)
+
+        result = self.inventory.sync()
+
+        self.assertEqual(result[0]["mode"], "full")
+        self.assertEqual(result[0]["removed"], 1)
+        self.assertEqual(self.inventory.all("ssl"), [{"sslId": 1, "commonName": "a.example.com"}])
+
+    def test_full_forced(self):
+        """A full sync should be done if asked for."""
+        self.inventory.sync()
+
+        result = self.inventory.sync(full=True)
+
+        self.assertEqual(result[0]["mode"], "full")
+        self.assertEqual(self.ssl.list.call_count, 2)
+
+    def test_failed_full_sync(self):
+        """A full sync failing part way should not remove anything or record a sync."""
+        self.inventory.sync()
+
+        def failing_list(**kwargs):  # pylint: disable=unused-argument
+            """Fail after the first certificate."""
+            yield {"sslId": 1, "commonName": "a.example.com"}
+            raise ValueError("boom")
+
+        self.ssl.list.side_effect = failing_list
+        self.today = date(2024, 3, 20)
+
+        self.assertRaises(ValueError, self.inventory.sync)
+        self.assertEqual(self.inventory.count("ssl"), 2)
+        self.assertEqual(self.inventory.last_sync("ssl"), "2024-03-10")
+
+    def test_prefetch(self):
+        """The prefetch parameter should be passed to list."""
+        inventory = Inventory(":memory:", self.report, ssl=self.ssl, prefetch=4)
+        self.addCleanup(inventory.close)
+
+        inventory.sync()
+
+        self.ssl.list.assert_called_once_with(prefetch=4)
+
+    def test_no_endpoint(self):
+        """The function should raise a ValueError for a kind without an endpoint object or an unknown kind."""
+        self.assertRaises(ValueError, self.inventory.sync, "smime")
+        self.assertRaises(ValueError, self.inventory.sync, "code-signing")
+
+
+class TestQueries(TestInventory):
+    """Test the query methods."""
+
+    def test_empty(self):
+        """The query methods should handle an empty inventory."""
+        self.assertIsNone(self.inventory.get("ssl", 1))
+        self.assertEqual(self.inventory.all("ssl"), [])
+        self.assertEqual(self.inventory.count("ssl"), 0)
+        self.assertIsNone(self.inventory.last_sync("ssl"))
+
+    def test_all_sorted(self):
+        """The records should be sorted by numeric ID, whatever the length of the IDs."""
+        self.ssl.list.side_effect = lambda **kwargs: iter([{"sslId": cert_id} for cert_id in (100, 9, 1234, 10)])
+        self.inventory.sync()
+
+        self.assertEqual([cert["sslId"] for cert in self.inventory.all("ssl")], [9, 10, 100, 1234])
+
+    def test_persisted(self):
+        """The records should be kept in the database file between runs."""
+        path = self.useFixture(TempDir()).join("inventory.db")
+
+        with Inventory(path, self.report, ssl=self.ssl) as inventory:
+            inventory.sync()
+        with Inventory(path, self.report) as inventory:
+            self.assertEqual(inventory.count("ssl"), 2)
+            self.assertEqual(inventory.last_sync("ssl"), "2024-03-10")
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._lazy.LazyLoader unit tests."""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import mock
+from testtools import TestCase
+
+from cert_manager._lazy import LazyLoader
+
+
+class TestLazyLoader(TestCase):
+    """Test the LazyLoader class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        super().setUp()
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.snapshot = os.path.join(self.tmpdir, "orgs.json")
+
+    def test_lazy(self):
+        """It should only fetch on first use, and again when forced."""
+        fetch = mock.Mock(side_effect=[[1], [2]])
+        loader = LazyLoader(fetch)
+
+        self.assertFalse(loader.loaded)
+        fetch.assert_not_called()
+
+        self.assertEqual(loader.get(), [1])
+        self.assertEqual(loader.get(), [1])
+        self.assertEqual(loader.get(force=True), [2])
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_exception(self):
+        """It should raise the fetch exception and fetch again on the next use."""
+        fetch = mock.Mock(side_effect=[ValueError("boom"), [1]])
+        loader = LazyLoader(fetch)
+
+        self.assertRaises(ValueError, loader.get)
+        self.assertFalse(loader.loaded)
+        self.assertEqual(loader.get(), [1])
+
+    def test_snapshot_written(self):
+        """It should write the fetched list to the snapshot file."""
+        loader = LazyLoader(lambda: [{"id": 1}], key="url", snapshot=self.snapshot)
+        loader.get()
+
+        with open(self.snapshot, "r", encoding="utf-8") as filep:
+            snapshot = json.load(filep)
+
+        self.assertEqual(snapshot["key"], "url")
+        self.assertEqual(snapshot["data"], [{"id": 1}])
+        self.assertEqual(os.listdir(self.tmpdir), ["orgs.json"])
+
+    def test_snapshot_used(self):
+        """It should use a recent snapshot for the same key instead of fetching."""
+        LazyLoader(lambda: [{"id": 1}], key="url", snapshot=self.snapshot).get()
+
+        fetch = mock.Mock(return_value=[{"id": 2}])
+        loader = LazyLoader(fetch, key="url", snapshot=self.snapshot)
+
+        self.assertEqual(loader.get(), [{"id": 1}])
+        fetch.assert_not_called()
+
+    def test_snapshot_other_key(self):
+        """It should ignore a snapshot written for another key."""
+        LazyLoader(lambda: [{"id": 1}], key="url", snapshot=self.snapshot).get()
+
+        loader = LazyLoader(lambda: [{"id": 2}], key="other", snapshot=self.snapshot)
+
+        self.assertEqual(loader.get(), [{"id": 2}])
+
+    def test_snapshot_too_old(self):
+        """It should ignore a snapshot older than snapshot_max_age."""
+        LazyLoader(lambda: [{"id": 1}], key="url", snapshot=self.snapshot).get()
+
+        loader = LazyLoader(lambda: [{"id": 2}], key="url", snapshot=self.snapshot, snapshot_max_age=60)
+        with mock.patch("cert_manager._lazy.time.time", return_value=time.time() + 61):
+            self.assertEqual(loader.get(), [{"id": 2}])
+
+    def test_snapshot_corrupt(self):
+        """It should ignore a snapshot file which is not valid JSON."""
+        with open(self.snapshot, "w", encoding="utf-8") as filep:
+            filep.write("{not json")
+
+        loader = LazyLoader(lambda: [{"id": 2}], key="url", snapshot=self.snapshot)
+
+        self.assertEqual(loader.get(), [{"id": 2}])
+
+    def test_refresh(self):
+        """It should refresh the list in the background after the first use until stopped."""
+        refreshed = threading.Event()
+        results = iter([[1], [2]])
+
+        def fetch():
+            try:
+                return next(results)
+            finally:
+                if loader.loaded:
+                    refreshed.set()
+
+        loader = LazyLoader(fetch, refresh=0.01)
+        self.addCleanup(loader.stop)
+
+        self.assertEqual(loader.get(), [1])
+        self.assertTrue(refreshed.wait(5))
+        loader.stop()
+        self.assertEqual(loader.get(), [2])
+
+    def test_refresh_failure(self):
+        """It should keep the current list if a background refresh fails."""
+        failed = threading.Event()
+
+        def fetch():
+            if loader.loaded:
+                failed.set()
+                raise ValueError("boom")
+            return [1]
+
+        loader = LazyLoader(fetch, refresh=0.01)
+        self.addCleanup(loader.stop)
+
+        loader.get()
+        self.assertTrue(failed.wait(5))
+        loader.stop()
+        self.assertEqual(loader.get(), [1])
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._metrics unit tests."""
+
+from testtools import TestCase
+
+from cert_manager._metrics import (
+    LatencyHistogram, RequestMetrics, endpoint_template, record_connection, take_connection_times,
+)
+
+
+class TestEndpointTemplate(TestCase):
+    """Test the endpoint_template function."""
+
+    def test_templates(self):
+        """Variable path segments should be replaced by placeholders."""
+        cases = {
+            "/ssl/v1/collect/1234/x509CO": "/ssl/v1/collect/{id}/{format}",
+            "/ssl/v1/types": "/ssl/v1/types",
+            "/smime/v1/revoke/serial/0A1B2C3D4E5F60718293": "/smime/v1/revoke/serial/{id}",
+            "/smime/v1/byPersonEmail/jdoe@example.com": "/smime/v1/byPersonEmail/{email}",
+            "/admin/v1/0f8fad5b-d9cb-469f-a165-70867728950e": "/admin/v1/{id}",
+            "/dcv/v2/validation/start/domain/cname": "/dcv/v2/validation/start/domain/cname",
+        }
+        for path, template in cases.items():
+            self.assertEqual(endpoint_template(path), template)
+
+
+class TestConnectionTimes(TestCase):
+    """Test recording the connection times."""
+
+    def test_take(self):
+        """Recorded times should add up until they are taken."""
+        take_connection_times()
+        record_connection(0.5, 1.0)
+        record_connection(0.25)
+
+        self.assertEqual(take_connection_times(), (0.75, 1.0))
+        self.assertEqual(take_connection_times(), (0.0, 0.0))
+
+
+class TestLatencyHistogram(TestCase):
+    """Test the LatencyHistogram class."""
+
+    @staticmethod
+    def metrics(endpoint, total, status=200):
+        """Build the metrics of a request."""
+        metrics = RequestMetrics("GET", f"https://certs.example.com/api{endpoint}", endpoint)
+        metrics.status = status
+        metrics.total = total
+
+        return metrics
+
+    def test_percentiles(self):
+        """Percentiles should be within the bucket width of the real values."""
+        histogram = LatencyHistogram()
+        for value in range(1, 101):
+            histogram(self.metrics("/ssl/v1/{id}", value / 100.0))
+        histogram(self.metrics("/ssl/v1/types", 0.0001, status=500))
+
+        stats = histogram.percentiles()
+
+        ssl = stats["GET /ssl/v1/{id}"]
+        self.assertEqual(ssl["count"], 100)
+        self.assertEqual(ssl["errors"], 0)
+        for quantile, expected in ((50, 0.5), (95, 0.95), (99, 0.99)):
+            self.assertTrue(expected <= ssl[f"p{quantile}"] <= expected * 1.05 * 1.05)
+
+        types = stats["GET /ssl/v1/types"]
+        self.assertEqual(types["count"], 1)
+        self.assertEqual(types["errors"], 1)
+        self.assertTrue(types["p50"] <= LatencyHistogram.MINIMUM * LatencyHistogram.GROWTH)
+
+    def test_dump(self):
+        """It should print one line per endpoint."""
+        histogram = LatencyHistogram()
+        histogram(self.metrics("/ssl/v1/types", 0.2))
+
+        self.assertEqual(histogram.dump(quantiles=(50,)).count("\n"), 0)
+        self.assertTrue(histogram.dump().startswith("GET /ssl/v1/types count=1 errors=0 p50="))
+
+    def test_field(self):
+        """It should aggregate the chosen duration."""
+        histogram = LatencyHistogram(field="server")
+        metrics = self.metrics("/ssl/v1/types", 10.0)
+        metrics.server = 0.1
+        histogram(metrics)
+
+        self.assertTrue(histogram.percentiles()["GET /ssl/v1/types"]["p99"] < 0.2)
+
+    def test_reset(self):
+        """It should forget everything."""
+        histogram = LatencyHistogram()
+        histogram(self.metrics("/ssl/v1/types", 0.2))
+        histogram.reset()
+
+        self.assertEqual(histogram.percentiles(), {})
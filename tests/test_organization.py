@@ -54,12 +54,14 @@ class TestInit(TestOrganization):
 
         org = Organization(client=self.client)
 
+        # Nothing should be fetched until the data is needed
+        self.assertEqual(len(responses.calls), 0)
+
         # Verify all the query information
+        self.assertEqual(org.all(), self.valid_response)
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.api_url)
 
-        self.assertEqual(org._Organization__orgs, self.valid_response)
-
     @responses.activate
     def test_param(self):
         """The URL should change if api_version is passed as a parameter."""
@@ -72,23 +74,26 @@ class TestInit(TestOrganization):
 
         org = Organization(client=self.client, api_version=version)
 
+        # Nothing should be fetched until the data is needed
+        self.assertEqual(len(responses.calls), 0)
+
         # Verify all the query information
+        self.assertEqual(org.all(), self.valid_response)
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, api_url)
 
-        self.assertEqual(org._Organization__orgs, self.valid_response)
-
     def test_need_client(self):
         """The class should raise an exception without a client parameter."""
         self.assertRaises(TypeError, Organization)
 
     @responses.activate
     def test_bad_http(self):
-        """The class should raise an HTTPError exception if organizations cannot be retrieved from the API."""
+        """The all method should raise an HTTPError exception if organizations cannot be retrieved from the API."""
         # Setup the mocked response
         responses.add(responses.GET, self.api_url, json=self.error_response, status=404)
 
-        self.assertRaises(HTTPError, Organization, client=self.client)
+        org = Organization(client=self.client)
+        self.assertRaises(HTTPError, org.all)
 
         # Verify all the query information
         self.assertEqual(len(responses.calls), 1)
@@ -108,7 +113,7 @@ class TestAll(TestOrganization):
         data = org.all()
 
         # Verify all the query information
-        # There should only be one call the first time "all" is called in the constructor.
+        # There should only be one call the first time "all" is called.
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.api_url)
         self.assertEqual(data, self.valid_response)
@@ -120,10 +125,11 @@ class TestAll(TestOrganization):
         responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
 
         org = Organization(client=self.client)
+        org.all()
         data = org.all(force=True)
 
         # Verify all the query information
-        # There should only be one call the first time "all" is called in the constructor.
+        # There should only be one call the first time "all" is called.
         self.assertEqual(len(responses.calls), 2)
         self.assertEqual(responses.calls[0].request.url, self.api_url)
         self.assertEqual(responses.calls[1].request.url, self.api_url)
@@ -143,7 +149,7 @@ class TestFind(TestOrganization):
         data = org.find(org_name="Some Organization")
 
         # Verify all the query information
-        # There should only be one call the first time "all" is called in the constructor.
+        # There should only be one call the first time "all" is called.
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.api_url)
         self.assertEqual(data, self.valid_response)
@@ -158,7 +164,7 @@ class TestFind(TestOrganization):
         data = org.find(dept_name="Org Unit 1")
 
         # Verify all the query information
-        # There should only be one call the first time "all" is called in the constructor.
+        # There should only be one call the first time "all" is called.
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.api_url)
         self.assertEqual(data[0], self.valid_response[0]["departments"][0])
@@ -173,7 +179,7 @@ class TestFind(TestOrganization):
         data = org.find(org_name="Some Organization", dept_name="Org Unit 1")
 
         # Verify all the query information
-        # There should only be one call the first time "all" is called in the constructor.
+        # There should only be one call the first time "all" is called.
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.api_url)
         self.assertEqual(data[0], self.valid_response[0]["departments"][0])
@@ -188,7 +194,7 @@ class TestFind(TestOrganization):
         data = org.find(org_name="Nonexistent Organization", dept_name="Org Unit 1")
 
         # Verify all the query information
-        # There should only be one call the first time "all" is called in the constructor.
+        # There should only be one call the first time "all" is called.
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.api_url)
         self.assertEqual(data, [])
@@ -203,7 +209,7 @@ class TestFind(TestOrganization):
         data = org.find(org_name="Nonexistent Organization")
 
         # Verify all the query information
-        # There should only be one call the first time "all" is called in the constructor.
+        # There should only be one call the first time "all" is called.
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.api_url)
         self.assertEqual(data, [])
@@ -218,7 +224,7 @@ class TestFind(TestOrganization):
         data = org.find(dept_name="Nonexistent Department")
 
         # Verify all the query information
-        # There should only be one call the first time "all" is called in the constructor.
+        # There should only be one call the first time "all" is called.
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.api_url)
         self.assertEqual(data, [])
@@ -233,7 +239,7 @@ class TestFind(TestOrganization):
         data = org.find()
 
         # Verify all the query information
-        # There should only be one call the first time "all" is called in the constructor.
+        # There should only be one call the first time "all" is called.
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.api_url)
         self.assertEqual(data, self.valid_response)
@@ -255,7 +261,106 @@ class TestFind(TestOrganization):
         data = org.find(dept_name="abc123")
 
         # Verify all the query information
-        # There should only be one call the first time "all" is called in the constructor.
+        # There should only be one call the first time "all" is called.
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.api_url)
         self.assertEqual(data, [])
+
+    @responses.activate
+    def test_refreshed(self):
+        """The function should search the new data after the organizations are fetched again."""
+        new_response = [{"id": 5678, "name": "New Organization", "certTypes": [], "departments": [
+            {"id": 8765, "name": "Org Unit 1", "certTypes": ["SSL"]},
+        ]}]
+        # Setup the mocked responses
+        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
+        responses.add(responses.GET, self.api_url, json=new_response, status=200)
+
+        org = Organization(client=self.client)
+        data = org.find(dept_name="Org Unit 1")
+        org.all(force=True)
+        data2 = org.find(dept_name="Org Unit 1")
+
+        self.assertEqual(data, [self.valid_response[0]["departments"][0]])
+        self.assertEqual(data2, new_response[0]["departments"])
+
+    @responses.activate
+    def test_duplicate_names(self):
+        """The function should return every organization and department sharing a name, in order."""
+        org_data = [
+            {"id": 1, "name": "Some Organization", "departments": [{"id": 11, "name": "Org Unit 1"}]},
+            {"id": 2, "name": "Another Organization", "departments": [{"id": 21, "name": "Org Unit 1"}]},
+            {"id": 3, "name": "Some Organization", "departments": [{"id": 31, "name": "Org Unit 1"}]},
+        ]
+        # Setup the mocked response
+        responses.add(responses.GET, self.api_url, json=org_data, status=200)
+
+        org = Organization(client=self.client)
+
+        self.assertEqual(org.find(org_name="Some Organization"), [org_data[0], org_data[2]])
+        self.assertEqual([d["id"] for d in org.find(dept_name="Org Unit 1")], [11, 21, 31])
+        self.assertEqual(
+            [d["id"] for d in org.find(org_name="Some Organization", dept_name="Org Unit 1")], [11, 31]
+        )
+
+
+class TestGetById(TestOrganization):
+    """Test the .get_by_id method."""
+
+    @responses.activate
+    def test_org(self):
+        """The function should return the organization with the ID."""
+        # Setup the mocked response
+        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
+
+        org = Organization(client=self.client)
+
+        self.assertEqual(org.get_by_id(1234), self.valid_response[0])
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_dept(self):
+        """The function should return the department with the ID."""
+        # Setup the mocked response
+        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
+
+        org = Organization(client=self.client)
+
+        self.assertEqual(org.get_by_id(4322), self.valid_response[0]["departments"][1])
+
+    @responses.activate
+    def test_ne_id(self):
+        """The function should return None if the ID doesn't exist."""
+        # Setup the mocked response
+        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
+
+        org = Organization(client=self.client)
+
+        self.assertIsNone(org.get_by_id(9999))
+
+
+class TestFindDepartmentPath(TestOrganization):
+    """Test the .find_department_path method."""
+
+    @responses.activate
+    def test_dept(self):
+        """The function should return the organization and the department."""
+        # Setup the mocked response
+        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
+
+        org = Organization(client=self.client)
+        data = org.find_department_path(4323)
+
+        self.assertEqual(data, (self.valid_response[0], self.valid_response[0]["departments"][2]))
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_ne_dept(self):
+        """The function should return None for an organization ID or a missing ID."""
+        # Setup the mocked response
+        responses.add(responses.GET, self.api_url, json=self.valid_response, status=200)
+
+        org = Organization(client=self.client)
+
+        self.assertIsNone(org.find_department_path(1234))
+        self.assertIsNone(org.find_department_path(9999))
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._poller.IssuancePoller unit tests."""
+
+import threading
+
+import mock
+import responses
+from testtools import TestCase
+
+from cert_manager._helpers import Pending, Revoked
+from cert_manager._poller import IssuancePoller
+from cert_manager.ssl import SSL
+
+from .lib.testbase import ClientFixture
+
+
+class FakeClock:
+    """Provide a clock which only moves forward when slept on."""
+
+    def __init__(self):
+        """Initialize the class."""
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        """Return the current fake time."""
+        return self.now
+
+    def sleep(self, seconds):
+        """Move the fake time forward."""
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestIssuancePoller(TestCase):
+    """Test the IssuancePoller class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        # Call the inherited setUp method
+        super().setUp()
+
+        self.clock = FakeClock()
+        patcher = mock.patch("cert_manager._poller.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch("cert_manager._poller.random.uniform", return_value=1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Certificate ID -> number of times it is still pending before being issued
+        self.pending_for = {}
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def collect(self, cert_id):
+        """Provide a fake collect function."""
+        with self.lock:
+            self.calls.append((cert_id, self.clock.now))
+            if self.pending_for[cert_id] == "revoked":
+                raise Revoked(f"certificate {cert_id} in 'revoked' state")
+            if self.pending_for[cert_id] > 0:
+                self.pending_for[cert_id] -= 1
+                raise Pending(f"certificate {cert_id} still in 'pending' state")
+
+        return f"cert-{cert_id}"
+
+    def test_backoff(self):
+        """Each certificate should be collected again with an increasing delay until issued."""
+        self.pending_for = {1: 3}
+        poller = IssuancePoller(self.collect, initial_delay=5, backoff=2, max_delay=15)
+        poller.add(1)
+
+        results = list(poller.poll())
+
+        self.assertEqual(results, [(1, "cert-1")])
+        self.assertEqual([when - 1000 for _, when in self.calls], [0, 5, 15, 30])
+        self.assertEqual(len(poller), 0)
+
+    def test_independent_schedules(self):
+        """Certificates issued quickly should not wait for the slow ones."""
+        self.pending_for = {1: 0, 2: 1, 3: 4}
+        poller = IssuancePoller(self.collect, initial_delay=1, backoff=2)
+        for cert_id in (1, 2, 3):
+            poller.add(cert_id)
+
+        results = list(poller.poll())
+
+        self.assertEqual([cert_id for cert_id, _ in results], [1, 2, 3])
+        self.assertEqual(len([call for call in self.calls if call[0] == 1]), 1)
+        self.assertEqual(len([call for call in self.calls if call[0] == 3]), 5)
+
+    def test_revoked(self):
+        """Revoked certificates should be yielded with the exception and not collected again."""
+        self.pending_for = {1: "revoked"}
+        poller = IssuancePoller(self.collect)
+        poller.add(1)
+
+        results = list(poller.poll())
+
+        self.assertEqual(len(results), 1)
+        self.assertTrue(isinstance(results[0][1], Revoked))
+        self.assertEqual(len(self.calls), 1)
+
+    def test_timeout(self):
+        """Certificates still pending at the timeout should be yielded with a Pending exception."""
+        self.pending_for = {1: 100, 2: 0}
+        poller = IssuancePoller(self.collect, initial_delay=10, timeout=25)
+        poller.add(1)
+        poller.add(2)
+
+        results = dict(poller.poll())
+
+        self.assertEqual(results[2], "cert-2")
+        self.assertTrue(isinstance(results[1], Pending))
+        self.assertTrue(self.clock.now - 1000 <= 25)
+
+    def test_add_twice(self):
+        """Adding a certificate already tracked should be ignored."""
+        self.pending_for = {1: 0}
+        poller = IssuancePoller(self.collect)
+        poller.add(1)
+        poller.add(1)
+
+        self.assertEqual(len(poller), 1)
+        self.assertEqual(list(poller.poll()), [(1, "cert-1")])
+
+
+class TestWaitForIssuance(TestCase):
+    """Test the wait_for_issuance method of the certificate endpoints."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        # Call the inherited setUp method
+        super().setUp()
+
+        self.cfixt = self.useFixture(ClientFixture())
+        self.api_url = f"{self.cfixt.base_url}/ssl/v1"
+
+        patcher = mock.patch("cert_manager._poller.time", FakeClock())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @responses.activate
+    def test_ssl(self):
+        """Pending SSL certificates should be collected until issued."""
+        test_url = f"{self.api_url}/collect/1234/x509CO"
+        responses.add(responses.GET, test_url, json={"code": -183}, status=400)
+        responses.add(responses.GET, test_url, body="-----BEGIN CERTIFICATE-----", status=200)
+
+        ssl = SSL(client=self.cfixt.client)
+        results = list(ssl.wait_for_issuance([1234], "x509CO", initial_delay=1))
+
+        self.assertEqual(results, [(1234, "-----BEGIN CERTIFICATE-----")])
+        self.assertEqual(len(responses.calls), 2)
+
+    def test_bad_format(self):
+        """It should raise a ValueError if the format is invalid."""
+        ssl = SSL(client=self.cfixt.client)
+
+        self.assertRaises(ValueError, ssl.wait_for_issuance, [1234], "notaformat")
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._ratelimit unit tests."""
+
+import asyncio
+import threading
+
+import mock
+from testtools import TestCase
+
+from cert_manager._ratelimit import RateLimiter, TokenBucket
+
+
+class TestTokenBucket(TestCase):
+    """Test the TokenBucket class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        # Call the inherited setUp method
+        super().setUp()
+
+        # Freeze the clock so the refill is deterministic
+        self.now = 100.0
+        patcher = mock.patch("cert_manager._ratelimit.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_bad_rate(self):
+        """A rate of zero or less should raise an exception."""
+        self.assertRaises(ValueError, TokenBucket, 0)
+
+    def test_burst(self):
+        """The burst should be available immediately, then callers should wait for their turn."""
+        bucket = TokenBucket(rate=2, burst=3)
+
+        self.assertEqual([bucket.reserve() for _ in range(5)], [0, 0, 0, 0.5, 1.0])
+        self.assertEqual(bucket.stats(), {"rate": 2.0, "burst": 3, "acquired": 5, "waited": 2, "wait_time": 1.5})
+
+    def test_refill(self):
+        """Tokens should be added back at the configured rate, up to the burst."""
+        bucket = TokenBucket(rate=2, burst=2)
+        bucket.reserve()
+        bucket.reserve()
+
+        self.now += 0.5
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertEqual(bucket.reserve(), 0.5)
+
+        self.now += 100
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0.5])
+
+    def test_default_burst(self):
+        """The default burst should be the rate rounded up."""
+        self.assertEqual(TokenBucket(rate=2.5).burst, 3)
+        self.assertEqual(TokenBucket(rate=0.2).burst, 1)
+
+
+class TestRateLimiter(TestCase):
+    """Test the RateLimiter class."""
+
+    def test_no_limit(self):
+        """Without any buckets, requests should never wait."""
+        limiter = RateLimiter()
+
+        self.assertEqual(limiter.reserve("/ssl/v1"), 0)
+        self.assertEqual(limiter.stats(), {"prefixes": {}})
+
+    def test_prefixes(self):
+        """Only the bucket of the longest matching prefix should apply."""
+        limiter = RateLimiter(prefixes={"ssl": 1, "/ssl/v1/collect": (1, 2), "/dcv/": 1})
+
+        for _ in range(2):
+            limiter.reserve("/ssl/v1/collect/1234/x509")
+        limiter.reserve("/ssl/v1/types")
+        limiter.reserve("/report/v1/ssl-certificates")
+
+        stats = limiter.stats()["prefixes"]
+        self.assertEqual(stats["/ssl/v1/collect"]["acquired"], 2)
+        self.assertEqual(stats["/ssl"]["acquired"], 1)
+        self.assertEqual(stats["/dcv"]["acquired"], 0)
+
+    def test_global_and_prefix(self):
+        """Both the global and the prefix bucket should apply, with the longest delay returned."""
+        limiter = RateLimiter(rate=100, burst=100, prefixes={"/ssl": (1, 1)})
+
+        self.assertEqual(limiter.reserve("/ssl/v1"), 0)
+        self.assertTrue(limiter.reserve("/ssl/v1") > 0.9)
+        self.assertEqual(limiter.stats()["global"]["acquired"], 2)
+
+    @mock.patch("cert_manager._ratelimit.time.sleep")
+    def test_acquire(self, mock_sleep):
+        """The thread should sleep only when a token is not available."""
+        limiter = RateLimiter(rate=1, burst=1)
+
+        self.assertEqual(limiter.acquire(), 0)
+        mock_sleep.assert_not_called()
+
+        delay = limiter.acquire()
+        mock_sleep.assert_called_once_with(delay)
+
+    def test_acquire_async(self):
+        """The coroutine should wait with asyncio.sleep when a token is not available."""
+        limiter = RateLimiter(rate=50, burst=1)
+
+        async def run():
+            return await asyncio.gather(*[limiter.acquire_async("/ssl") for _ in range(3)])
+
+        delays = asyncio.run(run())
+
+        self.assertEqual(delays[0], 0)
+        self.assertTrue(delays[2] > delays[1] > 0)
+        self.assertEqual(limiter.stats()["global"]["waited"], 2)
+
+    def test_threads(self):
+        """Tokens should be handed out exactly once across threads."""
+        limiter = RateLimiter(rate=1000, burst=1000)
+
+        threads = [threading.Thread(target=lambda: [limiter.reserve() for _ in range(100)]) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(limiter.stats()["global"]["acquired"], 800)
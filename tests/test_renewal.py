@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager.renewal.BulkRenewer unit tests."""
+
+import json
+
+import mock
+from fixtures import TempDir
+from testtools import TestCase
+
+from cert_manager.renewal import BulkRenewer
+
+
+class TestBulkRenewer(TestCase):
+    """Test the BulkRenewer class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        super().setUp()
+
+        self.checkpoint = self.useFixture(TempDir()).join("renew.jsonl")
+
+    @staticmethod
+    def renew(cert_id):
+        """Renew a certificate, failing for odd IDs."""
+        if cert_id % 2:
+            raise ValueError(f"cannot renew {cert_id}")
+        return {"renewed": cert_id}
+
+    def test_run(self):
+        """It should renew every certificate and report each outcome."""
+        renewer = BulkRenewer(self.renew, max_workers=3)
+
+        outcomes = sorted(renewer.run(range(1, 7)), key=lambda outcome: outcome["id"])
+
+        self.assertEqual([o["id"] for o in outcomes], [1, 2, 3, 4, 5, 6])
+        self.assertEqual([o["ok"] for o in outcomes], [False, True] * 3)
+        self.assertEqual(outcomes[1]["result"], {"renewed": 2})
+        self.assertEqual(outcomes[0]["error"], "cannot renew 1")
+        self.assertEqual(renewer.summary(), {"ok": 3, "failed": 3})
+
+    def test_checkpoint(self):
+        """It should write one line per outcome to the checkpoint file."""
+        renewer = BulkRenewer(self.renew, checkpoint=self.checkpoint)
+        list(renewer.run([1, 2]))
+
+        with open(self.checkpoint, "r", encoding="utf-8") as filep:
+            lines = [json.loads(line) for line in filep]
+
+        self.assertEqual(sorted((line["id"], line["ok"]) for line in lines), [(1, False), (2, True)])
+
+    def test_resume(self):
+        """It should skip the certificates renewed in an earlier run and retry the failed ones."""
+        list(BulkRenewer(self.renew, checkpoint=self.checkpoint).run([1, 2]))
+
+        renew = mock.Mock(return_value={})
+        renewer = BulkRenewer(renew, checkpoint=self.checkpoint)
+        outcomes = list(renewer.run([1, 2, 3]))
+
+        self.assertEqual(sorted(call[0][0] for call in renew.call_args_list), [1, 3])
+        self.assertEqual(len(outcomes), 2)
+        self.assertEqual(renewer.summary(), {"ok": 3, "failed": 0})
+
+    def test_no_retry_failed(self):
+        """It should skip the failed certificates too if retry_failed is False."""
+        list(BulkRenewer(self.renew, checkpoint=self.checkpoint).run([1, 2]))
+
+        renew = mock.Mock(return_value={})
+        list(BulkRenewer(renew, checkpoint=self.checkpoint, retry_failed=False).run([1, 2, 3]))
+
+        renew.assert_called_once_with(3)
+
+    def test_truncated_checkpoint(self):
+        """It should ignore a line cut short by a crash and keep the next outcomes readable."""
+        with open(self.checkpoint, "w", encoding="utf-8") as filep:
+            filep.write(json.dumps({"id": 2, "ok": True}) + "\n" + '{"id": 4, "o')
+
+        renew = mock.Mock(return_value={})
+        list(BulkRenewer(renew, checkpoint=self.checkpoint).run([2, 4]))
+        renewer = BulkRenewer(renew, checkpoint=self.checkpoint)
+
+        renew.assert_called_once_with(4)
+        self.assertEqual(renewer.summary(), {"ok": 2, "failed": 0})
+
+    def test_for_ssl(self):
+        """It should renew SSL certificates by ID."""
+        ssl = mock.Mock()
+        ssl.renew.return_value = {}
+
+        list(BulkRenewer.for_ssl(ssl).run([1234]))
+
+        ssl.renew.assert_called_once_with(1234)
+
+    def test_for_smime(self):
+        """It should renew S/MIME certificates by serial or order number."""
+        smime = mock.Mock()
+        smime.renew.return_value = {}
+
+        list(BulkRenewer.for_smime(smime).run(["AB12"]))
+        list(BulkRenewer.for_smime(smime, by="order").run([42]))
+
+        self.assertEqual(smime.renew.call_args_list, [mock.call(serial_num="AB12"), mock.call(order_num=42)])
+        self.assertRaises(ValueError, BulkRenewer.for_smime, smime, by="email")
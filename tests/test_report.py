@@ -5,7 +5,9 @@
 # pylint: disable=no-member
 
 import json
+from datetime import date, datetime
 
+import mock
 from testtools import TestCase
 
 import responses
@@ -264,6 +266,39 @@ class TestGet(TestReport):
         self.assertEqual(data, self.valid_ssl_cert_report_response)
         self.assertEqual(json.loads(responses.calls[0].request.body.decode('utf-8')), filter_data)
 
+    @responses.activate
+    def test_stream(self):
+        """The function should return an iterator over the report rows if stream is True."""
+
+        api_url = f"{self.api_url}/ssl-certificates"
+        filter_data = {"organizationIds": ['51']}
+
+        # Setup the mocked response
+        responses.add(
+            responses.POST,
+            api_url,
+            json=self.valid_ssl_cert_report_response,
+            match=[responses.matchers.json_params_matcher(filter_data)],
+            status=200
+        )
+
+        report = Report(client=self.client)
+        data = report.get("ssl-certificates", stream=True, **filter_data)
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(list(data), self.valid_ssl_cert_report_response["reports"])
+
+    @responses.activate
+    def test_stream_bad_http(self):
+        """The function should raise a ValueError before returning the iterator if the report request fails."""
+
+        api_url = f"{self.api_url}/ssl-certificates"
+
+        responses.add(responses.POST, api_url, json=self.error_response, status=400)
+
+        report = Report(client=self.client)
+        self.assertRaises(ValueError, report.get, "ssl-certificates", stream=True)
+
 
 class TestGetSSLCert(TestReport):
     """Test the .get_ssl_certs method."""
@@ -309,6 +344,21 @@ class TestGetSSLCert(TestReport):
         self.assertEqual(data, self.valid_ssl_cert_report_response)
         self.assertEqual(json.loads(responses.calls[0].request.body.decode('utf-8')), filter_data)
 
+    @responses.activate
+    def test_report_ssl_cert_stream(self):
+        """The function should yield the SSL Cert report rows if stream is True."""
+
+        api_url = f"{self.api_url}/ssl-certificates"
+
+        # Setup the mocked response
+        responses.add(responses.POST, api_url, json=self.valid_ssl_cert_report_response, status=200)
+
+        report = Report(client=self.client)
+        data = report.get_ssl_certs(stream=True)
+
+        self.assertEqual(list(data), self.valid_ssl_cert_report_response["reports"])
+        self.assertEqual(json.loads(responses.calls[0].request.body.decode('utf-8')), {})
+
 
 class TestGetActivity(TestReport):
     """Test the .get_activity method."""
@@ -434,3 +484,92 @@ class TestGetDeviceCert(TestReport):
         self.assertEqual(responses.calls[0].request.url, api_url)
         self.assertEqual(data, self.valid_device_cert_report_response)
         self.assertEqual(json.loads(responses.calls[0].request.body.decode('utf-8')), filter_data)
+
+
+class TestGetWindowed(TestReport):
+    """Test the .get_windowed method."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        super().setUp()
+
+        self.report_url = f"{self.api_url}/ssl-certificates"
+        self.rows = {
+            "2024-01-01": [{"id": 1}, {"id": 2}],
+            "2024-01-11": [{"id": 2}, {"id": 3}],
+            "2024-01-21": [{"id": 4}, {"commonName": "no id"}],
+        }
+
+    def _callback(self, request):
+        """Return the rows for the window in the request body."""
+        body = json.loads(request.body)
+        return 200, {}, json.dumps({"statusCode": 0, "reports": self.rows.get(body["from"], [])})
+
+    @responses.activate
+    def test_windows(self):
+        """The function should request each window and yield the rows in order without duplicates."""
+        responses.add_callback(responses.POST, self.report_url, callback=self._callback)
+
+        report = Report(client=self.client)
+        data = list(report.get_windowed(
+            "ssl-certificates", "2024-01-01", date(2024, 1, 25), window_days=10, certificateStatus=2,
+        ))
+
+        self.assertEqual(data, [{"id": 1}, {"id": 2}, {"id": 3}, {"id": 4}, {"commonName": "no id"}])
+        bodies = sorted((json.loads(call.request.body) for call in responses.calls), key=lambda body: body["from"])
+        self.assertEqual(bodies, [
+            {"certificateStatus": 2, "from": "2024-01-01", "to": "2024-01-10"},
+            {"certificateStatus": 2, "from": "2024-01-11", "to": "2024-01-20"},
+            {"certificateStatus": 2, "from": "2024-01-21", "to": "2024-01-25"},
+        ])
+
+    @responses.activate
+    def test_single_window(self):
+        """The function should send one request if the range fits in one window."""
+        responses.add_callback(responses.POST, self.report_url, callback=self._callback)
+
+        report = Report(client=self.client)
+        data = list(report.get_windowed("ssl-certificates", datetime(2024, 1, 1, 12), "2024-01-05"))
+
+        self.assertEqual(data, [{"id": 1}, {"id": 2}])
+        self.assertEqual(len(responses.calls), 1)
+
+    def test_streamed(self):
+        """Each window should be streamed, and the responses not read closed when the iteration stops early."""
+        received = []
+
+        def post(url, data, stream):  # pylint: disable=unused-argument
+            response = mock.Mock(encoding="utf-8")
+            response.iter_content.return_value = iter([json.dumps({"reports": self.rows[data["from"]]}).encode()])
+            received.append((stream, response))
+            return response
+
+        report = Report(client=self.client)
+        with mock.patch.object(self.client, "post", side_effect=post):
+            data = report.get_windowed("ssl-certificates", "2024-01-01", "2024-01-25", window_days=10)
+            self.assertEqual(next(data), {"id": 1})
+            data.close()
+
+        self.assertEqual(len(received), 3)
+        for stream, response in received:
+            self.assertTrue(stream)
+            response.close.assert_called()
+
+    @responses.activate
+    def test_failed_window(self):
+        """The function should raise the error of a failed window."""
+        responses.add(responses.POST, self.report_url, json=self.error_response, status=400)
+
+        report = Report(client=self.client)
+
+        self.assertRaises(
+            ValueError, list, report.get_windowed("ssl-certificates", "2024-01-01", "2024-01-25", window_days=10)
+        )
+
+    def test_bad_window_days(self):
+        """The function should raise a ValueError if window_days is less than 1."""
+        report = Report(client=self.client)
+
+        self.assertRaises(
+            ValueError, list, report.get_windowed("ssl-certificates", "2024-01-01", "2024-01-25", window_days=0)
+        )
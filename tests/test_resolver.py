@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager.resolver unit tests."""
+
+import sys
+
+import mock
+from testtools import TestCase
+
+from cert_manager.resolver import ConcurrentResolver, PyDNSResolver, Resolver, StubResolver
+
+
+class TestStubResolver(TestCase):
+    """Test the StubResolver class."""
+
+    def test_resolve(self):
+        """It should answer from its records, ignoring case and trailing dots."""
+        resolver = StubResolver({"_a.Example.com.": "a.dcv.example."})
+
+        self.assertEqual(resolver.resolve_cname("_a.example.com"), "a.dcv.example")
+        self.assertEqual(resolver.resolve_cname("_b.example.com"), None)
+        self.assertEqual(resolver.queries, ["_a.example.com", "_b.example.com"])
+
+    def test_add(self):
+        """It should add, replace and remove records."""
+        resolver = StubResolver()
+        resolver.add("_a.example.com", "one.example")
+        resolver.add("_a.example.com", "two.example")
+        self.assertEqual(resolver.resolve_cname("_a.example.com"), "two.example")
+
+        resolver.add("_a.example.com", None)
+        self.assertEqual(resolver.resolve_cname("_a.example.com"), None)
+
+    def test_exception(self):
+        """It should raise an exception set as a target, and resolve_many should return it."""
+        error = OSError("timeout")
+        resolver = StubResolver({"_a.example.com": error, "_b.example.com": "b.example"})
+
+        self.assertRaises(OSError, resolver.resolve_cname, "_a.example.com")
+        answers = resolver.resolve_many(["_a.example.com", "_b.example.com", "_b.example.com"])
+        self.assertEqual(answers, {"_a.example.com": error, "_b.example.com": "b.example"})
+        # Duplicates are only looked up once
+        self.assertEqual(resolver.queries.count("_b.example.com"), 1)
+
+    def test_base(self):
+        """The base class, and subclasses without resolve_cname, should not be instantiated."""
+
+        class Incomplete(Resolver):  # pylint: disable=abstract-method
+            """Do not implement resolve_cname."""
+
+        self.assertRaises(TypeError, Resolver)
+        self.assertRaises(TypeError, Incomplete)
+
+
+class TestConcurrentResolver(TestCase):
+    """Test the ConcurrentResolver class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        super().setUp()
+
+        self.stub = StubResolver({"_a.example.com": "a.dcv.example", "_e.example.com": OSError("timeout")})
+        self.resolver = ConcurrentResolver(self.stub, max_workers=4, negative_ttl=60)
+
+    def test_resolve_many(self):
+        """It should look up each distinct host once."""
+        hosts = ["_a.example.com", "_b.example.com", "_e.example.com"] * 3 + [f"_{i}.example.org" for i in range(20)]
+
+        answers = self.resolver.resolve_many(hosts)
+
+        self.assertEqual(answers["_a.example.com"], "a.dcv.example")
+        self.assertEqual(answers["_b.example.com"], None)
+        self.assertTrue(isinstance(answers["_e.example.com"], OSError))
+        self.assertEqual(len(answers), 23)
+        self.assertEqual(len(self.stub.queries), 23)
+
+    def test_negative_cache(self):
+        """Hosts without a record should not be looked up again until the negative TTL passes."""
+        with mock.patch("cert_manager._cache.time.monotonic", return_value=100):
+            self.assertEqual(self.resolver.resolve_cname("_b.example.com"), None)
+            self.stub.add("_b.example.com", "b.dcv.example")
+            self.assertEqual(self.resolver.resolve_cname("_B.example.com."), None)
+
+        with mock.patch("cert_manager._cache.time.monotonic", return_value=161):
+            self.assertEqual(self.resolver.resolve_cname("_b.example.com"), "b.dcv.example")
+
+        self.assertEqual(self.stub.queries, ["_b.example.com", "_b.example.com"])
+
+    def test_positive_not_cached(self):
+        """Hosts with a record and failed lookups should be looked up every time."""
+        self.resolver.resolve_many(["_a.example.com", "_e.example.com"])
+        self.resolver.resolve_many(["_a.example.com", "_e.example.com"])
+
+        self.assertEqual(len(self.stub.queries), 4)
+
+    def test_positive_discard(self):
+        """Positive answers should not scan the negative cache."""
+        with mock.patch("cert_manager._cache.TTLCache.invalidate") as invalidate:
+            self.resolver.resolve_many(["_a.example.com", "_b.example.com"])
+
+        invalidate.assert_not_called()
+
+    def test_clear(self):
+        """It should forget the hosts without a record."""
+        self.resolver.resolve_cname("_b.example.com")
+        self.resolver.clear()
+        self.resolver.resolve_cname("_b.example.com")
+
+        self.assertEqual(len(self.stub.queries), 2)
+
+    def test_default(self):
+        """It should use a PyDNSResolver by default."""
+        self.assertTrue(isinstance(ConcurrentResolver().resolver, PyDNSResolver))
+
+
+class TestPyDNSResolver(TestCase):
+    """Test the PyDNSResolver class."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        super().setUp()
+
+        self.dns = mock.Mock()
+        self.dns.defaults = {"server": []}
+        self.dns.DnsRequest.return_value.req.return_value.answers = [
+            {"typename": "CNAME", "data": "a.dcv.example."},
+        ]
+        patcher = mock.patch.dict(sys.modules, {"DNS": self.dns})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_resolve(self):
+        """It should query the system name servers for the CNAME record."""
+        resolver = PyDNSResolver(timeout=2)
+
+        self.assertEqual(resolver.resolve_cname("_a.example.com"), "a.dcv.example")
+        self.dns.DiscoverNameServers.assert_called_once_with()
+        self.dns.DnsRequest.assert_called_once_with(name="_a.example.com", qtype="CNAME", timeout=2)
+
+    def test_servers(self):
+        """It should query the given name servers."""
+        resolver = PyDNSResolver(servers=("192.0.2.53",))
+
+        resolver.resolve_cname("_a.example.com")
+        self.dns.DiscoverNameServers.assert_not_called()
+        self.dns.DnsRequest.assert_called_once_with(
+            name="_a.example.com", qtype="CNAME", timeout=5, server=["192.0.2.53"]
+        )
+
+    def test_no_record(self):
+        """It should return None if there is no CNAME answer."""
+        self.dns.DnsRequest.return_value.req.return_value.answers = [{"typename": "A", "data": "192.0.2.1"}]
+
+        self.assertEqual(PyDNSResolver().resolve_cname("_a.example.com"), None)
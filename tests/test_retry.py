@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._retry.RetryPolicy unit tests."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import mock
+from testtools import TestCase
+
+from cert_manager._retry import RetryPolicy
+
+
+class TestInit(TestCase):
+    """Test the class initializer."""
+
+    def test_defaults(self):
+        """Idempotent methods and transient statuses should be retried by default."""
+        policy = RetryPolicy()
+
+        for method in ("GET", "HEAD", "PUT", "DELETE", "get"):
+            self.assertTrue(policy.retries_method(method))
+        self.assertFalse(policy.retries_method("POST"))
+
+        for status in (429, 502, 503, 504):
+            self.assertTrue(policy.retries_status(status))
+        for status in (200, 400, 404, 500):
+            self.assertFalse(policy.retries_status(status))
+
+    def test_params(self):
+        """The retried methods and statuses should be configurable."""
+        policy = RetryPolicy(methods=["get", "post"], statuses=[500])
+
+        self.assertTrue(policy.retries_method("POST"))
+        self.assertFalse(policy.retries_method("PUT"))
+        self.assertTrue(policy.retries_status(500))
+        self.assertFalse(policy.retries_status(503))
+
+
+class TestBackoff(TestCase):
+    """Test the backoff and next_delay methods."""
+
+    def test_exponential(self):
+        """Without jitter, the delay should double with every attempt up to max_backoff."""
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=False)
+
+        self.assertEqual([policy.backoff(attempt) for attempt in range(1, 6)], [1, 2, 4, 5, 5])
+
+    def test_jitter(self):
+        """With jitter, the delay should be between 0 and the exponential delay."""
+        policy = RetryPolicy(backoff_factor=1, max_backoff=60)
+
+        for attempt in range(1, 6):
+            delay = policy.backoff(attempt)
+            self.assertTrue(0 <= delay <= 2 ** (attempt - 1))
+
+    def test_retry_after_seconds(self):
+        """A Retry-After header in seconds should be used as the delay."""
+        policy = RetryPolicy(backoff_factor=1, jitter=False)
+        response = mock.Mock(headers={"Retry-After": "7"})
+
+        self.assertEqual(policy.backoff(1, response), 7)
+
+    def test_retry_after_not_capped(self):
+        """A Retry-After header should be honoured in full, even beyond max_backoff."""
+        policy = RetryPolicy(max_backoff=3)
+        response = mock.Mock(headers={"Retry-After": "120"})
+
+        self.assertEqual(policy.backoff(1, response), 120)
+
+    def test_retry_after_budget(self):
+        """No delay should be returned if the Retry-After header does not fit in max_elapsed."""
+        policy = RetryPolicy(max_backoff=3, max_elapsed=100)
+
+        with mock.patch("cert_manager._retry.time.monotonic", return_value=10):
+            self.assertEqual(policy.next_delay(1, 0, mock.Mock(headers={"Retry-After": "60"})), 60)
+            self.assertIsNone(policy.next_delay(1, 0, mock.Mock(headers={"Retry-After": "120"})))
+
+    def test_retry_after_ignored(self):
+        """The Retry-After header should be ignored if respect_retry_after is False."""
+        policy = RetryPolicy(backoff_factor=1, jitter=False, respect_retry_after=False)
+        response = mock.Mock(headers={"Retry-After": "7"})
+
+        self.assertEqual(policy.backoff(1, response), 1)
+
+    def test_max_attempts(self):
+        """No delay should be returned once max_attempts is reached."""
+        policy = RetryPolicy(max_attempts=3, jitter=False)
+        started = 0
+
+        with mock.patch("cert_manager._retry.time.monotonic", return_value=0):
+            self.assertIsNotNone(policy.next_delay(1, started))
+            self.assertIsNotNone(policy.next_delay(2, started))
+            self.assertIsNone(policy.next_delay(3, started))
+
+    def test_max_elapsed(self):
+        """No delay should be returned if waiting would exceed max_elapsed."""
+        policy = RetryPolicy(backoff_factor=4, jitter=False, max_elapsed=10)
+
+        with mock.patch("cert_manager._retry.time.monotonic", return_value=5):
+            self.assertEqual(policy.next_delay(1, 0), 4)
+            self.assertIsNone(policy.next_delay(2, 0))
+
+
+class TestParseRetryAfter(TestCase):
+    """Test the parse_retry_after method."""
+
+    def test_seconds(self):
+        """Numbers of seconds should be parsed."""
+        self.assertEqual(RetryPolicy.parse_retry_after("30"), 30)
+        self.assertEqual(RetryPolicy.parse_retry_after("-5"), 0)
+
+    def test_date(self):
+        """HTTP dates should be converted to a number of seconds from now."""
+        when = datetime.now(timezone.utc) + timedelta(seconds=60)
+        delay = RetryPolicy.parse_retry_after(format_datetime(when, usegmt=True))
+
+        self.assertTrue(55 <= delay <= 60)
+
+    def test_invalid(self):
+        """Missing or invalid values should return None."""
+        self.assertIsNone(RetryPolicy.parse_retry_after(None))
+        self.assertIsNone(RetryPolicy.parse_retry_after(""))
+        self.assertIsNone(RetryPolicy.parse_retry_after("not a date"))
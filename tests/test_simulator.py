@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""Define the tests.lib.simulator.Simulator unit tests."""
+# Don't warn about things that happen as that is part of unit testing
+# pylint: disable=protected-access
+# pylint: disable=invalid-name
+
+import io
+import json
+import threading
+import time
+
+import mock
+import requests
+from requests import HTTPError
+from testtools import TestCase
+
+from cert_manager import ACMEAccount, Admin, Client, Domain, Organization, Person, Report, SMIME, SSL
+from cert_manager._cache import METADATA_CACHE
+from cert_manager._helpers import Pending, Revoked, run_concurrently
+from cert_manager.validation import Validation
+
+from .lib.simulator import Simulator
+
+
+class TestSimulator(TestCase):
+    """Serve as a Base class for all tests of the Simulator class, running it on a local port."""
+
+    simulator_kwargs = {}
+
+    def setUp(self):
+        """Initialize the class."""
+        super().setUp()
+
+        self.simulator = Simulator(**self.simulator_kwargs)
+        self.simulator.start()
+        self.addCleanup(self.simulator.stop)
+
+        self.client = Client(base_url=self.simulator.base_url, login_uri="Testing123", username="test_user",
+                             password="test_password")
+        self.addCleanup(self.client.session.close)
+
+        METADATA_CACHE.invalidate()
+        self.addCleanup(METADATA_CACHE.invalidate)
+
+
+class TestSSL(TestSimulator):
+    """Test the SSL endpoints."""
+
+    simulator_kwargs = {"ssl_certs": 5, "max_page_size": 2, "pending_polls": 1}
+
+    def test_list(self):
+        """Lists should be paginated, with the total in the X-Total-Count header."""
+        ssl = SSL(client=self.client)
+
+        certs = list(ssl.list(size=2))
+
+        self.assertEqual(len(certs), 5)
+        self.assertEqual(len({cert["sslId"] for cert in certs}), 5)
+        self.assertEqual(ssl.count(), 5)
+        self.assertEqual(self.simulator.counts["GET /ssl/v1"], 3)
+
+    def test_enroll_collect(self):
+        """A new certificate should be pending until it was polled pending_polls times."""
+        ssl = SSL(client=self.client)
+
+        result = ssl.enroll(cert_type_name="InCommon SSL (SHA-2)", csr="CSR", term=365, org_id=1)
+
+        self.assertRaises(Pending, ssl.collect, result["sslId"], "x509CO")
+        self.assertIn("BEGIN CERTIFICATE", ssl.collect(result["sslId"], "x509CO"))
+        self.assertEqual(ssl.get(result["sslId"])["status"], "Issued")
+
+    def test_renew_revoke(self):
+        """Renewing should create a new certificate and revoking should change the status."""
+        ssl = SSL(client=self.client)
+        cert_id = list(ssl.list())[0]["sslId"]
+
+        self.assertIn("renewId", ssl.renew(cert_id))
+        ssl.revoke(cert_id, reason="test")
+
+        self.assertEqual(ssl.get(cert_id)["status"], "Revoked")
+        self.assertEqual(ssl.count(), 6)
+
+    def test_not_found(self):
+        """Unknown objects and paths should answer 404."""
+        ssl = SSL(client=self.client)
+
+        self.assertRaises(HTTPError, ssl.get, 1)
+        self.assertRaises(HTTPError, self.client.get, f"{self.simulator.base_url}/nothing/v1")
+
+
+class TestSMIME(TestSimulator):
+    """Test the S/MIME endpoints, some of which are in v2."""
+
+    simulator_kwargs = {"smime_certs": 3}
+
+    def test_list(self):
+        """It should list the certificates, all or by e-mail."""
+        smime = SMIME(client=self.client)
+
+        certs = list(smime.list())
+
+        self.assertEqual(len(certs), 3)
+        self.assertEqual(smime.list_by_email(email=certs[0]["email"]), [certs[0]])
+
+    def test_enroll_renew_revoke(self):
+        """Certificates should be enrolled, renewed by serial and revoked by order number."""
+        smime = SMIME(client=self.client)
+
+        result = smime.enroll(cert_type_name="InCommon Client Certificate", csr="CSR", term=365, org_id=1,
+                              email="fry@example.org", first_name="Philip", last_name="Fry", phone="555")
+        cert = self.simulator.get("smime", result["orderNumber"])
+        renewed = smime.renew(serial_num=cert["serialNumber"])
+        smime.revoke(cert_id=result["orderNumber"], reason="test")
+
+        self.assertIn("BEGIN CERTIFICATE", smime.collect(renewed["orderNumber"]))
+        self.assertRaises(Revoked, smime.collect, result["orderNumber"])
+
+
+class TestDomains(TestSimulator):
+    """Test the domain and DCV endpoints."""
+
+    simulator_kwargs = {"domains": 2}
+
+    def test_domain(self):
+        """Domains should be created with a Location header, counted and changed."""
+        domain = Domain(client=self.client)
+
+        created = domain.create("new.example.com", 1, ["SSL"])
+        domain.suspend(created["id"])
+        domain.delegate(created["id"], 2, ["SSL"])
+
+        record = domain.get(created["id"])
+        self.assertEqual(record["state"], "SUSPENDED")
+        self.assertEqual([item["orgId"] for item in record["delegations"]], [1, 2])
+        self.assertEqual(domain.count(), {"count": 3})
+        self.assertRaises(ValueError, domain.create, "new.example.com", 1, ["SSL"])
+
+    def test_dcv(self):
+        """A started DCV should be validated once submitted."""
+        dcv = Validation(client=self.client)
+
+        started = dcv.start("domain0.example.com", "cname")
+        submitted = dcv.submit("domain0.example.com", "cname")
+
+        self.assertTrue(started["host"].endswith(".domain0.example.com."))
+        self.assertEqual(submitted["status"], "VALIDATED")
+        self.assertEqual(dcv.status("domain0.example.com")["status"], "VALIDATED")
+        self.assertEqual([row["dcvStatus"] for row in dcv.find()], ["VALIDATED", "NOT_VALIDATED"])
+        self.assertRaises(HTTPError, dcv.submit, "domain1.example.com", "cname")
+
+
+class TestOtherEndpoints(TestSimulator):
+    """Test the ACME, person, organization, admin and report endpoints."""
+
+    simulator_kwargs = {"ssl_certs": 2}
+
+    def test_acme(self):
+        """ACME accounts should be created and hold domains."""
+        acme = ACMEAccount(client=self.client)
+
+        created = acme.create("account", "https://acme.example.com", 1)
+        acme.add_domains(created["id"], ["a.example.com", "b.example.com"])
+        removed = acme.remove_domains(created["id"], ["a.example.com", "c.example.com"])
+
+        self.assertEqual(removed, {"notRemovedDomains": ["c.example.com"]})
+        self.assertEqual(acme.list_domains(created["id"]), [{"name": "b.example.com"}])
+        self.assertEqual([account["id"] for account in acme.find(1)], [created["id"]])
+
+    def test_person(self):
+        """People should be created and found by e-mail."""
+        person = Person(client=self.client)
+
+        person_id = person.create("Philip", "fry@example.org", "STANDARD", 1)
+        person.update(person_id, firstName="Phil", lastName="Fry", email="fry@example.org", validationType="HIGH")
+
+        self.assertEqual(person.find("fry@example.org"), person_id)
+        self.assertEqual(person.get(person_id)["firstName"], "Phil")
+        person.delete(person_id)
+        self.assertIsNone(person.find("fry@example.org"))
+
+    def test_admin_organization(self):
+        """Admins should be created and organizations listed."""
+        admin = Admin(client=self.client)
+
+        created = admin.create("fry", "fry@example.org", "Philip", "Fry", "secret", [])
+
+        self.assertEqual(admin.get(created["id"])["login"], "fry")
+        self.assertEqual(admin.get_idps(), [{"id": 1, "name": "Local"}])
+        self.assertEqual(Organization(client=self.client).all()[0]["name"], "Example Org")
+
+    def test_report(self):
+        """Reports should list the certificates."""
+        report = Report(client=self.client)
+
+        self.assertEqual(len(report.get_ssl_certs()["reports"]), 2)
+        self.assertEqual(report.get_ssl_certs(**{"from": "2000-01-01", "to": "2000-12-31"})["reports"], [])
+
+
+class TestFaults(TestSimulator):
+    """Test the latency and error injection."""
+
+    simulator_kwargs = {"ssl_certs": 1}
+
+    def test_add_fault(self):
+        """A fault should fail the matching requests count times, with its headers."""
+        self.simulator.add_fault(r"^/ssl/v1/\d+$", status=429, count=1, headers={"Retry-After": "1"})
+        ssl = SSL(client=self.client)
+        cert_id = list(ssl.list())[0]["sslId"]
+
+        exc = self.assertRaises(HTTPError, ssl.get, cert_id)
+        self.assertEqual(exc.response.status_code, 429)
+        self.assertEqual(exc.response.headers["Retry-After"], "1")
+        self.assertEqual(ssl.get(cert_id)["sslId"], cert_id)
+
+    def test_error_rate(self):
+        """Requests should fail at random with the error status."""
+        self.simulator.error_rate = 1.0
+        ssl = SSL(client=self.client)
+
+        exc = self.assertRaises(HTTPError, ssl.count)
+        self.assertEqual(exc.response.status_code, 503)
+
+        self.simulator.error_rate = 0.0
+        self.assertEqual(ssl.count(), 1)
+
+    def test_latency(self):
+        """Responses should be delayed by the latency."""
+        self.simulator.latency = (0.05, 0.06)
+        ssl = SSL(client=self.client)
+
+        started = time.monotonic()
+        ssl.count()
+
+        self.assertTrue(time.monotonic() - started >= 0.05)
+
+    def test_keep_alive(self):
+        """Requests should reuse the same connection."""
+        ssl = SSL(client=self.client)
+        for _ in range(3):
+            ssl.count()
+
+        self.assertEqual(self.client.connection_stats.as_dict()["new_connections"], 1)
+
+
+class TestConcurrency(TestSimulator):
+    """Test answering requests concurrently."""
+
+    simulator_kwargs = {"ssl_certs": 2, "domains": 1}
+
+    def test_handlers_not_serialized(self):
+        """A slow handler should not hold up the requests to other handlers."""
+        started = threading.Event()
+        release = threading.Event()
+        page = self.simulator._page
+
+        def slow_page(*args):
+            started.set()
+            release.wait(5)
+            return page(*args)
+
+        with mock.patch.object(self.simulator, "_page", side_effect=slow_page):
+            thread = threading.Thread(target=requests.get, args=(f"{self.simulator.base_url}/ssl/v1",),
+                                      kwargs={"timeout": 5})
+            thread.start()
+            self.assertTrue(started.wait(5))
+            try:
+                self.assertEqual(Domain(client=self.client).count(), {"count": 1})
+                self.assertTrue(thread.is_alive())
+            finally:
+                release.set()
+                thread.join()
+
+    def test_concurrent_changes(self):
+        """Concurrent requests changing the objects should not lose any change."""
+        url = f"{self.simulator.base_url}/ssl/v1/enroll"
+
+        def enroll(_):
+            return requests.post(url, json={"certType": 224, "term": 365}, timeout=5).json()["sslId"]
+
+        def collect(cert_id):
+            return requests.get(f"{self.simulator.base_url}/ssl/v1/collect/{cert_id}/x509", timeout=5).status_code
+
+        results = list(run_concurrently(enroll, range(20), max_workers=8))
+        cert_ids = [cert_id for _, cert_id in results]
+        self.assertEqual(len(set(cert_ids)), 20)
+
+        results = list(run_concurrently(collect, cert_ids[:1] * 10, max_workers=8))
+        self.assertEqual([status for _, status in results], [200] * 10)
+        self.assertEqual(self.simulator.get("ssl", cert_ids[0])["polls"], 10)
+
+
+class TestWSGI(TestCase):
+    """Test calling the Simulator as a WSGI application."""
+
+    def test_call(self):
+        """It should answer a WSGI request."""
+        simulator = Simulator(prefix="/", domains=1)
+        body = json.dumps({"domain": "domain0.example.com"}).encode("utf-8")
+        statuses = []
+
+        chunks = simulator({
+            "REQUEST_METHOD": "POST", "PATH_INFO": "/dcv/v2/validation/start/domain/email", "QUERY_STRING": "",
+            "CONTENT_LENGTH": str(len(body)), "wsgi.input": io.BytesIO(body), "HTTP_HOST": "localhost",
+        }, lambda status, headers: statuses.append(status))
+
+        self.assertEqual(statuses, ["200 OK"])
+        self.assertEqual(json.loads(b"".join(chunks))["emails"][0], "admin@domain0.example.com")
+
+    def test_method_not_allowed(self):
+        """A known path with an unsupported method should answer 405."""
+        simulator = Simulator()
+        statuses = []
+
+        simulator({
+            "REQUEST_METHOD": "DELETE", "PATH_INFO": "/api/ssl/v1", "QUERY_STRING": "", "HTTP_HOST": "localhost",
+        }, lambda status, headers: statuses.append(status))
+
+        self.assertEqual(statuses, ["405 Method Not Allowed"])
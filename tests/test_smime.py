@@ -5,6 +5,8 @@
 # pylint: disable=invalid-name
 
 import json
+import threading
+
 import responses
 from requests import HTTPError
 from testtools import TestCase
@@ -140,6 +142,37 @@ class TestListByEmail(TestSMIME):
         self.assertEqual(len(responses.calls), 1)
         self.assertEqual(responses.calls[0].request.url, self.test_url)
 
+    @responses.activate
+    def test_concurrent_versions(self):
+        """A v1 call made while a v2 call is in flight on the same object should still use the v1 URL."""
+        collect_url = f"{self.cfixt.base_url}{self.ep_path}/v1/collect/1234"
+        started = threading.Event()
+        collected = threading.Event()
+
+        def list_callback(request):  # pylint: disable=unused-argument
+            started.set()
+            collected.wait(5)
+            return 200, {}, json.dumps(self.test_result)
+
+        def collect_callback(request):  # pylint: disable=unused-argument
+            collected.set()
+            return 200, {}, "certificate"
+
+        responses.add_callback(responses.GET, self.test_url, callback=list_callback)
+        responses.add_callback(responses.GET, collect_url, callback=collect_callback)
+
+        smime = SMIME(client=self.client)
+        listed = []
+        thread = threading.Thread(target=lambda: listed.extend(smime.list_by_email(email=self.test_email)))
+        thread.start()
+        started.wait(5)
+        result = smime.collect(1234)
+        thread.join()
+
+        self.assertEqual(result, "certificate")
+        self.assertEqual(listed, self.test_result)
+        self.assertEqual(sorted(call.request.url for call in responses.calls), sorted([self.test_url, collect_url]))
+
 
 # pylint: disable=too-many-instance-attributes
 class TestEnroll(TestSMIME):
@@ -284,6 +317,43 @@ class TestEnroll(TestSMIME):
         self.assertEqual(responses.calls[2].request.url, self.test_url)
 
 
+class TestEnrollMany(TestSMIME):
+    """Test the enroll_many method."""
+
+    def setUp(self):
+        """Initialize the class."""
+        super().setUp()
+
+        self.test_types_url = f"{self.api_url}/types"
+        self.types_data = [{"id": 15702, "name": "Sectigo SMIME", "terms": [365]}]
+        self.test_customfields_url = f"{self.api_url}/customFields"
+        self.test_url = f"{self.api_url}/enroll"
+        self.test_result = {"orderNumber": 123456, "backendCertId": "123456"}
+
+    @responses.activate
+    def test_success(self):
+        """It should return the results in the order of the requests, with exceptions for invalid requests."""
+        responses.add(responses.GET, self.test_types_url, json=self.types_data, status=200)
+        responses.add(responses.GET, self.test_customfields_url, json=[], status=200)
+        responses.add(responses.POST, self.test_url, json=self.test_result, status=200)
+
+        params = {
+            "cert_type_name": "Sectigo SMIME", "csr": TestCertificates.fake_csr(), "term": 365, "org_id": 1234,
+            "first_name": "Dr.", "last_name": "Zoidberg",
+        }
+        smime = SMIME(client=self.client)
+        results = smime.enroll_many([
+            dict(params, email="a@example.org"), dict(params, term=42), dict(params, email="b@example.org"),
+        ])
+
+        self.assertEqual(results[0], self.test_result)
+        self.assertTrue(isinstance(results[1], Exception))
+        self.assertEqual(results[2], self.test_result)
+        self.assertEqual(len(responses.calls), 4)
+        emails = sorted(json.loads(call.request.body)["email"] for call in responses.calls[2:])
+        self.assertEqual(emails, ["a@example.org", "b@example.org"])
+
+
 class TestCollect(TestSMIME):
     """Test the collect method."""
 
@@ -366,6 +436,32 @@ class TestCollect(TestSMIME):
         self.assertEqual(responses.calls[0].request.url, self.test_url)
 
 
+class TestCollectMany(TestSMIME):
+    """Test the collect_many method."""
+
+    @responses.activate
+    def test_results(self):
+        """It should yield every certificate, or the exception raised for it, with its ID."""
+        cert = TestCertificates.fake_cert()
+        responses.add(responses.GET, f"{self.api_url}/collect/1", body=cert, status=200)
+        responses.add(
+            responses.GET, f"{self.api_url}/collect/2", json={"code": -183, "description": "not collectable"},
+            status=400,
+        )
+        responses.add(
+            responses.GET, f"{self.api_url}/collect/3", json={"code": -192, "description": "revoked"}, status=400
+        )
+
+        smime = SMIME(client=self.client)
+        results = dict(smime.collect_many([1, 2, 3], cert_format="x509", max_workers=3))
+
+        self.assertEqual(results[1], cert)
+        self.assertTrue(isinstance(results[2], Pending))
+        self.assertTrue(isinstance(results[3], Revoked))
+        for call in responses.calls:
+            self.assertTrue(call.request.url.endswith("?format=x509"))
+
+
 class TestRenew(TestSMIME):
     """Test the renew method."""
 
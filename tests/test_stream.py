@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Define the cert_manager._stream unit tests."""
+
+import json
+
+import mock
+from testtools import TestCase
+
+from cert_manager._stream import iter_json_items, iter_response_items
+
+
+def _chunked(text, size):
+    """Split a string into chunks of the given size."""
+    return [text[pos:pos + size] for pos in range(0, len(text), size)]
+
+
+class TestIterJsonItems(TestCase):
+    """Test the iter_json_items function."""
+
+    def setUp(self):  # pylint: disable=invalid-name
+        """Initialize the class."""
+        super().setUp()
+
+        self.items = [
+            {"id": 1, "commonName": "a.example.com", "tags": ["x", "y"], "nested": {"ok": True, "none": None}},
+            12345,
+            -1.5e3,
+            "text with \"quotes\", commas, ] and } and unicode \u00e9",
+            [],
+            {},
+            None,
+            False,
+        ]
+
+    def test_array(self):
+        """It should yield the items of a top-level array, whatever the chunk size."""
+        text = json.dumps(self.items, indent=2)
+
+        for size in (1, 2, 3, 7, 64, len(text)):
+            self.assertEqual(list(iter_json_items(_chunked(text, size))), self.items)
+
+    def test_key(self):
+        """It should yield the items of the array under the key, skipping the other members."""
+        text = json.dumps({"statusCode": 0, "other": {"reports": [1]}, "reports": self.items, "after": [2]})
+
+        for size in (1, 5, len(text)):
+            self.assertEqual(list(iter_json_items(_chunked(text, size), key="reports")), self.items)
+
+    def test_key_missing(self):
+        """It should yield nothing if the key is missing or null."""
+        self.assertEqual(list(iter_json_items(['{"statusCode": 0}'], key="reports")), [])
+        self.assertEqual(list(iter_json_items(['{}'], key="reports")), [])
+        self.assertEqual(list(iter_json_items(['{"reports": null}'], key="reports")), [])
+
+    def test_empty(self):
+        """It should yield nothing for an empty array."""
+        self.assertEqual(list(iter_json_items([" [ ] "])), [])
+
+    def test_lazy(self):
+        """It should yield the first items before all the chunks are read."""
+        def chunks():
+            yield '[{"id": 1}, '
+            raise AssertionError("read too far")
+
+        self.assertEqual(next(iter_json_items(chunks())), {"id": 1})
+
+    def test_number_split(self):
+        """It should not cut a number split across chunks."""
+        self.assertEqual(list(iter_json_items(["[12", "34, 5", "6]"])), [1234, 56])
+
+    def test_truncated(self):
+        """It should raise a ValueError if the document ends early."""
+        self.assertRaises(ValueError, list, iter_json_items(['[{"id": 1}, {"id"']))
+        self.assertRaises(ValueError, list, iter_json_items(['[{"id": 1}']))
+
+    def test_invalid(self):
+        """It should raise a ValueError if the document is not an array or the separators are wrong."""
+        self.assertRaises(ValueError, list, iter_json_items(['{"id": 1}']))
+        self.assertRaises(ValueError, list, iter_json_items(['[1 2]']))
+
+
+class TestIterResponseItems(TestCase):
+    """Test the iter_response_items function."""
+
+    def test_response(self):
+        """It should decode the response body in chunks and close the response."""
+        body = json.dumps({"reports": [{"name": "caf\u00e9"}, {"name": "b"}]}, ensure_ascii=False).encode("utf-8")
+        response = mock.Mock(encoding=None)
+        # Split inside the two-byte UTF-8 character
+        response.iter_content.return_value = [body[:body.index(b"\xc3") + 1], body[body.index(b"\xc3") + 1:]]
+
+        items = list(iter_response_items(response, key="reports", chunk_size=10))
+
+        self.assertEqual(items, [{"name": "caf\u00e9"}, {"name": "b"}])
+        response.iter_content.assert_called_once_with(chunk_size=10)
+        response.close.assert_called_once_with()
+
+    def test_closed_early(self):
+        """It should close the response if the caller stops iterating early."""
+        response = mock.Mock(encoding="utf-8")
+        response.iter_content.return_value = [b"[1, 2, 3]"]
+
+        items = iter_response_items(response)
+        self.assertEqual(next(items), 1)
+        items.close()
+
+        response.close.assert_called_once_with()